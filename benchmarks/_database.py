@@ -0,0 +1,96 @@
+"""
+Utilitários de banco de dados para os benchmarks.
+
+Cria bancos SQLite descartáveis com o runner de migrações do projeto (cópia do
+banco modelo já migrado) e os popula com personagens sintéticos.
+"""
+
+import random
+import sqlite3
+from typing import List
+
+# Reexportado: os benchmarks criam os seus bancos pelo runner de migrações
+from src.database.migrations import create_database  # noqa: F401
+from src.mechanics.dice_engine import SuccessLevel
+
+
+def populate_npcs(path: str, size: int, seed: int = 42) -> List[str]:
+    """
+    Insere `size` personagens sintéticos (características, loadout e Brawl).
+
+    Args:
+        path (str): O banco criado por `create_database`.
+        size (int): A quantidade de personagens.
+        seed (int): Semente das características e dos pontos alocados.
+
+    Returns:
+        List[str]: Os identificadores inseridos.
+    """
+    rng = random.Random(seed)
+    ids = [f"NPC_{index:06d}" for index in range(size)]
+    connection = sqlite3.connect(path)
+    try:
+        with connection:
+            connection.executemany(
+                "INSERT INTO character (id, name) VALUES (?, ?)", ((i, i) for i in ids)
+            )
+            connection.executemany(
+                """
+                INSERT INTO characteristics (char_id, str, con, siz, int, pow, dex, app)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                ((i, *(rng.randint(3, 18) for _ in range(7))) for i in ids),
+            )
+            connection.executemany(
+                "INSERT INTO character_loadout VALUES (?, 'WPN_BROADSWORD', 'ARM_HARD_LEATHER')",
+                ((i,) for i in ids),
+            )
+            connection.executemany(
+                "INSERT INTO character_skills (char_id, skill_id, allocated_points) VALUES (?, ?, ?)",
+                ((i, "SKL_BRAWL", rng.randint(0, 40)) for i in ids),
+            )
+    finally:
+        connection.close()
+    return ids
+
+
+def populate_campaign(path: str, size: int, seed: int = 42, history: int = 5) -> List[str]:
+    """
+    Insere uma campanha sintética completa: `size` personagens com características,
+    loadout, todas as perícias do catálogo e `history` rolagens cada.
+
+    Args:
+        path (str): O banco criado por `create_database`.
+        size (int): A quantidade de personagens.
+        seed (int): Semente dos valores sintéticos.
+        history (int): Linhas de `roll_history` por personagem.
+
+    Returns:
+        List[str]: Os identificadores inseridos.
+    """
+    ids = populate_npcs(path, size, seed)
+    rng = random.Random(seed + 1)
+    connection = sqlite3.connect(path)
+    try:
+        skills = [row[0] for row in connection.execute("SELECT id FROM skills WHERE id != 'SKL_BRAWL'")]
+        actions = skills + ["SKL_BRAWL"]
+        levels = [level.name for level in SuccessLevel]
+        with connection:
+            connection.executemany(
+                "INSERT INTO character_skills (char_id, skill_id, allocated_points) VALUES (?, ?, ?)",
+                ((i, skill, rng.randint(0, 40)) for i in ids for skill in skills),
+            )
+            connection.executemany(
+                """
+                INSERT INTO roll_history (char_id, action_name, die_result, success_level)
+                VALUES (?, ?, ?, ?)
+                """,
+                (
+                    (i, rng.choice(actions), rng.randint(1, 100), rng.choice(levels))
+                    for i in ids
+                    for _ in range(history)
+                ),
+            )
+    finally:
+        connection.close()
+    return ids
@@ -0,0 +1,66 @@
+"""
+Benchmark: Auditoria de Rolagens (commit por rolagem vs. group commit)
+======================================================================
+
+Mede rolagens por segundo do `SkillEngine.roll_skill` com dois escritores de
+auditoria: um que grava e comita cada linha de `roll_history` imediatamente
+(comportamento antigo) e o `AuditWriter` em lote com thread de fundo.
+
+Uso:
+    poetry run python -m benchmarks.bench_audit [--rolls N] [--synchronous FULL]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks._database import create_database
+from src.database.audit import AuditWriter
+from src.database.connection import ConnectionManager
+from src.mechanics.dice_engine import SkillEngine
+
+
+def _run(label: str, db_path: str, synchronous: str, rolls: int, batched: bool) -> float:
+    """Executa `rolls` rolagens e imprime a vazão, incluindo a descarga final."""
+    manager = ConnectionManager(db_path, synchronous=synchronous)
+    connection = manager.connection()
+    if batched:
+        writer = AuditWriter(connection, manager)
+    else:
+        # batch_size=1 sem thread de fundo: um commit (e um fsync) por rolagem
+        writer = AuditWriter(connection, batch_size=1)
+    engine = SkillEngine(connection=connection, audit_writer=writer)
+
+    start = time.perf_counter()
+    for _ in range(rolls):
+        engine.roll_skill("001", "SKL_DODGE")
+    writer.close()
+    elapsed = time.perf_counter() - start
+
+    stored = connection.execute("SELECT COUNT(*) FROM roll_history").fetchone()[0]
+    manager.close()
+    rate = rolls / elapsed
+    print(f"{label:<26} {rate:>12,.0f} rolagens/s  ({stored} linhas gravadas)")
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rolls", type=int, default=5_000)
+    parser.add_argument("--synchronous", default="FULL")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench_audit.db")
+        before = _run(
+            "Commit por rolagem", create_database(db_path), args.synchronous, args.rolls, False
+        )
+        after = _run(
+            "Group commit (AuditWriter)", create_database(db_path), args.synchronous, args.rolls, True
+        )
+    print(f"Ganho: {after / before:.1f}x (synchronous={args.synchronous})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: Partida a Frio (processo → primeiro quadro)
+======================================================
+
+Mede o tempo entre o início do processo `run.py` e o primeiro quadro desenhado
+pela TUI (em modo headless), em dois cenários:
+
+    - banco novo: o arquivo não existe e é copiado do banco modelo;
+    - banco em dia: o runner de migrações apenas confere a versão.
+
+Também mede, no próprio processo, o custo isolado de criar um banco aplicando
+os scripts comando a comando versus copiá-lo do modelo.
+
+Uso:
+    poetry run python -m benchmarks.bench_cold_start [--runs 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.database.migrations import TEMPLATE_PATH, build_template, create_database
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _first_frame(db_path: str) -> float:
+    """Roda `run.py --first-frame` e retorna os segundos até o primeiro quadro."""
+    start = time.time()
+    completed = subprocess.run(
+        [sys.executable, str(ROOT / "run.py"), "--db", db_path, "--first-frame"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in completed.stdout.splitlines():
+        if line.startswith("FIRST_FRAME "):
+            return float(line.split()[1]) - start
+    raise RuntimeError(f"run.py não reportou o primeiro quadro:\n{completed.stderr}")
+
+
+def _median_ms(samples) -> str:
+    return f"{statistics.median(samples) * 1000:8.1f} ms (mín. {min(samples) * 1000:.1f})"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    build_template(TEMPLATE_PATH)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "cold_start.db")
+
+        scripts, copies = [], []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            create_database(db_path, template=None)
+            scripts.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            create_database(db_path)
+            copies.append(time.perf_counter() - start)
+        print(f"criação do banco (scripts): {_median_ms(scripts)}")
+        print(f"criação do banco (modelo):  {_median_ms(copies)}")
+
+        fresh, current = [], []
+        for _ in range(args.runs):
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(db_path + suffix):
+                    os.remove(db_path + suffix)
+            fresh.append(_first_frame(db_path))
+            current.append(_first_frame(db_path))
+        print(f"primeiro quadro (banco novo):  {_median_ms(fresh)}")
+        print(f"primeiro quadro (banco em dia): {_median_ms(current)}")
+
+
+if __name__ == "__main__":
+    main()
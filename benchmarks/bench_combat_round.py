@@ -0,0 +1,60 @@
+"""
+Benchmark: Round de Combate em Massa (CombatRound)
+==================================================
+
+Cria um banco descartável com N combatentes sintéticos (características, estado,
+loadout e perícias), divide-os em dois exércitos e resolve alguns rounds,
+imprimindo os tempos de cada fase para cada tamanho de batalha.
+
+Uso:
+    poetry run python -m benchmarks.bench_combat_round [--sizes 100 1000 5000] [--rounds 3]
+"""
+
+import argparse
+import os
+import tempfile
+
+from benchmarks._database import create_database, populate_npcs
+from src.database.connection import ConnectionManager
+from src.mechanics.combat_engine import CombatEngine
+from src.mechanics.combat_round import CombatRound, DeclaredAction
+from src.mechanics.dice_engine import SkillEngine
+from src.mechanics.dice_roller import DiceRoller
+from src.mechanics.engine import BRPEngine
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 5_000])
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            db_path = create_database(os.path.join(tmp, f"bench_round_{size}.db"))
+            ids = populate_npcs(db_path, size, args.seed)
+
+            manager = ConnectionManager(db_path)
+            connection = manager.connection()
+            BRPEngine(connection=connection).initialize_characters_state(ids)
+            scheduler = CombatRound(
+                SkillEngine(connection=connection),
+                CombatEngine(connection=connection),
+                DiceRoller(seed=args.seed),
+            )
+
+            # Dois exércitos: cada combatente ataca o oponente de mesma posição
+            half = size // 2
+            pairs = list(zip(ids[:half], ids[half:]))
+            for number in range(1, args.rounds + 1):
+                scheduler.declare_many(DeclaredAction(a, b) for a, b in pairs)
+                scheduler.declare_many(DeclaredAction(b, a) for a, b in pairs)
+                result = scheduler.run()
+                print(f"[{size:>6} combatentes] round {number}: {result.timings.summary()}")
+            scheduler.skill_engine.audit.close()
+            manager.close()
+
+
+if __name__ == "__main__":
+    main()
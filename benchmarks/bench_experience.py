@@ -0,0 +1,96 @@
+"""
+Benchmark: Passe de Experiência de Fim de Sessão
+================================================
+
+Marca `experience_check` em todas as perícias de N personagens sintéticos e
+compara o laço linha a linha (`get_skill_total` + UPDATE por perícia) com o
+pipeline orientado a conjuntos do `ExperienceEngine`.
+
+Uso:
+    poetry run python -m benchmarks.bench_experience [--characters N]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks._database import create_database, populate_npcs
+from src.database.connection import ConnectionManager
+from src.mechanics.dice_engine import SkillEngine
+from src.mechanics.experience import ExperienceEngine
+
+_SKILLS = ("SKL_DODGE", "SKL_APPRAISE", "SKL_OWN_LANG")
+
+
+def _prepare(db_path: str, characters: int) -> None:
+    """Cria o banco, os personagens e marca todas as perícias para evolução."""
+    ids = populate_npcs(create_database(db_path), characters)
+    manager = ConnectionManager(db_path)
+    connection = manager.connection()
+    with connection:
+        connection.executemany(
+            "INSERT INTO character_skills (char_id, skill_id, allocated_points) VALUES (?, ?, 0)",
+            ((char_id, skill_id) for char_id in ids for skill_id in _SKILLS),
+        )
+        connection.execute("UPDATE character_skills SET experience_check = 1")
+    manager.close()
+
+
+def _row_by_row(db_path: str) -> int:
+    """Comportamento antigo: uma consulta de total e um commit por perícia marcada."""
+    manager = ConnectionManager(db_path)
+    connection = manager.connection()
+    engine = SkillEngine(connection=connection)
+    flagged = connection.execute(
+        "SELECT char_id, skill_id FROM character_skills WHERE experience_check"
+    ).fetchall()
+    for char_id, skill_id in flagged:
+        total = engine.get_skill_total(char_id, skill_id)
+        gain = random.randint(1, 6) if random.randint(1, 100) > total else 0
+        with connection:
+            connection.execute(
+                """
+                UPDATE character_skills
+                SET allocated_points = allocated_points + ?, experience_check = 0
+                WHERE char_id = ? AND skill_id = ?
+                """,
+                (gain, char_id, skill_id),
+            )
+    engine.audit.close()
+    manager.close()
+    return len(flagged)
+
+
+def _set_based(db_path: str) -> int:
+    """Pipeline do ExperienceEngine: uma consulta, sorteio em lote e uma transação."""
+    manager = ConnectionManager(db_path)
+    engine = SkillEngine(connection=manager.connection())
+    report = ExperienceEngine(engine).run_session_end()
+    engine.audit.close()
+    manager.close()
+    return report.checked
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--characters", type=int, default=20_000)
+    args = parser.parse_args()
+
+    rates = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, run in (("Linha a linha", _row_by_row), ("Pipeline em conjunto", _set_based)):
+            db_path = os.path.join(tmp, "bench_experience.db")
+            _prepare(db_path, args.characters)
+            start = time.perf_counter()
+            checked = run(db_path)
+            elapsed = time.perf_counter() - start
+            rates.append(checked / elapsed)
+            print(f"{label:<22} {checked:>8,} perícias em {elapsed:.2f}s "
+                  f"({rates[-1]:,.0f} perícias/s)")
+    print(f"Ganho: {rates[1] / rates[0]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Micro-benchmark: Avaliação de Fórmulas (eval vs. compiladas)
+============================================================
+
+Compara o custo de avaliar as fórmulas do BRP com `eval()` sobre o texto cru
+(comportamento antigo dos motores) contra a função gerada pelo `FormulaCompiler`.
+
+Uso:
+    poetry run python -m benchmarks.bench_formulas [--iterations N]
+"""
+
+import argparse
+import time
+from typing import Callable, Dict
+
+from src.mechanics.formulas import FormulaCompiler
+
+FORMULAS = ("(CON + SIZ) / 2", "POW", "DEX * 2", "INT * 5", "25")
+CHARACTERISTICS: Dict[str, int] = {
+    "STR": 13, "CON": 14, "SIZ": 12, "INT": 17, "POW": 14, "DEX": 14, "APP": 15,
+}
+
+
+def _measure(label: str, evaluate: Callable[[str], object], iterations: int) -> float:
+    """Executa `iterations` avaliações de cada fórmula e imprime avaliações/segundo."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for formula in FORMULAS:
+            evaluate(formula)
+    elapsed = time.perf_counter() - start
+    rate = iterations * len(FORMULAS) / elapsed
+    print(f"{label:<28} {rate:>14,.0f} avaliações/s")
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=100_000)
+    args = parser.parse_args()
+
+    compiler = FormulaCompiler()
+    chars = CHARACTERISTICS
+
+    before = _measure("eval() por chamada", lambda f: eval(f, {}, chars), args.iterations)
+    after = _measure("FormulaCompiler (cache)", lambda f: compiler.compile(f)(chars), args.iterations)
+    print(f"Ganho: {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
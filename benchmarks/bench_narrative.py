@@ -0,0 +1,107 @@
+"""
+Benchmark: Transições no Grafo Narrativo
+========================================
+
+Importa um roteiro sintético com N nós (cerca de três escolhas por nó, metade
+delas com condições de características e itens, passagens de ~2 KB) e mede,
+para personagens que passeiam pelo grafo, as latências p50/p99 de:
+
+    - NarrativeEngine.choices (nó + vereditos das condições)
+    - NarrativeEngine.choose (validação + gravação da posição)
+    - NarrativeEngine.passage (leitura sob demanda do texto)
+
+Ao final mostra quantas condições foram de fato avaliadas frente às consultadas.
+
+Uso:
+    poetry run python -m benchmarks.bench_narrative [--nodes 50000] [--characters 50]
+        [--steps 20000]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks._database import create_database, populate_npcs
+from src.database.connection import ConnectionManager
+from src.mechanics.instrumentation import Profiler
+from src.mechanics.narrative import NarrativeEngine, import_script
+
+_CONDITIONS = (
+    "STR >= 12",
+    "DEX * 5 > 60 or POW >= 14",
+    "WPN_BROADSWORD and STR > 10",
+    "not ARM_HARD_LEATHER",
+    "INT + POW >= 28",
+)
+
+
+def _script(size: int, rng: random.Random):
+    """Nós e escolhas do roteiro; toda escolha sem condição garante uma saída livre."""
+    filler = "A névoa se adensa sobre o portão. " * 60
+    nodes = [(f"N{index}", f"Nó {index}", f"{index}. {filler}") for index in range(size)]
+    choices = []
+    for index in range(size):
+        choices.append((f"N{index}", f"N{(index + 1) % size}", "Seguir em frente", None))
+        for _ in range(2):
+            condition = rng.choice(_CONDITIONS) if rng.random() < 0.75 else None
+            choices.append((f"N{index}", f"N{rng.randrange(size)}", "Desviar", condition))
+    return nodes, choices
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=50_000)
+    parser.add_argument("--characters", type=int, default=50)
+    parser.add_argument("--steps", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench_narrative.db")
+        characters = populate_npcs(create_database(db_path), args.characters, seed=args.seed)
+        manager = ConnectionManager(db_path)
+        connection = manager.connection()
+
+        nodes, choices = _script(args.nodes, rng)
+        start = time.perf_counter()
+        import_script(connection, "BENCH", nodes, choices)
+        print(f"roteiro: {len(nodes):,} nós e {len(choices):,} escolhas importados em "
+              f"{time.perf_counter() - start:.2f}s ({os.path.getsize(db_path) / 2**20:.1f} MB)")
+
+        engine = NarrativeEngine(connection=connection)
+        for char_id in characters:
+            engine.start(char_id, f"N{rng.randrange(args.nodes)}")
+
+        latencies = Profiler()
+        clock = time.perf_counter_ns
+        consulted = 0
+        start = time.perf_counter()
+        for _ in range(args.steps):
+            char_id = rng.choice(characters)
+            began = clock()
+            listed = engine.choices(char_id)
+            latencies.record("choices", clock() - began)
+            consulted += len(listed)
+            available = [choice for choice, ok in listed if ok]
+
+            began = clock()
+            node = engine.choose(char_id, rng.choice(available).choice_id)
+            latencies.record("choose", clock() - began)
+
+            began = clock()
+            engine.passage(node.node_id)
+            latencies.record("passage", clock() - began)
+        elapsed = time.perf_counter() - start
+
+        print(f"{args.steps:,} transições em {elapsed:.2f}s ({args.steps / elapsed:,.0f}/s)")
+        print(latencies.report(width=30))
+        print(f"condições avaliadas: {sum(engine.evaluations.values()):,} "
+              f"(escolhas consultadas: {consulted:,})")
+        manager.close()
+
+
+if __name__ == "__main__":
+    main()
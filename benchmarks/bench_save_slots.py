@@ -0,0 +1,148 @@
+"""
+Benchmark: Slots de Save (backup online, compressão e saves incrementais)
+=========================================================================
+
+Para cada tamanho de campanha (personagens sintéticos com todas as perícias e
+histórico de rolagens), mede com o `SaveSlotManager`:
+
+    - o save completo (primeiro slot) e o espaço comprimido em disco;
+    - o save incremental após alterar o HP de uma fração dos personagens;
+    - o load (remontagem, verificação e troca atômica sobre o banco vivo).
+
+Durante os saves, uma thread "de jogo" segue gravando no banco (um UPDATE por
+commit); a latência dessas gravações, com e sem save em andamento, mostra que
+a cópia não trava os motores.
+
+Uso:
+    poetry run python -m benchmarks.bench_save_slots [--sizes 1000 10000 50000]
+        [--changed 0.01] [--pages-per-step 256]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import List
+
+from benchmarks._database import create_database, populate_campaign
+from src.database.connection import configure_connection
+from src.database.save_slots import SaveSlotManager
+from src.mechanics.instrumentation import Profiler
+
+
+class _GameWriter(threading.Thread):
+    """Simula os motores: pequenas transações de HP, medidas uma a uma."""
+
+    def __init__(self, db_path: str, ids: List[str], profiler: Profiler) -> None:
+        super().__init__(daemon=True)
+        self.db_path = db_path
+        self.ids = ids
+        self.profiler = profiler
+        self.phase = "ocioso"
+        self._done = threading.Event()
+
+    def run(self) -> None:
+        connection = configure_connection(sqlite3.connect(self.db_path, timeout=30))
+        rng = random.Random(7)
+        clock = time.perf_counter_ns
+        while not self._done.is_set():
+            start = clock()
+            with connection:
+                connection.execute(
+                    "UPDATE character_state SET current_hp = current_hp - 1 WHERE char_id = ?",
+                    (rng.choice(self.ids),),
+                )
+            self.profiler.record(f"gravação ({self.phase})", clock() - start)
+            time.sleep(0.001)
+        connection.close()
+
+    def stop(self) -> None:
+        self._done.set()
+        self.join()
+
+
+def _touch(db_path: str, ids: List[str], fraction: float, seed: int) -> int:
+    """Altera o HP de uma fração dos personagens (a diferença do save incremental)."""
+    rng = random.Random(seed)
+    chosen = rng.sample(ids, max(1, int(len(ids) * fraction)))
+    connection = sqlite3.connect(db_path)
+    with connection:
+        connection.executemany(
+            "UPDATE character_state SET current_hp = current_hp + 1 WHERE char_id = ?",
+            ((char_id,) for char_id in chosen),
+        )
+    connection.close()
+    return len(chosen)
+
+
+def _measure(size: int, args: argparse.Namespace, tmp: str) -> None:
+    db_path = os.path.join(tmp, f"campanha_{size}.db")
+    ids = populate_campaign(create_database(db_path), size, seed=args.seed)
+    connection = configure_connection(sqlite3.connect(db_path))
+    with connection:
+        connection.executemany(
+            "INSERT INTO character_state (char_id, current_hp, current_mp) VALUES (?, 12, 12)",
+            ((char_id,) for char_id in ids),
+        )
+    connection.close()
+    db_bytes = os.path.getsize(db_path)
+
+    manager = SaveSlotManager(
+        db_path, os.path.join(tmp, f"saves_{size}"), pages_per_step=args.pages_per_step
+    )
+    latencies = Profiler()
+    writer = _GameWriter(db_path, ids, latencies)
+    writer.start()
+    time.sleep(0.3)
+
+    writer.phase = "durante o save"
+    start = time.perf_counter()
+    full = manager.save("slot_1").result()
+    full_time = time.perf_counter() - start
+    full_bytes = manager.stored_bytes()
+    writer.phase = "ocioso"
+
+    changed = _touch(db_path, ids, args.changed, args.seed)
+    writer.phase = "durante o save"
+    start = time.perf_counter()
+    delta = manager.save("slot_2").result()
+    delta_time = time.perf_counter() - start
+    writer.phase = "ocioso"
+    time.sleep(0.3)
+    writer.stop()
+
+    start = time.perf_counter()
+    manager.load("slot_1").result()
+    load_time = time.perf_counter() - start
+    manager.close()
+
+    mb = 2**20
+    print(f"\n[{size:>7,} personagens] banco de {db_bytes / mb:.1f} MB "
+          f"({full.page_count:,} páginas)")
+    print(f"    save completo    {full_time * 1000:>8.1f} ms  "
+          f"{full_bytes / mb:>6.2f} MB comprimidos ({full_bytes / db_bytes:.0%})")
+    print(f"    save incremental {delta_time * 1000:>8.1f} ms  "
+          f"{delta.written_bytes / mb:>6.2f} MB gravados ({delta.written_pages:,} páginas, "
+          f"{changed:,} personagens alterados)")
+    print(f"    load             {load_time * 1000:>8.1f} ms")
+    print(latencies.report(width=30))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--changed", type=float, default=0.01)
+    parser.add_argument("--pages-per-step", type=int, default=256)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            _measure(size, args, tmp)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Benchmark: Simulador de Duelos (Monte Carlo)
+============================================
+
+Cria um banco descartável, tira o snapshot do personagem de exemplo (Taras)
+e de um oponente sintético, e imprime taxas de vitória, histograma de rounds
+e duelos por segundo.
+
+Uso:
+    poetry run python -m benchmarks.bench_simulation [--duels N] [--workers W]
+"""
+
+import argparse
+import os
+import tempfile
+
+from benchmarks._database import create_database
+from src.mechanics.simulation import CombatantSnapshot, simulate_duels, snapshot_combatant
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--duels", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = create_database(os.path.join(tmp, "bench_simulation.db"))
+        taras = snapshot_combatant("001", db_path=db_path)
+
+    # Oponente sintético: mesmo HP, sem armadura, espada curta
+    rival = CombatantSnapshot("RIVAL", hp=taras.hp, dex=12, attack_skill=50,
+                              defense_skill=30, damage_expression="1D6+1", armor_points=0)
+    result = simulate_duels(taras, rival, args.duels, workers=args.workers, seed=args.seed)
+    print(result.summary())
+
+
+if __name__ == "__main__":
+    main()
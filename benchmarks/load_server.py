@@ -0,0 +1,227 @@
+"""
+Benchmark: Carga no Servidor Headless (milhares de jogadores simulados)
+=======================================================================
+
+Cria N campanhas descartáveis com NPCs sintéticos, sobe o servidor
+(`python -m src.server`) em um socket Unix e o dispara com milhares de
+jogadores simulados concorrentes, multiplexados em algumas conexões. Cada
+jogador escolhe uma campanha e repete, até o fim da duração, uma mistura de
+operações (rolagens de perícia, ataques, consultas e curas).
+
+Ao final imprime a vazão total, as latências vistas pelos clientes e as
+medidas pelo próprio servidor (operação "metrics").
+
+Uso:
+    poetry run python -m benchmarks.load_server [--players 2000] [--connections 50]
+        [--campaigns 4] [--characters 200] [--duration 10] [--workers 2] [--think-ms 0]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import signal
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks._database import create_database, populate_npcs
+from src.mechanics.instrumentation import Profiler
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Mistura de operações de um jogador: (operação, peso)
+MIX = (
+    ("roll_skill", 50),
+    ("attack", 20),
+    ("get_skill_total", 15),
+    ("get_vitals", 10),
+    ("initialize_character_state", 5),
+)
+
+
+class Client:
+    """Conexão JSON lines compartilhada por vários jogadores (pedidos por `id`)."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count(1)
+        self._waiting: Dict[int, "asyncio.Future[Dict[str, Any]]"] = {}
+        self._task = asyncio.create_task(self._receive())
+
+    async def _receive(self) -> None:
+        async for line in self._reader:
+            response = json.loads(line)
+            future = self._waiting.pop(response["id"], None)
+            if future is not None and not future.done():
+                future.set_result(response)
+        for future in self._waiting.values():
+            future.set_exception(ConnectionError("Servidor encerrou a conexão."))
+
+    async def request(self, operation: str, campaign: Optional[str] = None, args: Any = ()) -> Any:
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[request_id] = future
+        message = {"id": request_id, "campaign": campaign, "op": operation, "args": list(args)}
+        self._writer.write(json.dumps(message).encode() + b"\n")
+        await self._writer.drain()
+        return await future
+
+    async def close(self) -> None:
+        self._writer.close()
+        await self._writer.wait_closed()
+        await self._task
+
+
+def _arguments(operation: str, character: str, other: str) -> Tuple:
+    if operation == "roll_skill":
+        return character, "SKL_BRAWL"
+    if operation == "get_skill_total":
+        return character, "SKL_DODGE"
+    if operation == "attack":
+        return character, other
+    return (character,)
+
+
+async def _player(
+    client: Client,
+    campaign: str,
+    characters: List[str],
+    deadline: float,
+    think: float,
+    rng: random.Random,
+    latencies: Profiler,
+    errors: List[str],
+) -> int:
+    """Um jogador simulado; retorna a quantidade de pedidos feitos."""
+    operations, weights = zip(*MIX)
+    clock = time.perf_counter_ns
+    done = 0
+    while time.monotonic() < deadline:
+        operation = rng.choices(operations, weights)[0]
+        character, other = rng.sample(characters, 2)
+        start = clock()
+        response = await client.request(operation, campaign, _arguments(operation, character, other))
+        latencies.record(operation, clock() - start)
+        if not response["ok"]:
+            errors.append(response["error"])
+        done += 1
+        if think:
+            await asyncio.sleep(rng.expovariate(1 / think))
+    return done
+
+
+async def _start_server(data_dir: str, socket_path: str, args: argparse.Namespace):
+    command = [
+        sys.executable, "-m", "src.server",
+        "--data-dir", data_dir,
+        "--socket", socket_path,
+        "--batch-limit", str(args.batch_limit),
+        "--queue-limit", str(args.queue_limit),
+    ]
+    if args.workers:
+        command += ["--workers", str(args.workers)]
+    process = await asyncio.create_subprocess_exec(
+        *command, cwd=ROOT, stdout=asyncio.subprocess.PIPE
+    )
+    # O servidor anuncia o endereço quando já aceita conexões
+    banner = await process.stdout.readline()
+    if not banner.startswith(b"Abraxas servindo"):
+        raise RuntimeError(f"O servidor não subiu: {banner!r}")
+    print(banner.decode().strip())
+    return process
+
+
+async def run(args: argparse.Namespace, data_dir: str) -> None:
+    campaigns = [f"mesa_{index}" for index in range(args.campaigns)]
+    rosters: Dict[str, List[str]] = {}
+    for index, campaign in enumerate(campaigns):
+        path = os.path.join(data_dir, f"{campaign}.db")
+        create_database(path)
+        rosters[campaign] = populate_npcs(path, args.characters, seed=args.seed + index)
+
+    socket_path = os.path.join(data_dir, "abraxas.sock")
+    server = await _start_server(data_dir, socket_path, args)
+    try:
+        clients = [
+            Client(*await asyncio.open_unix_connection(socket_path, limit=2**20))
+            for _ in range(args.connections)
+        ]
+
+        # Estado inicial de todos os NPCs (e campanhas abertas nos workers)
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            clients[position % len(clients)].request("initialize_character_state", campaign, (char_id,))
+            for campaign, roster in rosters.items()
+            for position, char_id in enumerate(roster)
+        ))
+        print(f"estado inicial de {args.campaigns * args.characters:,} NPCs em "
+              f"{time.perf_counter() - start:.2f}s")
+
+        latencies = Profiler()
+        errors: List[str] = []
+        rng = random.Random(args.seed)
+        deadline = time.monotonic() + args.duration
+        start = time.perf_counter()
+        counts = await asyncio.gather(*(
+            _player(
+                clients[player % len(clients)],
+                campaigns[player % len(campaigns)],
+                rosters[campaigns[player % len(campaigns)]],
+                deadline,
+                args.think_ms / 1000,
+                random.Random(rng.random()),
+                latencies,
+                errors,
+            )
+            for player in range(args.players)
+        ))
+        elapsed = time.perf_counter() - start
+
+        total = sum(counts)
+        print(f"{args.players:,} jogadores em {args.connections} conexões: {total:,} pedidos em "
+              f"{elapsed:.1f}s = {total / elapsed:,.0f} pedidos/s ({len(errors)} erros)")
+        if errors:
+            print(f"    primeiro erro: {errors[0]}")
+        print("\nLatência vista pelos clientes:")
+        print(latencies.report(width=30))
+
+        metrics = (await clients[0].request("metrics"))["result"]
+        print(f"\nMedido pelo servidor (filas: {metrics['queues']}):")
+        print(f"{'operação':<40} {'chamadas':>9} {'p50 µs':>9} {'p99 µs':>9}")
+        for stats in metrics["operations"][:15]:
+            print(f"{stats['name'][:40]:<40} {stats['count']:>9,} "
+                  f"{stats['p50_us']:>9.1f} {stats['p99_us']:>9.1f}")
+
+        for client in clients:
+            await client.close()
+    finally:
+        server.send_signal(signal.SIGINT)
+        await server.communicate()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--players", type=int, default=2_000)
+    parser.add_argument("--connections", type=int, default=50)
+    parser.add_argument("--campaigns", type=int, default=4)
+    parser.add_argument("--characters", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--think-ms", type=float, default=0.0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-limit", type=int, default=128)
+    parser.add_argument("--queue-limit", type=int, default=1024)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        asyncio.run(run(args, data_dir))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+"""
+Benchmark: Suíte dos Caminhos Críticos dos Motores
+==================================================
+
+Gera campanhas sintéticas em várias escalas (de 100 a 1M de personagens, com
+todas as perícias, loadout, estado vital e histórico de rolagens) e mede, em
+cada escala, as chamadas individuais dos motores:
+
+    - BRPEngine.calculate_derived_stats / initialize_character_state
+    - SkillEngine.get_skill_total / roll_skill
+    - CombatEngine.calculate_raw_damage / apply_damage
+
+Cada operação é chamada para personagens sorteados em todo o elenco (o cache
+de estado não cobre as escalas grandes) e reporta ops/s e latências p50/p99.
+Os resultados podem ser salvos como baseline JSON; comparados a uma baseline,
+uma queda de vazão ou um aumento da p50 ou da p99 acima do limiar encerra o
+processo com código 1 (uso em CI). A p99 tem um limiar próprio e mais largo
+(`--p99-threshold`, 50% por padrão), já que a cauda oscila mais entre execuções.
+
+Os bancos pristinos de cada escala podem ser guardados em `--data-dir` e
+reaproveitados entre execuções; cada medição roda sobre uma cópia.
+
+Uso:
+    poetry run python -m benchmarks.suite [--scales 100 1000 10000] [--samples 2000] [--repeat 3]
+        [--data-dir .bench_data] [--save-baseline base.json]
+        [--baseline base.json] [--threshold 0.25] [--p99-threshold 0.5]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from benchmarks._database import create_database, populate_campaign
+from src.database.connection import ConnectionManager
+from src.database.migrations import SCHEMA_VERSION, script_checksums
+from src.mechanics.combat_engine import CombatEngine
+from src.mechanics.dice_engine import SkillEngine
+from src.mechanics.engine import BRPEngine
+
+DEFAULT_SCALES = (100, 1_000, 10_000, 100_000, 1_000_000)
+
+# Resultados: escala -> operação -> estatísticas
+Results = Dict[str, Dict[str, "OpStats"]]
+
+
+@dataclass(frozen=True)
+class OpStats:
+    """
+    Vazão e latência de uma operação.
+
+    Attributes:
+        samples (int): Quantidade de chamadas medidas.
+        ops_per_sec (float): Chamadas por segundo.
+        p50_us (float): Latência mediana em microssegundos.
+        p99_us (float): Latência do percentil 99 em microssegundos.
+    """
+
+    samples: int
+    ops_per_sec: float
+    p50_us: float
+    p99_us: float
+
+
+def _percentile(ordered: Sequence[int], fraction: float) -> float:
+    """Percentil por posição mais próxima de uma lista já ordenada."""
+    index = min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index] / 1000
+
+
+def measure(function: Callable[..., object], calls: Sequence[Tuple]) -> OpStats:
+    """
+    Mede cada chamada individualmente.
+
+    Args:
+        function (Callable[..., object]): A operação medida.
+        calls (Sequence[Tuple]): Os argumentos de cada chamada.
+
+    Returns:
+        OpStats: A vazão e as latências.
+    """
+    clock = time.perf_counter_ns
+    latencies: List[int] = []
+    for args in calls:
+        start = clock()
+        function(*args)
+        latencies.append(clock() - start)
+    latencies.sort()
+    total = sum(latencies) or 1
+    return OpStats(
+        samples=len(latencies),
+        ops_per_sec=len(latencies) * 1e9 / total,
+        p50_us=_percentile(latencies, 0.50),
+        p99_us=_percentile(latencies, 0.99),
+    )
+
+
+def prepare_database(scale: int, seed: int, history: int, data_dir: str) -> Tuple[str, List[str]]:
+    """
+    Gera (ou reaproveita) o banco pristino de uma escala.
+
+    Args:
+        scale (int): A quantidade de personagens.
+        seed (int): Semente dos dados sintéticos.
+        history (int): Rolagens por personagem.
+        data_dir (str): A pasta dos bancos pristinos.
+
+    Returns:
+        Tuple[str, List[str]]: O caminho do banco e os identificadores dos personagens.
+    """
+    # O nome muda com o schema: um script editado invalida os bancos guardados
+    schema = hashlib.sha256("".join(c for _, c in script_checksums().values()).encode())
+    name = f"campaign_{schema.hexdigest()[:10]}_{scale}_{seed}_{history}.db"
+    path = os.path.join(data_dir, name)
+    if not os.path.exists(path):
+        building = create_database(path + ".building")
+        populate_campaign(building, scale, seed, history)
+        manager = ConnectionManager(building)
+        engine = BRPEngine(connection=manager.connection())
+        engine.initialize_characters_state()
+        engine.audit.close()
+        manager.close()
+        # Volta ao journal padrão: o arquivo pristino é copiado sem -wal/-shm
+        connection = sqlite3.connect(building)
+        connection.execute("PRAGMA journal_mode = DELETE")
+        connection.close()
+        os.replace(building, path)
+
+    connection = sqlite3.connect(path)
+    ids = [row[0] for row in connection.execute("SELECT id FROM character WHERE id LIKE 'NPC_%'")]
+    connection.close()
+    return path, ids
+
+
+def run_scale(
+    db_path: str, ids: Sequence[str], samples: int, seed: int, repeat: int = 3
+) -> Dict[str, OpStats]:
+    """
+    Mede todas as operações sobre uma cópia do banco de uma escala.
+
+    Args:
+        db_path (str): O banco pristino.
+        ids (Sequence[str]): Os personagens sorteáveis.
+        samples (int): Chamadas medidas por operação.
+        seed (int): Semente do sorteio dos personagens.
+        repeat (int): Rodadas por operação; vale a de maior vazão (a menos
+                      perturbada por outros processos e pela thread de auditoria).
+
+    Returns:
+        Dict[str, OpStats]: As estatísticas de cada operação.
+    """
+    rng = random.Random(seed)
+    work_path = db_path + ".work"
+    shutil.copyfile(db_path, work_path)
+    manager = ConnectionManager(work_path)
+    connection = manager.connection()
+    brp = BRPEngine(connection=connection)
+    skills = SkillEngine(connection=connection)
+    combat = CombatEngine(connection=connection)
+    catalog = list(skills.rules.snapshot.skills)
+
+    def targets() -> List[Tuple[str]]:
+        return [(char_id,) for char_id in rng.choices(ids, k=samples)]
+
+    def skill_calls() -> List[Tuple[str, str]]:
+        return [(char_id, rng.choice(catalog)) for (char_id,) in targets()]
+
+    operations = (
+        ("BRPEngine.calculate_derived_stats", brp.calculate_derived_stats, targets),
+        ("BRPEngine.initialize_character_state", brp.initialize_character_state, targets),
+        ("SkillEngine.get_skill_total", skills.get_skill_total, skill_calls),
+        ("SkillEngine.roll_skill", skills.roll_skill, skill_calls),
+        ("CombatEngine.calculate_raw_damage", combat.calculate_raw_damage, targets),
+        (
+            "CombatEngine.apply_damage",
+            combat.apply_damage,
+            lambda: [(char_id, rng.randint(1, 10)) for (char_id,) in targets()],
+        ),
+    )
+
+    results: Dict[str, OpStats] = {}
+    try:
+        for name, function, make_calls in operations:
+            # Aquecimento: statements preparados e snapshot de regras
+            measure(function, make_calls()[: max(samples // 20, 1)])
+            rounds = [measure(function, make_calls()) for _ in range(max(repeat, 1))]
+            results[name] = max(rounds, key=lambda stats: stats.ops_per_sec)
+        skills.audit.flush()
+    finally:
+        skills.audit.close()
+        manager.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(work_path + suffix):
+                os.remove(work_path + suffix)
+    return results
+
+
+def compare(
+    current: Results,
+    baseline: Results,
+    threshold: float,
+    p99_threshold: float = 0.5,
+) -> List[str]:
+    """
+    Lista as regressões em relação a uma baseline.
+
+    Uma operação regride quando a vazão cai, ou a latência p50 sobe, mais do
+    que `threshold` (fração), ou quando a latência p99 sobe mais do que
+    `p99_threshold`. Operações ausentes em um dos lados são ignoradas.
+
+    Args:
+        current (Results): Os resultados desta execução.
+        baseline (Results): Os resultados de referência.
+        threshold (float): A variação tolerada (ex: 0.25 = 25%).
+        p99_threshold (float): A variação tolerada da p99 (ex: 0.5 = 50%).
+
+    Returns:
+        List[str]: Uma descrição por regressão, com o limiar violado (vazia se nenhuma).
+    """
+    regressions = []
+    for scale, operations in current.items():
+        for name, stats in operations.items():
+            reference = baseline.get(scale, {}).get(name)
+            if reference is None:
+                continue
+            if stats.ops_per_sec < reference.ops_per_sec * (1 - threshold):
+                regressions.append(
+                    f"[{scale}] {name}: {stats.ops_per_sec:,.0f} ops/s "
+                    f"(baseline {reference.ops_per_sec:,.0f}, limiar {threshold:.0%})"
+                )
+            if stats.p50_us > reference.p50_us * (1 + threshold):
+                regressions.append(
+                    f"[{scale}] {name}: p50 {stats.p50_us:.1f} µs "
+                    f"(baseline {reference.p50_us:.1f} µs, limiar {threshold:.0%})"
+                )
+            if stats.p99_us > reference.p99_us * (1 + p99_threshold):
+                regressions.append(
+                    f"[{scale}] {name}: p99 {stats.p99_us:.1f} µs "
+                    f"(baseline {reference.p99_us:.1f} µs, limiar {p99_threshold:.0%})"
+                )
+    return regressions
+
+
+def save_baseline(path: str, results: Results) -> None:
+    """Grava os resultados em JSON, junto com o ambiente da medição."""
+    document = {
+        "environment": {
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "schema_version": SCHEMA_VERSION,
+        },
+        "results": {
+            scale: {name: asdict(stats) for name, stats in operations.items()}
+            for scale, operations in results.items()
+        },
+    }
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(document, handle, indent=2, ensure_ascii=False)
+
+
+def load_baseline(path: str) -> Results:
+    """Lê uma baseline gravada por `save_baseline`."""
+    with open(path, encoding="utf-8") as handle:
+        document = json.load(handle)
+    return {
+        scale: {name: OpStats(**stats) for name, stats in operations.items()}
+        for scale, operations in document["results"].items()
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES))
+    parser.add_argument("--samples", type=int, default=2_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--history", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--data-dir", default=None)
+    parser.add_argument("--save-baseline", default=None)
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--p99-threshold", type=float, default=0.5)
+    args = parser.parse_args(argv)
+
+    results: Results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = args.data_dir or tmp
+        os.makedirs(data_dir, exist_ok=True)
+        for scale in args.scales:
+            start = time.perf_counter()
+            db_path, ids = prepare_database(scale, args.seed, args.history, data_dir)
+            print(f"[{scale:>9,} personagens] banco pronto em {time.perf_counter() - start:.1f}s")
+            results[str(scale)] = run_scale(db_path, ids, args.samples, args.seed, args.repeat)
+            for name, stats in results[str(scale)].items():
+                print(
+                    f"    {name:<40} {stats.ops_per_sec:>12,.0f} ops/s"
+                    f"   p50 {stats.p50_us:>8.1f} µs   p99 {stats.p99_us:>8.1f} µs"
+                )
+
+    if args.save_baseline:
+        save_baseline(args.save_baseline, results)
+        print(f"Baseline gravada em {args.save_baseline}")
+
+    if args.baseline:
+        regressions = compare(
+            results, load_baseline(args.baseline), args.threshold, args.p99_threshold
+        )
+        if regressions:
+            print("Regressões acima do limiar:")
+            for line in regressions:
+                print(f"    {line}")
+            return 1
+        print(
+            f"Sem regressões acima de {args.threshold:.0%} (p99: {args.p99_threshold:.0%}) "
+            f"em relação a {args.baseline}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""
+Ponto de Entrada do Abraxas
+===========================
+
+Prepara o banco de dados e abre a interface de terminal.
+
+A partida a frio é mantida curta para o executável único (PyInstaller):
+    - O banco em dia custa apenas a leitura do `PRAGMA user_version` e dos
+      checksums; um banco novo é copiado do banco modelo já migrado.
+    - O Textual só é importado depois do banco pronto, e os motores (e o NumPy)
+      só são importados pela `AsyncEngine`, na sua thread de trabalho.
+
+Uso:
+    poetry run python run.py [--db abraxas.db] [--char 001]
+"""
+
+import argparse
+import time
+from typing import List, Optional
+
+from src.database.connection import DEFAULT_DB_PATH
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Abraxas: RPG de mesa no terminal.")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="Arquivo do banco SQLite.")
+    parser.add_argument("--char", default="001", help="Personagem jogado.")
+    parser.add_argument(
+        "--first-frame",
+        action="store_true",
+        help="Roda sem terminal, imprime o instante do primeiro quadro e sai "
+        "(usado por benchmarks/bench_cold_start.py).",
+    )
+    args = parser.parse_args(argv)
+
+    from src.database.migrations import ensure_database
+
+    ensure_database(args.db)
+
+    # Importação tardia: o Textual não pesa na validação do banco
+    from src.tui.app import AbraxasTUI
+
+    app = AbraxasTUI(args.char, db_path=args.db)
+    auto_pilot = None
+    if args.first_frame:
+
+        async def auto_pilot(pilot) -> None:
+            def _report() -> None:
+                print(f"FIRST_FRAME {time.time():.6f}", flush=True)
+                app.exit()
+
+            app.call_after_refresh(_report)
+
+    app.run(headless=args.first_frame, auto_pilot=auto_pilot)
+
+
+if __name__ == "__main__":
+    main()
@@ -58,16 +58,19 @@ CREATE TABLE IF NOT EXISTS character_state (
 /*******************************************************************************
  * INSERTS DE INICIALIZAÇÃO (SEMENTES DO BRP)
  * Popula o banco com as regras fundamentais e dados de teste.
+ * INSERT OR IGNORE: serve só para adotar bancos criados antes do runner de
+ * migrações (ver src/database/migrations.py), sem duplicar as sementes que eles
+ * já tinham. O script nunca é reaplicado: mudanças nas sementes vão em um novo.
  *******************************************************************************/
 
 -- Fórmulas do Quick-Start do BRP
-INSERT INTO brp_formulas (stat_name, formula, description) 
+INSERT OR IGNORE INTO brp_formulas (stat_name, formula, description) 
 VALUES ('MAX_HP', '(CON + SIZ) / 2', 'Hit Points máximos: Média de CON e SIZ');
 
-INSERT INTO brp_formulas (stat_name, formula, description) 
+INSERT OR IGNORE INTO brp_formulas (stat_name, formula, description) 
 VALUES ('MAX_MP', 'POW', 'Magic Points máximos: Igual ao valor de POW');
 
 -- Personagem de Exemplo para Testes na Engine
-INSERT INTO character (id, name) VALUES ('001', 'Taras');
-INSERT INTO characteristics (char_id, str, con, siz, int, pow, dex, app) 
+INSERT OR IGNORE INTO character (id, name) VALUES ('001', 'Taras');
+INSERT OR IGNORE INTO characteristics (char_id, str, con, siz, int, pow, dex, app) 
 VALUES ('001', 13, 14, 12, 17, 14, 14, 15);
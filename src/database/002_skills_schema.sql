@@ -38,11 +38,11 @@ CREATE TABLE IF NOT EXISTS character_skills (
  *******************************************************************************/
 
 -- Injeção do catálogo base do BRP
-INSERT INTO skills (id, name, base_formula) VALUES ('SKL_BRAWL', 'Brawl', '25');
-INSERT INTO skills (id, name, base_formula) VALUES ('SKL_DODGE', 'Dodge', 'DEX * 2');
-INSERT INTO skills (id, name, base_formula) VALUES ('SKL_APPRAISE', 'Appraise', '15');
-INSERT INTO skills (id, name, base_formula) VALUES ('SKL_OWN_LANG', 'Language (Own)', 'INT * 5');
+INSERT OR IGNORE INTO skills (id, name, base_formula) VALUES ('SKL_BRAWL', 'Brawl', '25');
+INSERT OR IGNORE INTO skills (id, name, base_formula) VALUES ('SKL_DODGE', 'Dodge', 'DEX * 2');
+INSERT OR IGNORE INTO skills (id, name, base_formula) VALUES ('SKL_APPRAISE', 'Appraise', '15');
+INSERT OR IGNORE INTO skills (id, name, base_formula) VALUES ('SKL_OWN_LANG', 'Language (Own)', 'INT * 5');
 
 -- Injetando o estado inicial das perícias no personagem de exemplo (Taras - id '001')
-INSERT INTO character_skills (char_id, skill_id, allocated_points) VALUES ('001', 'SKL_DODGE', 20);
-INSERT INTO character_skills (char_id, skill_id, allocated_points) VALUES ('001', 'SKL_BRAWL', 10);
+INSERT OR IGNORE INTO character_skills (char_id, skill_id, allocated_points) VALUES ('001', 'SKL_DODGE', 20);
+INSERT OR IGNORE INTO character_skills (char_id, skill_id, allocated_points) VALUES ('001', 'SKL_BRAWL', 10);
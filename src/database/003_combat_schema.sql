@@ -58,16 +58,16 @@ CREATE TABLE IF NOT EXISTS character_loadout (
  *******************************************************************************/
 
 -- Tabela oficial de Bônus de Dano do BRP (STR + SIZ)
-INSERT INTO damage_bonus_rules (min_stat, max_stat, dice_modifier) VALUES (2, 12, '-1D6');
-INSERT INTO damage_bonus_rules (min_stat, max_stat, dice_modifier) VALUES (13, 16, '-1D4');
-INSERT INTO damage_bonus_rules (min_stat, max_stat, dice_modifier) VALUES (17, 24, '+0');
-INSERT INTO damage_bonus_rules (min_stat, max_stat, dice_modifier) VALUES (25, 32, '+1D4');
-INSERT INTO damage_bonus_rules (min_stat, max_stat, dice_modifier) VALUES (33, 40, '+1D6');
+INSERT OR IGNORE INTO damage_bonus_rules (min_stat, max_stat, dice_modifier) VALUES (2, 12, '-1D6');
+INSERT OR IGNORE INTO damage_bonus_rules (min_stat, max_stat, dice_modifier) VALUES (13, 16, '-1D4');
+INSERT OR IGNORE INTO damage_bonus_rules (min_stat, max_stat, dice_modifier) VALUES (17, 24, '+0');
+INSERT OR IGNORE INTO damage_bonus_rules (min_stat, max_stat, dice_modifier) VALUES (25, 32, '+1D4');
+INSERT OR IGNORE INTO damage_bonus_rules (min_stat, max_stat, dice_modifier) VALUES (33, 40, '+1D6');
 
 -- Equipamentos Base (Catálogo Quick-Start)
-INSERT INTO weapons (id, name, base_damage, applies_damage_bonus) VALUES ('WPN_BROADSWORD', 'Broadsword', '1D8+1', 1);
-INSERT INTO armors (id, name, armor_points) VALUES ('ARM_HARD_LEATHER', 'Hard Leather', 2);
+INSERT OR IGNORE INTO weapons (id, name, base_damage, applies_damage_bonus) VALUES ('WPN_BROADSWORD', 'Broadsword', '1D8+1', 1);
+INSERT OR IGNORE INTO armors (id, name, armor_points) VALUES ('ARM_HARD_LEATHER', 'Hard Leather', 2);
 
 -- Equipando o personagem de teste (Taras - id '001')
-INSERT INTO character_loadout (char_id, equipped_weapon_id, equipped_armor_id) 
+INSERT OR IGNORE INTO character_loadout (char_id, equipped_weapon_id, equipped_armor_id) 
 VALUES ('001', 'WPN_BROADSWORD', 'ARM_HARD_LEATHER');
\ No newline at end of file
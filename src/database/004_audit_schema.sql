@@ -0,0 +1,67 @@
+-- -----------------------------------------------------------------------------
+-- 11. AUDITORIA E HISTÓRICO (ROLL HISTORY) - ESTADO MUTÁVEL
+-- Tabela de log apendável (append-only) para registrar todas as rolagens do BRP.
+-- Garante a persistência do histórico do jogador, fundamental para narrativas
+-- ramificadas e para a prevenção de adulteração de estado (save scumming).
+-- -----------------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS roll_history (
+    log_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    char_id TEXT NOT NULL,
+    action_name TEXT NOT NULL,       -- Nome da perícia ou ação rolada (ex: 'SKL_DODGE')
+    die_result INTEGER NOT NULL,     -- Resultado bruto gerado pelo d100 (1 a 100)
+    
+    -- Nível de sucesso alcançado, armazenado como String para facilitar a leitura 
+    -- direta no banco de dados (ex: 'SUCCESS', 'SPECIAL_SUCCESS', 'FAILURE')
+    success_level TEXT NOT NULL,     
+    
+    -- Carimbo de tempo inserido automaticamente pelo motor do SQLite
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
+    
+    FOREIGN KEY(char_id) REFERENCES character(id) ON DELETE CASCADE
+);
+
+-- Índices de consulta: histórico por personagem (em ordem cronológica) e
+-- filtros por perícia/ação. O rowid (log_id) entra implicitamente no fim de
+-- cada índice, servindo de desempate na paginação por keyset.
+CREATE INDEX IF NOT EXISTS idx_roll_history_char_created ON roll_history (char_id, created_at);
+-- Janela rolável do log da TUI: keyset direto sobre log_id dentro do personagem
+CREATE INDEX IF NOT EXISTS idx_roll_history_char_log ON roll_history (char_id, log_id);
+CREATE INDEX IF NOT EXISTS idx_roll_history_action ON roll_history (action_name);
+
+-- -----------------------------------------------------------------------------
+-- 11.1 ESTATÍSTICAS AGREGADAS (ROLL STATS) - MANTIDA POR TRIGGERS
+-- Contagem de rolagens por personagem, ação e nível de sucesso, atualizada
+-- incrementalmente a cada linha gravada em roll_history. Taxas de sucesso são
+-- lidas daqui sem varrer o histórico inteiro.
+-- -----------------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS roll_stats (
+    char_id TEXT NOT NULL,
+    action_name TEXT NOT NULL,
+    success_level TEXT NOT NULL,
+    roll_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (char_id, action_name, success_level)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS trg_roll_history_stats_ins AFTER INSERT ON roll_history
+BEGIN
+    INSERT INTO roll_stats (char_id, action_name, success_level, roll_count)
+    VALUES (NEW.char_id, NEW.action_name, NEW.success_level, 1)
+    ON CONFLICT(char_id, action_name, success_level) DO UPDATE SET
+        roll_count = roll_count + 1;
+END;
+
+-- Expurgo de histórico antigo: as contagens acompanham as linhas removidas
+CREATE TRIGGER IF NOT EXISTS trg_roll_history_stats_del AFTER DELETE ON roll_history
+BEGIN
+    UPDATE roll_stats SET roll_count = roll_count - 1
+    WHERE char_id = OLD.char_id
+      AND action_name = OLD.action_name
+      AND success_level = OLD.success_level;
+END;
+
+-- Carga inicial em bancos que já possuíam histórico antes da tabela existir
+INSERT INTO roll_stats (char_id, action_name, success_level, roll_count)
+SELECT char_id, action_name, success_level, COUNT(*)
+FROM roll_history
+WHERE NOT EXISTS (SELECT 1 FROM roll_stats)
+GROUP BY char_id, action_name, success_level;
@@ -0,0 +1,80 @@
+-- -----------------------------------------------------------------------------
+-- 12. REVISÕES DE CACHE (CACHE REVISIONS) - CONTROLE INTERNO
+-- Contadores incrementados por triggers sempre que um grupo de tabelas muda.
+-- Os caches em memória do motor (ex: CharacterStateStore, Rulebook) comparam a revisão
+-- quando o PRAGMA data_version indica que OUTRA conexão gravou no banco, e só
+-- descartam seus dados se o grupo observado realmente mudou (gravações em
+-- roll_history, por exemplo, não invalidam o cache de estado nem as regras).
+-- -----------------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS cache_revisions (
+    scope TEXT PRIMARY KEY,       -- Grupo de tabelas observado (ex: 'state', 'rules')
+    revision INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT OR IGNORE INTO cache_revisions (scope, revision) VALUES ('state', 0);
+INSERT OR IGNORE INTO cache_revisions (scope, revision) VALUES ('rules', 0);
+
+-- Estado do personagem: características, vitais, loadout e perícias alocadas
+CREATE TRIGGER IF NOT EXISTS trg_characteristics_rev_ins AFTER INSERT ON characteristics
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'state'; END;
+CREATE TRIGGER IF NOT EXISTS trg_characteristics_rev_upd AFTER UPDATE ON characteristics
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'state'; END;
+CREATE TRIGGER IF NOT EXISTS trg_characteristics_rev_del AFTER DELETE ON characteristics
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'state'; END;
+
+CREATE TRIGGER IF NOT EXISTS trg_character_state_rev_ins AFTER INSERT ON character_state
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'state'; END;
+CREATE TRIGGER IF NOT EXISTS trg_character_state_rev_upd AFTER UPDATE ON character_state
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'state'; END;
+CREATE TRIGGER IF NOT EXISTS trg_character_state_rev_del AFTER DELETE ON character_state
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'state'; END;
+
+CREATE TRIGGER IF NOT EXISTS trg_character_loadout_rev_ins AFTER INSERT ON character_loadout
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'state'; END;
+CREATE TRIGGER IF NOT EXISTS trg_character_loadout_rev_upd AFTER UPDATE ON character_loadout
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'state'; END;
+CREATE TRIGGER IF NOT EXISTS trg_character_loadout_rev_del AFTER DELETE ON character_loadout
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'state'; END;
+
+CREATE TRIGGER IF NOT EXISTS trg_character_skills_rev_ins AFTER INSERT ON character_skills
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'state'; END;
+CREATE TRIGGER IF NOT EXISTS trg_character_skills_rev_upd AFTER UPDATE ON character_skills
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'state'; END;
+CREATE TRIGGER IF NOT EXISTS trg_character_skills_rev_del AFTER DELETE ON character_skills
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'state'; END;
+
+-- Livro de regras (homebrew): bônus de dano, armas, armaduras, perícias e fórmulas
+CREATE TRIGGER IF NOT EXISTS trg_damage_bonus_rules_rev_ins AFTER INSERT ON damage_bonus_rules
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'rules'; END;
+CREATE TRIGGER IF NOT EXISTS trg_damage_bonus_rules_rev_upd AFTER UPDATE ON damage_bonus_rules
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'rules'; END;
+CREATE TRIGGER IF NOT EXISTS trg_damage_bonus_rules_rev_del AFTER DELETE ON damage_bonus_rules
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'rules'; END;
+
+CREATE TRIGGER IF NOT EXISTS trg_weapons_rev_ins AFTER INSERT ON weapons
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'rules'; END;
+CREATE TRIGGER IF NOT EXISTS trg_weapons_rev_upd AFTER UPDATE ON weapons
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'rules'; END;
+CREATE TRIGGER IF NOT EXISTS trg_weapons_rev_del AFTER DELETE ON weapons
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'rules'; END;
+
+CREATE TRIGGER IF NOT EXISTS trg_armors_rev_ins AFTER INSERT ON armors
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'rules'; END;
+CREATE TRIGGER IF NOT EXISTS trg_armors_rev_upd AFTER UPDATE ON armors
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'rules'; END;
+CREATE TRIGGER IF NOT EXISTS trg_armors_rev_del AFTER DELETE ON armors
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'rules'; END;
+
+CREATE TRIGGER IF NOT EXISTS trg_skills_rev_ins AFTER INSERT ON skills
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'rules'; END;
+CREATE TRIGGER IF NOT EXISTS trg_skills_rev_upd AFTER UPDATE ON skills
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'rules'; END;
+CREATE TRIGGER IF NOT EXISTS trg_skills_rev_del AFTER DELETE ON skills
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'rules'; END;
+
+CREATE TRIGGER IF NOT EXISTS trg_brp_formulas_rev_ins AFTER INSERT ON brp_formulas
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'rules'; END;
+CREATE TRIGGER IF NOT EXISTS trg_brp_formulas_rev_upd AFTER UPDATE ON brp_formulas
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'rules'; END;
+CREATE TRIGGER IF NOT EXISTS trg_brp_formulas_rev_del AFTER DELETE ON brp_formulas
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'rules'; END;
@@ -0,0 +1,65 @@
+-- -----------------------------------------------------------------------------
+-- 13. LOG DE EVENTOS DE ESTADO (STATE EVENTS) - ESTADO MUTÁVEL
+-- Tabela apendável (append-only) com toda mudança de HP/MP dos personagens:
+-- inicialização, dano, cura, gasto e recuperação de MP. A tabela character_state
+-- continua sendo o estado atual; este log permite reconstruir como o personagem
+-- chegou até ele e qual era o seu estado em qualquer ponto do passado.
+-- -----------------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS state_events (
+    event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    char_id TEXT NOT NULL,
+    kind TEXT NOT NULL,              -- 'INIT', 'DAMAGE', 'HEAL', 'MP_SPEND' ou 'MP_GAIN'
+
+    -- Em 'INIT', os valores absolutos de HP/MP; nos demais, as variações
+    -- (ex: DAMAGE de 5 pontos = hp -5, mp 0)
+    hp INTEGER NOT NULL,
+    mp INTEGER NOT NULL,
+
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+
+    FOREIGN KEY(char_id) REFERENCES character(id) ON DELETE CASCADE
+);
+
+-- Reconstrução: eventos do personagem a partir de um snapshot (keyset em event_id)
+CREATE INDEX IF NOT EXISTS idx_state_events_char_event ON state_events (char_id, event_id);
+-- Consultas por instante (ex: "estado do personagem antes da emboscada")
+CREATE INDEX IF NOT EXISTS idx_state_events_char_created ON state_events (char_id, created_at);
+
+-- -----------------------------------------------------------------------------
+-- 13.1 SNAPSHOTS DE ESTADO (STATE SNAPSHOTS) - MANTIDA POR TRIGGER
+-- HP/MP do personagem logo após o evento `event_id`. Um snapshot é gravado a
+-- cada 32 eventos do personagem, de modo que reconstruir qualquer ponto custa
+-- no máximo os eventos desde o snapshot anterior. Eventos antigos podem ser
+-- dobrados nos snapshots (ver src.mechanics.state_log.compact_state_log).
+-- -----------------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS state_snapshots (
+    char_id TEXT NOT NULL,
+    event_id INTEGER NOT NULL,
+    hp INTEGER NOT NULL,
+    mp INTEGER NOT NULL,
+    PRIMARY KEY (char_id, event_id)
+) WITHOUT ROWID;
+
+-- O evento é gravado na mesma transação, logo após a escrita em character_state:
+-- a linha atual já é o estado resultante do evento
+CREATE TRIGGER IF NOT EXISTS trg_state_events_snapshot AFTER INSERT ON state_events
+WHEN (
+    SELECT COUNT(*) FROM state_events
+    WHERE char_id = NEW.char_id
+      AND event_id > COALESCE(
+          (SELECT MAX(event_id) FROM state_snapshots WHERE char_id = NEW.char_id), 0
+      )
+) >= 32
+BEGIN
+    INSERT OR REPLACE INTO state_snapshots (char_id, event_id, hp, mp)
+    SELECT char_id, NEW.event_id, current_hp, current_mp
+    FROM character_state
+    WHERE char_id = NEW.char_id;
+END;
+
+-- Carga inicial em bancos que já possuíam estado antes do log existir: o
+-- snapshot do evento 0 é a origem da reconstrução desses personagens
+INSERT OR IGNORE INTO state_snapshots (char_id, event_id, hp, mp)
+SELECT char_id, 0, current_hp, current_mp
+FROM character_state
+WHERE NOT EXISTS (SELECT 1 FROM state_events);
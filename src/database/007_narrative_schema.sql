@@ -0,0 +1,69 @@
+-- -----------------------------------------------------------------------------
+-- 14. CAMADA NARRATIVA (LITERATURA ERGÓDICA) - CONTEÚDO DOS ROTEIROS
+-- Grafo de nós de texto e escolhas. Um roteiro pode ter dezenas de milhares de
+-- nós: as escolhas de saída são encontradas pelo índice do nó de origem e o
+-- texto das passagens fica em uma tabela própria, lida apenas na transição
+-- (pelo mmap do SQLite), nunca mantida inteira em memória.
+-- -----------------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS narrative_nodes (
+    node_id TEXT PRIMARY KEY,        -- Ex: 'CAP1_PORTAO'
+    script_id TEXT NOT NULL,         -- Roteiro ao qual o nó pertence (ex: 'CAPITULO_1')
+    title TEXT NOT NULL DEFAULT ''
+);
+
+CREATE INDEX IF NOT EXISTS idx_narrative_nodes_script ON narrative_nodes (script_id);
+
+-- Texto separado do nó: as linhas de narrative_nodes ficam pequenas e densas nas
+-- páginas do índice; as páginas de texto só são tocadas quando a passagem é lida
+CREATE TABLE IF NOT EXISTS narrative_passages (
+    node_id TEXT PRIMARY KEY,
+    body TEXT NOT NULL,
+    FOREIGN KEY(node_id) REFERENCES narrative_nodes(node_id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS narrative_choices (
+    choice_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    from_node TEXT NOT NULL,
+    to_node TEXT NOT NULL,
+    position INTEGER NOT NULL DEFAULT 0,   -- Ordem de exibição no nó de origem
+    label TEXT NOT NULL,
+
+    -- Condição de desbloqueio no mesmo vocabulário de brp_formulas, mais os ids
+    -- dos itens (quantidade possuída). NULL = sempre disponível.
+    -- Ex: 'STR >= 12 and WPN_BROADSWORD', 'POW * 5 > 60 or not ARM_HARD_LEATHER'
+    condition TEXT,
+
+    FOREIGN KEY(from_node) REFERENCES narrative_nodes(node_id) ON DELETE CASCADE,
+    FOREIGN KEY(to_node) REFERENCES narrative_nodes(node_id) ON DELETE CASCADE
+);
+
+-- Escolhas de saída de um nó, já na ordem de exibição
+CREATE INDEX IF NOT EXISTS idx_narrative_choices_from ON narrative_choices (from_node, position);
+
+-- -----------------------------------------------------------------------------
+-- 14.1 POSIÇÃO DO PERSONAGEM NA NARRATIVA - ESTADO MUTÁVEL
+-- -----------------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS character_narrative (
+    char_id TEXT PRIMARY KEY,
+    node_id TEXT NOT NULL,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY(char_id) REFERENCES character(id) ON DELETE CASCADE,
+    FOREIGN KEY(node_id) REFERENCES narrative_nodes(node_id)
+);
+
+-- Revisão 'narrative': o grafo em memória só é descartado se os roteiros mudaram
+INSERT OR IGNORE INTO cache_revisions (scope, revision) VALUES ('narrative', 0);
+
+CREATE TRIGGER IF NOT EXISTS trg_narrative_nodes_rev_ins AFTER INSERT ON narrative_nodes
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'narrative'; END;
+CREATE TRIGGER IF NOT EXISTS trg_narrative_nodes_rev_upd AFTER UPDATE ON narrative_nodes
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'narrative'; END;
+CREATE TRIGGER IF NOT EXISTS trg_narrative_nodes_rev_del AFTER DELETE ON narrative_nodes
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'narrative'; END;
+
+CREATE TRIGGER IF NOT EXISTS trg_narrative_choices_rev_ins AFTER INSERT ON narrative_choices
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'narrative'; END;
+CREATE TRIGGER IF NOT EXISTS trg_narrative_choices_rev_upd AFTER UPDATE ON narrative_choices
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'narrative'; END;
+CREATE TRIGGER IF NOT EXISTS trg_narrative_choices_rev_del AFTER DELETE ON narrative_choices
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'narrative'; END;
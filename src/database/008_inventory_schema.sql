@@ -0,0 +1,130 @@
+-- -----------------------------------------------------------------------------
+-- 15. ITENS - O "LIVRO DE REGRAS"
+-- Catálogo de tudo o que pode ser carregado: armas e armaduras (mesmo id das
+-- tabelas de combate), consumíveis, munição e equipamento geral.
+-- -----------------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS items (
+    id TEXT PRIMARY KEY,          -- Ex: 'WPN_BROADSWORD', 'AMMO_9MM', 'CNS_FIRST_AID_KIT'
+    name TEXT UNIQUE NOT NULL,
+    kind TEXT NOT NULL DEFAULT 'GEAR'
+        CHECK (kind IN ('GEAR', 'WEAPON', 'ARMOR', 'CONSUMABLE', 'AMMO')),
+    enc REAL NOT NULL DEFAULT 0   -- Carga (ENC) de uma unidade
+);
+
+-- Armas que consomem munição a cada ataque (armas de fogo, arcos...)
+CREATE TABLE IF NOT EXISTS weapon_ammunition (
+    weapon_id TEXT PRIMARY KEY,
+    ammo_id TEXT NOT NULL,
+    rounds_per_attack INTEGER NOT NULL DEFAULT 1 CHECK (rounds_per_attack > 0),
+    FOREIGN KEY(weapon_id) REFERENCES weapons(id) ON DELETE CASCADE,
+    FOREIGN KEY(ammo_id) REFERENCES items(id)
+);
+
+-- -----------------------------------------------------------------------------
+-- 15.1 INVENTÁRIO - ESTADO MUTÁVEL
+-- Uma linha por (personagem, item); a quantidade de munição de um personagem é
+-- a própria linha do cartucho, lida pela chave primária.
+-- -----------------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS character_inventory (
+    char_id TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    quantity INTEGER NOT NULL CHECK (quantity > 0),
+    PRIMARY KEY (char_id, item_id),
+    FOREIGN KEY(char_id) REFERENCES character(id) ON DELETE CASCADE,
+    FOREIGN KEY(item_id) REFERENCES items(id)
+) WITHOUT ROWID;
+
+-- Quem carrega um item (usado quando a carga do item muda no catálogo)
+CREATE INDEX IF NOT EXISTS idx_character_inventory_item ON character_inventory (item_id);
+
+-- -----------------------------------------------------------------------------
+-- 15.2 CARGA CARREGADA - AGREGADO MANTIDO POR TRIGGERS
+-- Cada inclusão, retirada ou consumo soma apenas a própria diferença; nenhuma
+-- verificação de carga executa SUM sobre o inventário.
+-- -----------------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS character_encumbrance (
+    char_id TEXT PRIMARY KEY,
+    carried_enc REAL NOT NULL DEFAULT 0,
+    FOREIGN KEY(char_id) REFERENCES character(id) ON DELETE CASCADE
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_character_inventory_enc_ins AFTER INSERT ON character_inventory
+BEGIN
+    INSERT INTO character_encumbrance (char_id, carried_enc)
+    VALUES (NEW.char_id, NEW.quantity * (SELECT enc FROM items WHERE id = NEW.item_id))
+    ON CONFLICT(char_id) DO UPDATE SET carried_enc = carried_enc + excluded.carried_enc;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_character_inventory_enc_upd AFTER UPDATE ON character_inventory
+BEGIN
+    UPDATE character_encumbrance
+    SET carried_enc = carried_enc - OLD.quantity * (SELECT enc FROM items WHERE id = OLD.item_id)
+    WHERE char_id = OLD.char_id;
+    INSERT INTO character_encumbrance (char_id, carried_enc)
+    VALUES (NEW.char_id, NEW.quantity * (SELECT enc FROM items WHERE id = NEW.item_id))
+    ON CONFLICT(char_id) DO UPDATE SET carried_enc = carried_enc + excluded.carried_enc;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_character_inventory_enc_del AFTER DELETE ON character_inventory
+BEGIN
+    UPDATE character_encumbrance
+    SET carried_enc = carried_enc - OLD.quantity * (SELECT enc FROM items WHERE id = OLD.item_id)
+    WHERE char_id = OLD.char_id;
+END;
+
+-- Homebrew: mudar a carga de um item corrige apenas quem o carrega
+CREATE TRIGGER IF NOT EXISTS trg_items_enc_upd AFTER UPDATE OF enc ON items
+BEGIN
+    UPDATE character_encumbrance
+    SET carried_enc = carried_enc + (NEW.enc - OLD.enc) * (
+        SELECT quantity FROM character_inventory
+        WHERE char_id = character_encumbrance.char_id AND item_id = NEW.id
+    )
+    WHERE char_id IN (SELECT char_id FROM character_inventory WHERE item_id = NEW.id);
+END;
+
+-- O catálogo faz parte do livro de regras em memória (revisão 'rules')
+CREATE TRIGGER IF NOT EXISTS trg_items_rev_ins AFTER INSERT ON items
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'rules'; END;
+CREATE TRIGGER IF NOT EXISTS trg_items_rev_upd AFTER UPDATE ON items
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'rules'; END;
+CREATE TRIGGER IF NOT EXISTS trg_items_rev_del AFTER DELETE ON items
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'rules'; END;
+
+CREATE TRIGGER IF NOT EXISTS trg_weapon_ammunition_rev_ins AFTER INSERT ON weapon_ammunition
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'rules'; END;
+CREATE TRIGGER IF NOT EXISTS trg_weapon_ammunition_rev_upd AFTER UPDATE ON weapon_ammunition
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'rules'; END;
+CREATE TRIGGER IF NOT EXISTS trg_weapon_ammunition_rev_del AFTER DELETE ON weapon_ammunition
+BEGIN UPDATE cache_revisions SET revision = revision + 1 WHERE scope = 'rules'; END;
+
+/*******************************************************************************
+ * INSERTS DE INICIALIZAÇÃO (CATÁLOGO, LIMITE DE CARGA E INVENTÁRIO DE TESTE)
+ *******************************************************************************/
+
+-- Limite de carga: ENC que o personagem carrega sem penalidade
+INSERT OR IGNORE INTO brp_formulas (stat_name, formula, description)
+VALUES ('CARRY_LIMIT', 'STR', 'Carga máxima (ENC) sem penalidade: igual a STR');
+
+INSERT OR IGNORE INTO weapons (id, name, base_damage, applies_damage_bonus) VALUES ('WPN_PISTOL_9MM', '9mm Pistol', '1D8', 0);
+
+INSERT OR IGNORE INTO items (id, name, kind, enc) VALUES ('WPN_BROADSWORD', 'Broadsword', 'WEAPON', 2);
+INSERT OR IGNORE INTO items (id, name, kind, enc) VALUES ('WPN_PISTOL_9MM', '9mm Pistol', 'WEAPON', 1);
+INSERT OR IGNORE INTO items (id, name, kind, enc) VALUES ('ARM_HARD_LEATHER', 'Hard Leather', 'ARMOR', 3);
+INSERT OR IGNORE INTO items (id, name, kind, enc) VALUES ('AMMO_9MM', '9mm Rounds', 'AMMO', 0.02);
+INSERT OR IGNORE INTO items (id, name, kind, enc) VALUES ('CNS_FIRST_AID_KIT', 'First Aid Kit', 'CONSUMABLE', 1);
+
+INSERT OR IGNORE INTO weapon_ammunition (weapon_id, ammo_id, rounds_per_attack) VALUES ('WPN_PISTOL_9MM', 'AMMO_9MM', 1);
+
+-- Inventário do personagem de teste (Taras - id '001'): o loadout e suprimentos
+INSERT OR IGNORE INTO character_inventory (char_id, item_id, quantity) VALUES ('001', 'WPN_BROADSWORD', 1);
+INSERT OR IGNORE INTO character_inventory (char_id, item_id, quantity) VALUES ('001', 'ARM_HARD_LEATHER', 1);
+INSERT OR IGNORE INTO character_inventory (char_id, item_id, quantity) VALUES ('001', 'CNS_FIRST_AID_KIT', 2);
+
+-- Carga inicial do agregado: os triggers só contam as linhas inseridas depois
+-- deles, e um banco adotado pode já ter inventário de antes deste script
+INSERT OR REPLACE INTO character_encumbrance (char_id, carried_enc)
+SELECT inv.char_id, SUM(inv.quantity * it.enc)
+FROM character_inventory AS inv
+JOIN items AS it ON it.id = inv.item_id
+GROUP BY inv.char_id;
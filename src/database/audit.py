@@ -0,0 +1,362 @@
+"""
+Módulo de Auditoria Assíncrona (Write-Behind Audit Log)
+=======================================================
+
+Este módulo compõe a camada de Infraestrutura do motor Abraxas.
+Ele substitui o commit individual de cada linha de `roll_history` por uma fila
+em memória que é gravada em lotes (`executemany`) dentro de uma única transação
+(group commit), removendo o fsync do caminho crítico de cada `roll_skill`.
+
+O lote é descarregado quando atinge `batch_size` linhas ou quando a linha mais
+antiga completa `flush_interval` segundos. Com um `ConnectionManager` disponível,
+a gravação acontece em uma thread de fundo com conexão própria; sem ele (ex: uma
+conexão ':memory:' injetada), a gravação acontece na própria thread chamadora.
+
+Garantia de auditoria: qualquer motor que vá alterar o estado do jogo deve
+chamar `flush()` antes, de modo que o histórico nunca fique atrás do estado.
+Linhas enfileiradas durante uma `transaction()` da conexão ficam retidas até o
+COMMIT: um `flush()` dentro da transação as grava junto com ela, e um ROLLBACK
+as descarta, para que o histórico nunca registre rolagens de um round desfeito.
+
+Erros: linhas malformadas são recusadas já em `log_many`. Um lote que o banco
+rejeita de forma permanente (ex: restrição violada) é regravado linha a linha,
+e as linhas recusadas vão para a quarentena (`quarantined`) em vez de voltar à
+fila, onde travariam todas as descargas seguintes. Só erros transitórios (banco
+ocupado) devolvem o lote à fila.
+
+Dependências:
+    - sqlite3: Para a gravação em lote no banco.
+    - threading: Para a thread de descarga em segundo plano.
+    - atexit: Para garantir a descarga da fila no encerramento do processo.
+
+Padrões aplicados:
+    - Write-Behind Cache
+    - Group Commit
+"""
+
+import atexit
+import sqlite3
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+from src.database.connection import (
+    ConnectionManager,
+    after_commit,
+    get_manager,
+    on_rollback,
+    transaction,
+)
+
+AuditRow = Tuple[str, str, int, str]
+
+_INSERT_ROLL_SQL = """
+    INSERT INTO roll_history (char_id, action_name, die_result, success_level)
+    VALUES (?, ?, ?, ?)
+"""
+
+
+def _is_valid_row(row: AuditRow) -> bool:
+    """Confere os tipos de uma linha antes de ela entrar na fila."""
+    return (
+        len(row) == 4
+        and isinstance(row[0], str)
+        and isinstance(row[1], str)
+        and isinstance(row[2], int)
+        and isinstance(row[3], str)
+    )
+
+
+class AuditWriter:
+    """
+    Fila de auditoria de rolagens com gravação em lote (group commit).
+
+    Attributes:
+        connection (sqlite3.Connection): Conexão usada pelas descargas síncronas
+                                         (`flush()` na thread chamadora).
+        manager (Optional[ConnectionManager]): Fornece a conexão da thread de fundo.
+                                               Se `None`, não há thread de fundo.
+        batch_size (int): Quantidade de linhas que dispara uma descarga.
+        flush_interval (float): Idade máxima (s) de uma linha pendente na fila.
+        quarantined (List[AuditRow]): Linhas recusadas pelo banco, fora da fila.
+    """
+
+    def __init__(
+        self,
+        connection: sqlite3.Connection,
+        manager: Optional[ConnectionManager] = None,
+        batch_size: int = 256,
+        flush_interval: float = 0.25,
+    ) -> None:
+        self.connection = connection
+        self.manager = manager
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.quarantined: List[AuditRow] = []
+
+        self._pending: List[AuditRow] = []
+        self._oldest: Optional[float] = None
+        # Linhas de uma transação ainda aberta na conexão: só a thread de fundo
+        # não as enxerga, pois elas podem ser desfeitas
+        self._held: List[AuditRow] = []
+        self._lock = threading.Lock()
+        # Serializa as gravações: garante a ordem dos lotes entre as threads.
+        # Reentrante para que `flush()` funcione dentro de `exclusive()`.
+        self._write_lock = threading.RLock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        on_rollback(connection, self._discard_held)
+        atexit.register(self.close)
+
+    def __enter__(self) -> "AuditWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def pending(self) -> int:
+        """Quantidade de linhas aguardando gravação."""
+        return len(self._pending) + len(self._held)
+
+    def log(self, char_id: str, action_name: str, die_result: int, success_level: str) -> None:
+        """
+        Enfileira uma linha de `roll_history` para gravação posterior.
+
+        Args:
+            char_id (str): O identificador do personagem que rolou.
+            action_name (str): A perícia ou ação rolada (ex: 'SKL_DODGE').
+            die_result (int): O resultado bruto do d100.
+            success_level (str): O nome do nível de sucesso (ex: 'SUCCESS').
+
+        Raises:
+            RuntimeError: Se o escritor já tiver sido encerrado.
+        """
+        self.log_many([(char_id, action_name, die_result, success_level)])
+
+    def log_many(self, rows: List[AuditRow]) -> None:
+        """
+        Enfileira várias linhas de `roll_history` de uma só vez.
+
+        Se a conexão estiver dentro de uma transação, as linhas ficam retidas até
+        o COMMIT e são descartadas se ela for desfeita.
+
+        Args:
+            rows (List[AuditRow]): Tuplas (char_id, action_name, die_result, success_level).
+
+        Raises:
+            RuntimeError: Se o escritor já tiver sido encerrado.
+            ValueError: Se alguma linha for malformada (nenhuma é enfileirada).
+        """
+        if self._closed:
+            raise RuntimeError("AuditWriter encerrado: a rolagem não pode ser auditada.")
+        for row in rows:
+            if not _is_valid_row(row):
+                raise ValueError(f"Linha de auditoria inválida: {row!r}.")
+
+        if self.connection.in_transaction:
+            with self._lock:
+                release = not self._held
+                self._held.extend(rows)
+            if release:
+                after_commit(self.connection, self._release_held)
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            if not self._pending:
+                self._oldest = now
+            self._pending.extend(rows)
+            size = len(self._pending)
+            expired = now - self._oldest >= self.flush_interval
+
+        if self.manager is None:
+            # Sem thread de fundo: a própria chamada descarrega ao atingir o limite
+            if size >= self.batch_size or expired:
+                self.flush()
+            return
+
+        self._ensure_thread()
+        if size >= self.batch_size:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """
+        Grava imediatamente todas as linhas pendentes na thread chamadora.
+
+        Deve ser chamado antes de qualquer escrita que altere o estado do jogo.
+        Dentro de uma transação, também grava as linhas retidas dela, que passam a
+        ser confirmadas ou desfeitas junto com a transação.
+
+        Returns:
+            int: A quantidade de linhas gravadas.
+        """
+        return self._drain(self.connection, held=True)
+
+    @contextmanager
+    def exclusive(self) -> Iterator["AuditWriter"]:
+        """
+        Reserva a gravação da fila para a thread atual durante o bloco.
+
+        Usado quando a thread chamadora mantém uma transação longa (ex: um round de
+        combate inteiro): a thread de fundo aguarda o fim do bloco em vez de disputar
+        o lock de escrita do SQLite, e os `flush()` da própria thread entram na
+        transação que ela abriu.
+
+        Yields:
+            AuditWriter: O próprio escritor.
+        """
+        with self._write_lock:
+            yield self
+
+    def close(self) -> None:
+        """Encerra a thread de fundo e grava tudo o que ainda estiver na fila."""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+
+        thread = self._thread
+        if thread is not None:
+            self._stopping = True
+            self._wake.set()
+            thread.join()
+        self.flush()
+
+    def _take(self, held: bool = False) -> Tuple[List[AuditRow], List[AuditRow]]:
+        """Retira atomicamente as linhas pendentes (e, se pedido, as retidas)."""
+        with self._lock:
+            rows, self._pending = self._pending, []
+            self._oldest = None
+            kept: List[AuditRow] = []
+            if held:
+                kept, self._held = self._held, []
+        return rows, kept
+
+    def _release_held(self) -> None:
+        """Após o COMMIT, entrega à fila as linhas retidas durante a transação."""
+        with self._lock:
+            rows, self._held = self._held, []
+            if rows and not self._pending:
+                self._oldest = time.monotonic()
+            self._pending.extend(rows)
+        if rows and self.manager is not None and not self._closed:
+            self._ensure_thread()
+
+    def _discard_held(self) -> None:
+        """Após um ROLLBACK, descarta as linhas das rolagens desfeitas."""
+        with self._lock:
+            self._held = []
+
+    def _drain(self, connection: sqlite3.Connection, held: bool = False) -> int:
+        """Grava as linhas pendentes com um único `executemany` em uma transação."""
+        with self._write_lock:
+            queued, kept = self._take(held)
+            rows = queued + kept
+            if not rows:
+                return 0
+            try:
+                try:
+                    with transaction(connection):
+                        connection.executemany(_INSERT_ROLL_SQL, rows)
+                except sqlite3.OperationalError:
+                    raise
+                except sqlite3.Error:
+                    # Erro permanente: regravar o lote inteiro falharia para sempre
+                    return self._write_each(connection, rows)
+            except sqlite3.OperationalError:
+                # Devolve o lote à frente da fila para não perder a auditoria; as
+                # linhas retidas continuam presas à transação de onde vieram
+                with self._lock:
+                    self._pending[:0] = queued
+                    self._held[:0] = kept
+                    if queued:
+                        self._oldest = self._oldest or time.monotonic()
+                raise
+            return len(rows)
+
+    def _write_each(self, connection: sqlite3.Connection, rows: List[AuditRow]) -> int:
+        """Grava as linhas uma a uma, pondo em quarentena as recusadas pelo banco."""
+        rejected = []
+        with transaction(connection):
+            for row in rows:
+                try:
+                    connection.execute(_INSERT_ROLL_SQL, row)
+                except sqlite3.OperationalError:
+                    raise
+                except sqlite3.Error:
+                    # Só o comando falha: a transação segue com as demais linhas
+                    rejected.append(row)
+        with self._lock:
+            self.quarantined.extend(rejected)
+        return len(rows) - len(rejected)
+
+    def _ensure_thread(self) -> None:
+        """Inicia a thread de descarga em segundo plano na primeira rolagem."""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="abraxas-audit-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        """Laço da thread de fundo: descarrega por tamanho ou por tempo."""
+        try:
+            connection = self.manager.connection()
+            while not self._stopping:
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+                try:
+                    self._drain(connection)
+                except sqlite3.Error:
+                    # Erro transitório (ex: banco ocupado): as linhas voltaram para a
+                    # fila e serão regravadas; os permanentes já foram à quarentena
+                    continue
+        finally:
+            # A próxima rolagem inicia outra thread se esta parou por um erro
+            with self._lock:
+                self._thread = None
+
+
+# Valores fracos: um escritor aberto segue vivo pelo `atexit`; depois de
+# encerrado (e sem motores que o usem), a entrada some sozinha
+_writers: "weakref.WeakValueDictionary[int, AuditWriter]" = weakref.WeakValueDictionary()
+_writers_lock = threading.Lock()
+
+
+def get_audit_writer(
+    connection: sqlite3.Connection, db_path: Optional[str] = None
+) -> AuditWriter:
+    """
+    Retorna o escritor de auditoria compartilhado de uma conexão.
+
+    Motores que usam a mesma conexão compartilham a mesma fila, de modo que o
+    `flush()` feito antes de uma escrita de estado cobre todas as rolagens.
+
+    Args:
+        connection (sqlite3.Connection): A conexão usada pelos motores.
+        db_path (Optional[str]): O arquivo do banco. Se informado (e não for um banco
+                                 em memória), a fila é descarregada em segundo plano.
+
+    Returns:
+        AuditWriter: O escritor associado à conexão.
+    """
+    with _writers_lock:
+        writer = _writers.get(id(connection))
+        if writer is not None and writer.connection is connection and not writer._closed:
+            return writer
+
+        manager = None
+        if db_path is not None:
+            manager = get_manager(db_path)
+            if manager.is_memory:
+                manager = None
+        writer = _writers[id(connection)] = AuditWriter(connection, manager)
+        return writer
@@ -0,0 +1,384 @@
+"""
+Módulo de Gerenciamento de Conexões (Connection Manager)
+========================================================
+
+Este módulo compõe a camada de Infraestrutura do motor Abraxas.
+Ele centraliza a abertura e a configuração das conexões com o banco SQLite
+embarcado, para que `BRPEngine`, `SkillEngine` e `CombatEngine` compartilhem
+a mesma conexão (e o mesmo cache de statements) em vez de abrir uma cada.
+
+Toda conexão criada aqui recebe os PRAGMAs de desempenho do projeto:
+    - journal_mode=WAL: leitores não bloqueiam o escritor (e vice-versa).
+    - synchronous configurável: 'NORMAL' evita um fsync por commit no modo WAL.
+    - cache_size e mmap_size: mais páginas em memória e leitura mapeada do arquivo.
+
+Dependências:
+    - sqlite3: Driver nativo do banco de dados embarcado.
+    - threading: Para as conexões exclusivas por thread (workers em segundo plano).
+    - queue: Para o pool de conexões somente-leitura (UI e análises).
+
+Padrões aplicados:
+    - Object Pool (conexões de leitura reaproveitáveis)
+    - Thread-Local Storage (uma conexão de escrita por thread)
+    - Injeção de Dependência (os motores aceitam uma conexão pronta)
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_DB_PATH = "abraxas.db"
+
+# Níveis aceitos pelo PRAGMA synchronous
+SYNCHRONOUS_LEVELS = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+
+def configure_connection(
+    connection: sqlite3.Connection,
+    synchronous: str = "NORMAL",
+    cache_size_kib: int = 16 * 1024,
+    mmap_size: int = 256 * 1024 * 1024,
+    wal: bool = True,
+) -> sqlite3.Connection:
+    """
+    Aplica os PRAGMAs de desempenho do Abraxas a uma conexão já aberta.
+
+    Args:
+        connection (sqlite3.Connection): A conexão a ser configurada.
+        synchronous (str): Nível do PRAGMA synchronous ('OFF', 'NORMAL', 'FULL', 'EXTRA').
+        cache_size_kib (int): Tamanho do cache de páginas em KiB.
+        mmap_size (int): Quantidade de bytes do arquivo lidos via memória mapeada.
+        wal (bool): Se o modo de journal WAL deve ser ativado.
+
+    Returns:
+        sqlite3.Connection: A própria conexão, para encadeamento.
+
+    Raises:
+        ValueError: Se o nível de `synchronous` for desconhecido.
+    """
+    level = synchronous.upper()
+    if level not in SYNCHRONOUS_LEVELS:
+        raise ValueError(f"Nível de synchronous inválido: '{synchronous}'.")
+
+    connection.row_factory = sqlite3.Row
+    if wal:
+        # Em bancos ':memory:' o SQLite simplesmente mantém o journal em memória
+        connection.execute("PRAGMA journal_mode = WAL")
+    connection.execute(f"PRAGMA synchronous = {level}")
+    # Valor negativo: o SQLite interpreta o tamanho em KiB ao invés de páginas
+    connection.execute(f"PRAGMA cache_size = -{int(cache_size_kib)}")
+    connection.execute(f"PRAGMA mmap_size = {int(mmap_size)}")
+    connection.execute("PRAGMA temp_store = MEMORY")
+    return connection
+
+
+# `sqlite3.Connection` não aceita referências fracas: os registros abaixo são
+# indexados por id() e guardam a própria conexão, conferida por identidade. Uma
+# entrada só vive enquanto há quem a use, de modo que o id nunca é reaproveitado
+# por outra conexão enquanto a entrada existe.
+_rollback_hooks: Dict[int, Tuple[sqlite3.Connection, List[weakref.WeakMethod]]] = {}
+_commit_callbacks: Dict[int, Tuple[sqlite3.Connection, List[Callable[[], None]]]] = {}
+_hooks_lock = threading.RLock()
+
+
+def _discard_rollback_hook(key: int, reference: weakref.WeakMethod) -> None:
+    """Remove o hook de um objeto coletado (e a entrada da conexão, se vazia)."""
+    with _hooks_lock:
+        entry = _rollback_hooks.get(key)
+        if entry is None or reference not in entry[1]:
+            return
+        entry[1].remove(reference)
+        if not entry[1]:
+            del _rollback_hooks[key]
+
+
+def on_rollback(connection: sqlite3.Connection, callback: Callable[[], None]) -> None:
+    """
+    Registra um método a ser chamado quando uma `transaction()` da conexão for desfeita.
+
+    Usado por caches write-through (ex: o `CharacterStateStore`) para descartar
+    valores que foram aplicados em memória mas nunca chegaram ao banco. O registro
+    é fraco: ele não mantém o objeto dono vivo e desaparece quando o objeto é
+    coletado, liberando a conexão.
+
+    Args:
+        connection (sqlite3.Connection): A conexão observada.
+        callback (Callable[[], None]): O método (ligado a um objeto) chamado após o rollback.
+
+    Raises:
+        TypeError: Se `callback` não for um método ligado a um objeto.
+    """
+    reference = weakref.WeakMethod(callback)
+    key = id(connection)
+    with _hooks_lock:
+        entry = _rollback_hooks.get(key)
+        if entry is None or entry[0] is not connection:
+            entry = _rollback_hooks[key] = (connection, [])
+        entry[1].append(reference)
+    weakref.finalize(callback.__self__, _discard_rollback_hook, key, reference)
+
+
+def after_commit(connection: sqlite3.Connection, callback: Callable[[], None]) -> None:
+    """
+    Executa `callback` somente depois que a transação em curso for confirmada.
+
+    Dentro de uma `transaction()`, a chamada é adiada até o COMMIT do bloco mais
+    externo e descartada em caso de ROLLBACK. Fora de uma transação, a mudança já
+    está confirmada e `callback` é executado imediatamente. Usado para publicar
+    eventos de mudança de estado que nunca devem anunciar escritas desfeitas.
+
+    Args:
+        connection (sqlite3.Connection): A conexão onde a escrita foi feita.
+        callback (Callable[[], None]): A função a ser executada após o COMMIT.
+    """
+    if not connection.in_transaction:
+        callback()
+        return
+    with _hooks_lock:
+        entry = _commit_callbacks.get(id(connection))
+        if entry is None or entry[0] is not connection:
+            entry = _commit_callbacks[id(connection)] = (connection, [])
+        entry[1].append(callback)
+
+
+def _take_commit_callbacks(connection: sqlite3.Connection) -> List[Callable[[], None]]:
+    """Retira os callbacks adiados da conexão (vazio se não houver)."""
+    with _hooks_lock:
+        entry = _commit_callbacks.pop(id(connection), None)
+    return entry[1] if entry is not None and entry[0] is connection else []
+
+
+def _rollback_callbacks(connection: sqlite3.Connection) -> List[Callable[[], None]]:
+    """Os hooks de rollback ainda vivos registrados para a conexão."""
+    with _hooks_lock:
+        entry = _rollback_hooks.get(id(connection))
+        references = list(entry[1]) if entry is not None and entry[0] is connection else []
+    callbacks = (reference() for reference in references)
+    return [callback for callback in callbacks if callback is not None]
+
+
+@contextmanager
+def transaction(connection: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """
+    Abre uma transação explícita, ou participa da transação já aberta na conexão.
+
+    Diferente de `with connection:`, blocos aninhados não comitam sozinhos: apenas
+    o bloco mais externo faz o COMMIT (ou o ROLLBACK, em caso de exceção). Isso
+    permite agrupar várias operações dos motores (ex: todos os golpes de um round)
+    em uma única transação.
+
+    Args:
+        connection (sqlite3.Connection): A conexão onde a transação será aberta.
+
+    Yields:
+        sqlite3.Connection: A própria conexão.
+    """
+    if connection.in_transaction:
+        yield connection
+        return
+
+    connection.execute("BEGIN")
+    try:
+        yield connection
+    except BaseException:
+        connection.rollback()
+        _take_commit_callbacks(connection)
+        for callback in _rollback_callbacks(connection):
+            callback()
+        raise
+    connection.commit()
+    for callback in _take_commit_callbacks(connection):
+        callback()
+
+
+class ConnectionManager:
+    """
+    Fornece conexões configuradas e compartilhadas para um arquivo SQLite.
+
+    Cada thread recebe a sua própria conexão de escrita (o `sqlite3` não permite
+    o uso concorrente de uma conexão), e leituras da UI ou de análises podem
+    emprestar conexões somente-leitura de um pool, sem disputar a conexão do motor.
+
+    Attributes:
+        db_path (str): O caminho do arquivo do banco de dados.
+        synchronous (str): Nível do PRAGMA synchronous das conexões criadas.
+        cache_size_kib (int): Tamanho do cache de páginas de cada conexão (KiB).
+        mmap_size (int): Bytes lidos via memória mapeada por conexão.
+        read_pool_size (int): Quantidade máxima de conexões somente-leitura.
+        cached_statements (int): Tamanho do cache de statements preparados por conexão.
+    """
+
+    def __init__(
+        self,
+        db_path: str = DEFAULT_DB_PATH,
+        synchronous: str = "NORMAL",
+        cache_size_kib: int = 16 * 1024,
+        mmap_size: int = 256 * 1024 * 1024,
+        read_pool_size: int = 4,
+        cached_statements: int = 256,
+        timeout: float = 5.0,
+    ) -> None:
+        self.db_path = db_path
+        self.synchronous = synchronous
+        self.cache_size_kib = cache_size_kib
+        self.mmap_size = mmap_size
+        self.read_pool_size = read_pool_size
+        self.cached_statements = cached_statements
+        self.timeout = timeout
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+        self._read_pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._read_created = 0
+
+    @property
+    def is_memory(self) -> bool:
+        """Indica se o banco gerenciado é um banco em memória (':memory:')."""
+        return self.db_path == ":memory:" or "mode=memory" in self.db_path
+
+    def _open(self, read_only: bool = False) -> sqlite3.Connection:
+        """Abre e configura uma nova conexão com o banco gerenciado."""
+        if read_only:
+            uri = f"file:{os.path.abspath(self.db_path)}?mode=ro"
+            connection = sqlite3.connect(
+                uri,
+                uri=True,
+                timeout=self.timeout,
+                cached_statements=self.cached_statements,
+                check_same_thread=False,
+            )
+            configure_connection(
+                connection, self.synchronous, self.cache_size_kib, self.mmap_size, wal=False
+            )
+            connection.execute("PRAGMA query_only = ON")
+            return connection
+
+        connection = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            cached_statements=self.cached_statements,
+            # A conexão pertence à thread que a criou; a flag apenas permite que
+            # `close()` seja chamado a partir da thread principal no encerramento.
+            check_same_thread=False,
+        )
+        return configure_connection(
+            connection, self.synchronous, self.cache_size_kib, self.mmap_size
+        )
+
+    def connection(self) -> sqlite3.Connection:
+        """
+        Retorna a conexão de leitura/escrita exclusiva da thread atual.
+
+        A primeira chamada em cada thread abre a conexão; as seguintes a reutilizam,
+        de modo que todos os motores criados na mesma thread compartilham a mesma
+        conexão e o mesmo cache de statements preparados.
+
+        Returns:
+            sqlite3.Connection: A conexão configurada da thread atual.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._open()
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    @contextmanager
+    def read_connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Empresta uma conexão somente-leitura do pool (ex: painéis da UI, relatórios).
+
+        Yields:
+            sqlite3.Connection: Conexão aberta em modo somente-leitura.
+
+        Raises:
+            ValueError: Se o banco gerenciado estiver em memória (não há arquivo a
+                        ser compartilhado entre conexões).
+        """
+        if self.is_memory:
+            raise ValueError("Bancos em memória não suportam o pool somente-leitura.")
+
+        try:
+            connection = self._read_pool.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_open = self._read_created < self.read_pool_size
+                if can_open:
+                    self._read_created += 1
+            # Pool esgotado: aguarda a devolução de uma conexão emprestada
+            connection = self._open(read_only=True) if can_open else self._read_pool.get()
+
+        try:
+            yield connection
+        finally:
+            if connection.in_transaction:
+                connection.rollback()
+            self._read_pool.put(connection)
+
+    def close(self) -> None:
+        """Fecha todas as conexões abertas pelo gerenciador (escrita e leitura)."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._read_created = 0
+        for connection in connections:
+            connection.close()
+        while True:
+            try:
+                self._read_pool.get_nowait().close()
+            except queue.Empty:
+                break
+        self._local = threading.local()
+
+
+_managers: Dict[str, ConnectionManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_manager(db_path: str = DEFAULT_DB_PATH, **options) -> ConnectionManager:
+    """
+    Retorna o gerenciador compartilhado do processo para um arquivo de banco.
+
+    Args:
+        db_path (str): O caminho do arquivo do banco de dados.
+        **options: Parâmetros do `ConnectionManager`, usados apenas na primeira
+                   chamada para um mesmo arquivo.
+
+    Returns:
+        ConnectionManager: O gerenciador associado ao arquivo.
+    """
+    key = db_path if db_path == ":memory:" else os.path.abspath(db_path)
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = ConnectionManager(db_path, **options)
+            _managers[key] = manager
+        return manager
+
+
+def get_connection(
+    db_path: str = DEFAULT_DB_PATH, connection: Optional[sqlite3.Connection] = None
+) -> sqlite3.Connection:
+    """
+    Resolve a conexão que um motor deve usar.
+
+    Uma conexão injetada (ex: um banco ':memory:' compartilhado em testes) tem
+    prioridade; caso contrário, retorna a conexão da thread atual fornecida pelo
+    gerenciador compartilhado do arquivo.
+
+    Args:
+        db_path (str): O caminho do arquivo do banco de dados.
+        connection (Optional[sqlite3.Connection]): Conexão já aberta a ser reutilizada.
+
+    Returns:
+        sqlite3.Connection: A conexão pronta para uso, com `row_factory` = `sqlite3.Row`.
+    """
+    if connection is not None:
+        connection.row_factory = sqlite3.Row
+        return connection
+    return get_manager(db_path).connection()
@@ -0,0 +1,293 @@
+"""
+Módulo de Migrações do Schema (Migration Runner)
+================================================
+
+Este módulo compõe a camada de Infraestrutura do motor Abraxas.
+Ele aplica os scripts SQL numerados do projeto (`NNN_<nome>.sql`), em ordem,
+cada um uma única vez por banco, e registra o que foi aplicado:
+
+    - Append-only: um script publicado nunca é editado nem reaplicado. Toda
+      mudança de schema (ex: uma coluna nova, com ALTER TABLE) ou de dados das
+      regras (ex: um UPDATE de uma semente) é um novo script no fim da lista,
+      e assim alcança também os bancos já existentes. Sementes rodam apenas na
+      aplicação do seu script: nunca voltam a um banco de jogador.
+    - `PRAGMA user_version`: a quantidade de scripts aplicados. Com o banco em
+      dia, a abertura custa apenas esta leitura e a conferência dos checksums.
+    - `schema_migrations`: o checksum SHA-256 de cada script aplicado. Um script
+      alterado depois de aplicado é um erro (`ValueError`), nunca uma reaplicação.
+    - Template: bancos novos são cópias de um banco modelo já migrado, em vez
+      de executar o DDL comando a comando a cada criação. O modelo é gerado na
+      primeira vez (ou na build do executável) e refeito quando um script muda.
+
+Cada script roda em uma única transação junto com o seu registro, de modo que
+uma falha no meio nunca deixa o banco com o script aplicado pela metade. Os
+scripts anteriores ao runner usam `CREATE ... IF NOT EXISTS` e `INSERT OR
+IGNORE` apenas para adotar, na primeira migração, bancos criados sem ele.
+
+Dependências:
+    - sqlite3: Para a execução dos scripts.
+    - hashlib: Para os checksums dos scripts.
+    - shutil/tempfile: Para a cópia atômica do banco modelo.
+
+Padrões aplicados:
+    - Schema Migration (versionamento por user_version)
+    - Prototype (bancos novos clonados de um modelo)
+"""
+
+import hashlib
+import os
+import shutil
+import sqlite3
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+SCHEMA_DIR = Path(__file__).resolve().parent
+
+# Ordem de aplicação: cada script depende das tabelas dos anteriores. Somente
+# acrescente ao fim (o número do arquivo é a versão); nunca edite um já publicado.
+MIGRATIONS: Tuple[str, ...] = (
+    "001_schema.sql",
+    "002_skills_schema.sql",
+    "003_combat_schema.sql",
+    "004_audit_schema.sql",
+    "005_revision_schema.sql",
+    "006_state_log_schema.sql",
+    "007_narrative_schema.sql",
+    "008_inventory_schema.sql",
+)
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+# Banco modelo (gerado, fora do controle de versão; embarcado na build do executável)
+TEMPLATE_PATH = SCHEMA_DIR / "abraxas_template.db"
+
+_BOOTSTRAP = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INTEGER PRIMARY KEY,
+    script TEXT NOT NULL,
+    checksum TEXT NOT NULL,
+    applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+
+@lru_cache(maxsize=None)
+def script_checksums() -> Dict[int, Tuple[str, str]]:
+    """
+    Retorna o nome e o checksum SHA-256 de cada script, indexados pela versão.
+
+    Returns:
+        Dict[int, Tuple[str, str]]: Mapeia a versão (1..N) a (script, checksum).
+    """
+    return {
+        version: (script, hashlib.sha256((SCHEMA_DIR / script).read_bytes()).hexdigest())
+        for version, script in enumerate(MIGRATIONS, start=1)
+    }
+
+
+def _user_version(connection: sqlite3.Connection) -> int:
+    return connection.execute("PRAGMA user_version").fetchone()[0]
+
+
+def applied_checksums(connection: sqlite3.Connection) -> Dict[int, str]:
+    """
+    Retorna os checksums registrados no banco, indexados pela versão.
+
+    Args:
+        connection (sqlite3.Connection): A conexão com o banco.
+
+    Returns:
+        Dict[int, str]: Vazio em bancos que nunca passaram pelo runner.
+    """
+    exists = connection.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_migrations'"
+    ).fetchone()
+    if exists is None:
+        return {}
+    return dict(connection.execute("SELECT version, checksum FROM schema_migrations"))
+
+
+def pending_migrations(connection: sqlite3.Connection) -> List[int]:
+    """
+    Lista as versões que ainda precisam ser aplicadas.
+
+    Args:
+        connection (sqlite3.Connection): A conexão com o banco.
+
+    Returns:
+        List[int]: As versões pendentes, em ordem de aplicação.
+
+    Raises:
+        ValueError: Se o banco for de uma versão mais nova que este código, ou se
+            um script já aplicado tiver sido alterado desde então.
+    """
+    user_version = _user_version(connection)
+    if user_version > SCHEMA_VERSION:
+        raise ValueError(
+            f"O banco está na versão {user_version}, mais nova que a suportada ({SCHEMA_VERSION})."
+        )
+    applied = applied_checksums(connection)
+    for version, (script, checksum) in script_checksums().items():
+        recorded = applied.get(version)
+        if version <= user_version and recorded is not None and recorded != checksum:
+            raise ValueError(
+                f"O script '{script}' (versão {version}) foi alterado depois de aplicado. "
+                "Scripts publicados não podem ser editados: crie uma nova migração."
+            )
+    return list(range(user_version + 1, SCHEMA_VERSION + 1))
+
+
+def migrate(connection: sqlite3.Connection) -> List[int]:
+    """
+    Aplica os scripts pendentes; não faz nada se o banco já estiver em dia.
+
+    Args:
+        connection (sqlite3.Connection): A conexão com o banco (sem transação aberta).
+
+    Returns:
+        List[int]: As versões aplicadas nesta chamada.
+
+    Raises:
+        ValueError: Se o banco for de uma versão mais nova que este código, ou se
+            um script já aplicado tiver sido alterado.
+        sqlite3.Error: Se um script falhar (a sua transação é desfeita).
+    """
+    pending = pending_migrations(connection)
+    if not pending:
+        return []
+
+    connection.executescript(_BOOTSTRAP)
+    checksums = script_checksums()
+    for version in pending:
+        script, checksum = checksums[version]
+        sql = (SCHEMA_DIR / script).read_text(encoding="utf-8")
+        try:
+            # Script, registro e user_version na mesma transação
+            connection.executescript(
+                f"""
+                BEGIN;
+                {sql}
+                ;
+                INSERT INTO schema_migrations (version, script, checksum)
+                VALUES ({version}, '{script}', '{checksum}');
+                PRAGMA user_version = {version};
+                COMMIT;
+                """
+            )
+        except sqlite3.Error:
+            if connection.in_transaction:
+                connection.rollback()
+            raise
+    return pending
+
+
+def _is_current(path: Path) -> bool:
+    """Indica se um arquivo de banco existe e está com todos os scripts em dia."""
+    if not path.exists():
+        return False
+    connection = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        return not pending_migrations(connection)
+    except (sqlite3.Error, ValueError):
+        return False
+    finally:
+        connection.close()
+
+
+def build_template(path: Path = TEMPLATE_PATH) -> Path:
+    """
+    Gera (ou refaz) o banco modelo aplicando todos os scripts.
+
+    O arquivo é montado em um temporário e renomeado no fim, de modo que outro
+    processo nunca copia um modelo incompleto.
+
+    Args:
+        path (Path): O destino do banco modelo.
+
+    Returns:
+        Path: O próprio caminho, para encadeamento.
+    """
+    path = Path(path)
+    descriptor, temporary = tempfile.mkstemp(suffix=".db", dir=path.parent)
+    os.close(descriptor)
+    try:
+        connection = sqlite3.connect(temporary)
+        try:
+            migrate(connection)
+            connection.execute("VACUUM")
+        finally:
+            connection.close()
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    return path
+
+
+def create_database(path: str, template: Optional[Path] = TEMPLATE_PATH) -> str:
+    """
+    Cria (ou recria) um banco com o schema e as sementes do Abraxas.
+
+    O banco é uma cópia do modelo; um modelo ausente ou desatualizado é refeito
+    antes. Se o modelo não puder ser gravado (ex: pasta somente-leitura do
+    executável), os scripts são aplicados diretamente no novo banco.
+
+    Args:
+        path (str): O caminho do arquivo a ser criado.
+        template (Optional[Path]): O banco modelo. None aplica os scripts diretamente.
+
+    Returns:
+        str: O próprio caminho, para encadeamento.
+    """
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+    if template is not None:
+        template = Path(template)
+        try:
+            if not _is_current(template):
+                build_template(template)
+        except OSError:
+            template = None
+
+    if template is not None:
+        temporary = f"{path}.tmp"
+        shutil.copyfile(template, temporary)
+        os.replace(temporary, path)
+    else:
+        connection = sqlite3.connect(path)
+        try:
+            migrate(connection)
+        finally:
+            connection.close()
+    return path
+
+
+def ensure_database(path: str, template: Optional[Path] = TEMPLATE_PATH) -> List[int]:
+    """
+    Garante que o banco exista e esteja em dia (ponto de entrada da aplicação).
+
+    Args:
+        path (str): O caminho do arquivo do banco.
+        template (Optional[Path]): O banco modelo usado se o arquivo não existir.
+
+    Returns:
+        List[int]: As versões aplicadas (vazia se o banco já estava em dia).
+    """
+    if not os.path.exists(path):
+        create_database(path, template)
+        return list(script_checksums())
+    connection = sqlite3.connect(path)
+    try:
+        return migrate(connection)
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    # Usado na build do executável: python -m src.database.migrations
+    print(f"Banco modelo gerado em {build_template()}")
@@ -0,0 +1,392 @@
+"""
+Módulo de Consultas de Leitura (Query API)
+==========================================
+
+Este módulo compõe a camada de Infraestrutura do motor Abraxas.
+Ele concentra as consultas de leitura do histórico de rolagens usadas pela TUI
+e por análises, sem nunca varrer `roll_history` por inteiro:
+
+    - Estatísticas: lidas da tabela agregada `roll_stats`, mantida por triggers
+      a cada linha gravada pelo `AuditWriter`.
+    - Histórico: paginado por keyset sobre o índice (char_id, created_at); a
+      próxima página começa após o cursor da última linha lida, nunca com OFFSET
+      (que descartaria todas as linhas das páginas anteriores a cada consulta).
+    - Janelas do log: trechos contíguos em ordem de `log_id`, estendidos por
+      keyset a partir das bordas da janela já carregada (ver `RollLogWidget`).
+      Só o salto da barra de rolagem para uma posição arbitrária (`get_rolls_at`)
+      usa OFFSET, percorrendo o índice a partir da ponta mais próxima.
+
+As funções recebem a conexão já aberta, de modo que podem usar tanto a conexão
+do motor quanto uma conexão emprestada de `ConnectionManager.read_connection()`.
+
+Dependências:
+    - sqlite3: Para a execução das consultas.
+
+Padrões aplicados:
+    - Keyset Pagination (Seek Method)
+    - Materialized Aggregates (contagens incrementais)
+"""
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+# Cursor de paginação: (created_at, log_id) da última linha entregue
+HistoryCursor = Tuple[str, int]
+
+_SUCCESS_LEVELS = ("SUCCESS", "SPECIAL_SUCCESS")
+
+
+@dataclass(frozen=True)
+class RollStats:
+    """
+    Contagens de rolagens de um personagem em uma ação.
+
+    Attributes:
+        char_id (Optional[str]): O personagem (None em estatísticas globais da ação).
+        action_name (str): A perícia ou ação (ex: 'SKL_DODGE').
+        counts (Dict[str, int]): Quantidade de rolagens por nível de sucesso.
+    """
+
+    char_id: Optional[str]
+    action_name: str
+    counts: Dict[str, int]
+
+    @property
+    def total(self) -> int:
+        """Quantidade total de rolagens."""
+        return sum(self.counts.values())
+
+    @property
+    def successes(self) -> int:
+        """Quantidade de rolagens bem-sucedidas (inclui os sucessos especiais)."""
+        return sum(self.counts.get(level, 0) for level in _SUCCESS_LEVELS)
+
+    @property
+    def success_rate(self) -> float:
+        """Fração de rolagens bem-sucedidas (0.0 se não houver rolagens)."""
+        return self.successes / self.total if self.total else 0.0
+
+
+@dataclass(frozen=True)
+class RollRecord:
+    """
+    Linha de `roll_history`.
+
+    Attributes:
+        log_id (int): O identificador sequencial da rolagem.
+        char_id (str): O personagem que rolou.
+        action_name (str): A perícia ou ação rolada.
+        die_result (int): O resultado bruto do d100.
+        success_level (str): O nível de sucesso alcançado.
+        created_at (str): O carimbo de tempo gravado pelo SQLite.
+    """
+
+    log_id: int
+    char_id: str
+    action_name: str
+    die_result: int
+    success_level: str
+    created_at: str
+
+
+@dataclass(frozen=True)
+class HistoryPage:
+    """
+    Página do histórico de rolagens.
+
+    Attributes:
+        records (List[RollRecord]): As rolagens da página, da mais recente à mais antiga.
+        next_cursor (Optional[HistoryCursor]): Cursor da próxima página (None na última).
+    """
+
+    records: List[RollRecord]
+    next_cursor: Optional[HistoryCursor]
+
+
+def _group_stats(rows, char_id: Optional[str]) -> Dict[str, RollStats]:
+    """Agrupa linhas (action_name, success_level, roll_count) por ação."""
+    grouped: Dict[str, Dict[str, int]] = {}
+    for action_name, success_level, roll_count in rows:
+        if roll_count:
+            grouped.setdefault(action_name, {})[success_level] = roll_count
+    return {
+        action_name: RollStats(char_id, action_name, counts)
+        for action_name, counts in grouped.items()
+    }
+
+
+def get_character_stats(
+    connection: sqlite3.Connection, char_id: str
+) -> Dict[str, RollStats]:
+    """
+    Retorna as estatísticas de todas as ações já roladas por um personagem.
+
+    Args:
+        connection (sqlite3.Connection): A conexão de leitura.
+        char_id (str): O identificador do personagem.
+
+    Returns:
+        Dict[str, RollStats]: Mapeia cada ação às suas contagens.
+    """
+    rows = connection.execute(
+        """
+        SELECT action_name, success_level, roll_count
+        FROM roll_stats
+        WHERE char_id = ?
+        """,
+        (char_id,),
+    )
+    return _group_stats(rows, char_id)
+
+
+def get_skill_stats(
+    connection: sqlite3.Connection, char_id: str, action_name: str
+) -> RollStats:
+    """
+    Retorna as estatísticas de um personagem em uma única perícia ou ação.
+
+    Args:
+        connection (sqlite3.Connection): A conexão de leitura.
+        char_id (str): O identificador do personagem.
+        action_name (str): A perícia ou ação (ex: 'SKL_DODGE').
+
+    Returns:
+        RollStats: As contagens (vazias se a ação nunca foi rolada).
+    """
+    rows = connection.execute(
+        """
+        SELECT action_name, success_level, roll_count
+        FROM roll_stats
+        WHERE char_id = ? AND action_name = ?
+        """,
+        (char_id, action_name),
+    )
+    stats = _group_stats(rows, char_id)
+    return stats.get(action_name, RollStats(char_id, action_name, {}))
+
+
+def get_action_stats(connection: sqlite3.Connection, action_name: str) -> RollStats:
+    """
+    Retorna as estatísticas globais de uma ação, somando todos os personagens.
+
+    Args:
+        connection (sqlite3.Connection): A conexão de leitura.
+        action_name (str): A perícia ou ação (ex: 'SKL_DODGE').
+
+    Returns:
+        RollStats: As contagens agregadas (`char_id` = None).
+    """
+    rows = connection.execute(
+        """
+        SELECT action_name, success_level, SUM(roll_count)
+        FROM roll_stats
+        WHERE action_name = ?
+        GROUP BY success_level
+        """,
+        (action_name,),
+    )
+    stats = _group_stats(rows, None)
+    return stats.get(action_name, RollStats(None, action_name, {}))
+
+
+def count_rolls(connection: sqlite3.Connection, char_id: str) -> int:
+    """
+    Retorna a quantidade de rolagens de um personagem, lida de `roll_stats`.
+
+    Args:
+        connection (sqlite3.Connection): A conexão de leitura.
+        char_id (str): O identificador do personagem.
+
+    Returns:
+        int: O total de linhas do personagem em `roll_history`.
+    """
+    row = connection.execute(
+        "SELECT COALESCE(SUM(roll_count), 0) FROM roll_stats WHERE char_id = ?",
+        (char_id,),
+    ).fetchone()
+    return row[0]
+
+
+_WINDOW_COLUMNS = "log_id, char_id, action_name, die_result, success_level, created_at"
+
+
+def get_rolls_before(
+    connection: sqlite3.Connection, char_id: str, before_id: Optional[int], limit: int
+) -> List[RollRecord]:
+    """
+    Retorna as `limit` rolagens imediatamente anteriores a `before_id`.
+
+    Args:
+        connection (sqlite3.Connection): A conexão de leitura.
+        char_id (str): O identificador do personagem.
+        before_id (Optional[int]): O `log_id` da borda superior da janela. Se
+                                   omitido, retorna as rolagens mais recentes.
+        limit (int): A quantidade máxima de rolagens.
+
+    Returns:
+        List[RollRecord]: As rolagens em ordem crescente de `log_id`.
+    """
+    if limit <= 0:
+        return []
+    clauses = ["char_id = ?"]
+    params: list = [char_id]
+    if before_id is not None:
+        clauses.append("log_id < ?")
+        params.append(before_id)
+    params.append(limit)
+    rows = connection.execute(
+        f"""
+        SELECT {_WINDOW_COLUMNS}
+        FROM roll_history INDEXED BY idx_roll_history_char_log
+        WHERE {" AND ".join(clauses)}
+        ORDER BY log_id DESC
+        LIMIT ?
+        """,
+        params,
+    ).fetchall()
+    return [RollRecord(*row) for row in reversed(rows)]
+
+
+def get_rolls_after(
+    connection: sqlite3.Connection, char_id: str, after_id: int, limit: int
+) -> List[RollRecord]:
+    """
+    Retorna as `limit` rolagens imediatamente posteriores a `after_id`.
+
+    Args:
+        connection (sqlite3.Connection): A conexão de leitura.
+        char_id (str): O identificador do personagem.
+        after_id (int): O `log_id` da borda inferior da janela.
+        limit (int): A quantidade máxima de rolagens.
+
+    Returns:
+        List[RollRecord]: As rolagens em ordem crescente de `log_id`.
+    """
+    if limit <= 0:
+        return []
+    rows = connection.execute(
+        f"""
+        SELECT {_WINDOW_COLUMNS}
+        FROM roll_history INDEXED BY idx_roll_history_char_log
+        WHERE char_id = ? AND log_id > ?
+        ORDER BY log_id
+        LIMIT ?
+        """,
+        (char_id, after_id, limit),
+    ).fetchall()
+    return [RollRecord(*row) for row in rows]
+
+
+def get_rolls_at(
+    connection: sqlite3.Connection,
+    char_id: str,
+    position: int,
+    limit: int,
+    total: Optional[int] = None,
+) -> List[RollRecord]:
+    """
+    Retorna as `limit` rolagens a partir de uma posição (0 = a mais antiga).
+
+    Usada apenas em saltos da barra de rolagem para longe da janela carregada.
+    Não é keyset: a rolagem da posição é localizada com OFFSET sobre o índice
+    (char_id, log_id), sem ler as linhas puladas, mas a partir da ponta mais
+    próxima (a mais antiga ou, depois da metade, a mais recente). O custo é
+    O(min(posição, total - posição)) passos de índice; a janela em si é lida
+    por keyset a partir da rolagem localizada.
+
+    Args:
+        connection (sqlite3.Connection): A conexão de leitura.
+        char_id (str): O identificador do personagem.
+        position (int): A posição da primeira rolagem da janela.
+        limit (int): A quantidade máxima de rolagens.
+        total (Optional[int]): O total de rolagens do personagem, se já conhecido.
+            Se omitido, é lido de `roll_stats` (ver `count_rolls`).
+
+    Returns:
+        List[RollRecord]: As rolagens em ordem crescente de `log_id`.
+    """
+    position = max(position, 0)
+    if total is None:
+        total = count_rolls(connection, char_id)
+    if limit <= 0 or position >= total:
+        return []
+    if position < total // 2:
+        order, offset = "ASC", position
+    else:
+        order, offset = "DESC", total - 1 - position
+    rows = connection.execute(
+        f"""
+        SELECT {_WINDOW_COLUMNS}
+        FROM roll_history INDEXED BY idx_roll_history_char_log
+        WHERE char_id = ? AND log_id >= (
+            SELECT log_id FROM roll_history INDEXED BY idx_roll_history_char_log
+            WHERE char_id = ?
+            ORDER BY log_id {order}
+            LIMIT 1 OFFSET ?
+        )
+        ORDER BY log_id
+        LIMIT ?
+        """,
+        (char_id, char_id, offset, limit),
+    ).fetchall()
+    return [RollRecord(*row) for row in rows]
+
+
+def get_roll_history(
+    connection: sqlite3.Connection,
+    char_id: str,
+    limit: int = 50,
+    after: Optional[HistoryCursor] = None,
+    action_name: Optional[str] = None,
+) -> HistoryPage:
+    """
+    Retorna uma página do histórico de um personagem, da rolagem mais recente
+    para a mais antiga, usando paginação por keyset.
+
+    Args:
+        connection (sqlite3.Connection): A conexão de leitura.
+        char_id (str): O identificador do personagem.
+        limit (int): A quantidade máxima de rolagens na página.
+        after (Optional[HistoryCursor]): O `next_cursor` da página anterior. Se
+                                         omitido, retorna a primeira página.
+        action_name (Optional[str]): Filtra por uma perícia ou ação.
+
+    Returns:
+        HistoryPage: As rolagens e o cursor da próxima página.
+
+    Raises:
+        ValueError: Se `limit` não for positivo.
+    """
+    if limit <= 0:
+        raise ValueError("O tamanho da página deve ser positivo.")
+
+    clauses = ["char_id = ?"]
+    params: list = [char_id]
+    if after is not None:
+        # Comparação de row values: continua exatamente após a última linha lida
+        clauses.append("(created_at, log_id) < (?, ?)")
+        params.extend(after)
+    if action_name is not None:
+        clauses.append("action_name = ?")
+        params.append(action_name)
+    # Uma linha a mais indica se existe a próxima página
+    params.append(limit + 1)
+
+    rows = connection.execute(
+        f"""
+        SELECT log_id, char_id, action_name, die_result, success_level, created_at
+        FROM roll_history INDEXED BY idx_roll_history_char_created
+        WHERE {" AND ".join(clauses)}
+        ORDER BY created_at DESC, log_id DESC
+        LIMIT ?
+        """,
+        params,
+    ).fetchall()
+
+    records = [RollRecord(*row) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = records[-1]
+        next_cursor = (last.created_at, last.log_id)
+    return HistoryPage(records, next_cursor)
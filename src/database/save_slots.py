@@ -0,0 +1,460 @@
+"""
+Módulo de Slots de Save (Save Slot Manager)
+===========================================
+
+Este módulo compõe a camada de Infraestrutura do motor Abraxas.
+Ele grava e restaura "fotografias" do banco da campanha sem parar o jogo:
+
+    - Save: uma thread em segundo plano copia o banco vivo com a API de backup
+      do SQLite (`sqlite3.Connection.backup`) em passos de N páginas, segurando
+      uma transação de leitura na origem. Em modo WAL o escritor (os motores)
+      segue gravando durante a cópia, e a cópia é um snapshot consistente: nunca
+      captura um WAL pela metade, como uma cópia do arquivo poderia.
+    - Armazenamento: as páginas são comprimidas (zlib) e gravadas em arquivos de
+      pacote (`packs/*.pack`); o manifesto do slot (`<slot>.json`) aponta onde
+      está cada página e guarda o hash de cada uma.
+    - Incremental: cada página copiada é comparada (pelo hash) com a mesma página
+      do último slot gravado; só as páginas alteradas são comprimidas e gravadas,
+      as demais são referências aos pacotes anteriores. A cadeia de pacotes é
+      limitada (`max_packs`): ao passar do limite, o slot é gravado completo.
+    - Load: o slot é remontado em um banco temporário, verificado (hashes,
+      `quick_check` e migrações pendentes) e copiado sobre o banco vivo pela
+      própria API de backup, em uma única transação: as outras conexões veem o
+      banco antigo ou o restaurado, nunca uma mistura.
+
+Os caches dos motores (estado, regras, narrativa) são invalidados pelas revisões
+de `cache_revisions`: o banco restaurado recebe revisões acima de todas as já
+vistas pelo banco vivo, de modo que nenhum cache confunde o save com o presente.
+
+Dependências:
+    - sqlite3: Para a API de backup e a verificação dos bancos.
+    - zlib/hashlib: Para a compressão e os hashes das páginas.
+    - concurrent.futures: Para a thread em segundo plano.
+    - src.database.migrations: Para atualizar saves de versões anteriores do schema.
+
+Padrões aplicados:
+    - Memento (fotografias restauráveis do estado)
+    - Content-Addressed Delta (páginas reaproveitadas pelo hash)
+    - Active Object (operações serializadas em uma thread própria)
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import time
+import uuid
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.database.connection import DEFAULT_DB_PATH
+from src.database.migrations import migrate
+
+# Nomes de slot aceitos (viram nomes de arquivo)
+SLOT_NAME = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+# Slot usado pelo quick-save / quick-load da TUI
+QUICK_SLOT = "quick"
+
+# Progresso de uma cópia: (páginas restantes, total de páginas)
+Progress = Callable[[int, int], None]
+
+# Localização de uma página comprimida: (pacote, deslocamento, tamanho)
+PageRef = Tuple[str, int, int]
+
+_DIGEST_SIZE = 16
+
+
+@dataclass(frozen=True)
+class SaveSlot:
+    """
+    Resumo de um slot gravado (conteúdo do manifesto, sem o índice de páginas).
+
+    Attributes:
+        name (str): O nome do slot (ex: 'quick', 'antes_do_chefe').
+        label (str): Descrição livre exibida ao jogador.
+        created_at (float): Momento da gravação (epoch, segundos).
+        page_size (int): Tamanho de página do banco.
+        page_count (int): Quantidade de páginas do banco no save.
+        written_pages (int): Páginas comprimidas e gravadas por este save
+            (as demais foram reaproveitadas de saves anteriores).
+        written_bytes (int): Bytes comprimidos gravados por este save.
+        parent (Optional[str]): O slot usado como base incremental (None = completo).
+    """
+
+    name: str
+    label: str
+    created_at: float
+    page_size: int
+    page_count: int
+    written_pages: int
+    written_bytes: int
+    parent: Optional[str]
+
+
+def _digest(page: bytes) -> str:
+    return hashlib.blake2b(page, digest_size=_DIGEST_SIZE).hexdigest()
+
+
+def _remove(path: str) -> None:
+    for suffix in ("", "-wal", "-shm", "-journal"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+class SaveSlotManager:
+    """
+    Grava e restaura slots de save de um banco, em uma thread em segundo plano.
+
+    Todas as operações retornam um `Future` e rodam, em ordem, na mesma thread:
+    um load pedido logo após um save restaura o save já concluído. Na TUI, use
+    `asyncio.wrap_future` para aguardá-las sem bloquear o Event Loop.
+
+    Attributes:
+        db_path (str): O banco da campanha.
+        directory (Path): Pasta dos manifestos e dos pacotes de páginas.
+        pages_per_step (int): Páginas copiadas por passo da API de backup.
+        compression_level (int): Nível do zlib (1 = mais rápido, 9 = menor).
+        max_packs (int): Pacotes distintos que um save incremental pode referenciar.
+    """
+
+    def __init__(
+        self,
+        db_path: str = DEFAULT_DB_PATH,
+        directory: Optional[str] = None,
+        pages_per_step: int = 256,
+        compression_level: int = 6,
+        max_packs: int = 8,
+        timeout: float = 5.0,
+    ) -> None:
+        """
+        Args:
+            db_path (str): O caminho do banco da campanha.
+            directory (Optional[str]): Pasta dos slots. Padrão: '<banco>.saves' ao
+                lado do banco.
+            pages_per_step (int): Páginas copiadas por passo do backup (> 0).
+            compression_level (int): Nível de compressão do zlib (0 a 9).
+            max_packs (int): Limite da cadeia incremental (>= 1).
+            timeout (float): Espera (segundos) pelos locks do banco vivo.
+
+        Raises:
+            ValueError: Se algum parâmetro estiver fora da faixa.
+        """
+        if pages_per_step <= 0:
+            raise ValueError(f"pages_per_step deve ser positivo: {pages_per_step}.")
+        if not 0 <= compression_level <= 9:
+            raise ValueError(f"Nível de compressão inválido: {compression_level}.")
+        if max_packs < 1:
+            raise ValueError(f"max_packs deve ser ao menos 1: {max_packs}.")
+        self.db_path = db_path
+        self.directory = Path(directory or f"{db_path}.saves")
+        self.pages_per_step = pages_per_step
+        self.compression_level = compression_level
+        self.max_packs = max_packs
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="abraxas-saves")
+
+    # ------------------------------------------------------------------ arquivos
+
+    @property
+    def _packs(self) -> Path:
+        return self.directory / "packs"
+
+    def _manifest_path(self, name: str) -> Path:
+        if not SLOT_NAME.match(name):
+            raise ValueError(f"Nome de slot inválido: '{name}'.")
+        return self.directory / f"{name}.json"
+
+    def _read_manifest(self, name: str) -> Dict:
+        path = self._manifest_path(name)
+        try:
+            with open(path, encoding="utf-8") as handle:
+                return json.load(handle)
+        except FileNotFoundError:
+            raise ValueError(f"Slot '{name}' não encontrado.") from None
+
+    @staticmethod
+    def _summary(manifest: Dict) -> SaveSlot:
+        return SaveSlot(
+            manifest["name"],
+            manifest["label"],
+            manifest["created_at"],
+            manifest["page_size"],
+            len(manifest["pages"]),
+            manifest["written_pages"],
+            manifest["written_bytes"],
+            manifest["parent"],
+        )
+
+    def _manifests(self) -> List[Dict]:
+        manifests = []
+        for path in sorted(self.directory.glob("*.json")):
+            try:
+                with open(path, encoding="utf-8") as handle:
+                    manifests.append(json.load(handle))
+            except (OSError, ValueError):
+                continue  # Manifesto ilegível não impede os demais
+        return manifests
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        """Grava em um temporário e renomeia: o destino nunca fica pela metade."""
+        temporary = path.with_name(f".{path.name}.tmp")
+        with open(temporary, "wb") as handle:
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporary, path)
+
+    def _collect_garbage(self) -> int:
+        """Remove os pacotes que nenhum manifesto referencia mais."""
+        referenced = {ref[0] for manifest in self._manifests() for ref in manifest["pages"]}
+        removed = 0
+        for pack in self._packs.glob("*.pack"):
+            if pack.stem not in referenced:
+                pack.unlink()
+                removed += 1
+        return removed
+
+    # ------------------------------------------------------------------ consultas
+
+    def slots(self) -> List[SaveSlot]:
+        """
+        Lista os slots gravados, do mais recente ao mais antigo.
+
+        Returns:
+            List[SaveSlot]: Os resumos dos slots.
+        """
+        summaries = [self._summary(manifest) for manifest in self._manifests()]
+        return sorted(summaries, key=lambda slot: slot.created_at, reverse=True)
+
+    def stored_bytes(self) -> int:
+        """Espaço ocupado pelos pacotes de páginas (todos os slots)."""
+        return sum(pack.stat().st_size for pack in self._packs.glob("*.pack"))
+
+    # ------------------------------------------------------------------ operações
+
+    def save(
+        self, name: str = QUICK_SLOT, label: str = "", progress: Optional[Progress] = None
+    ) -> "Future[SaveSlot]":
+        """
+        Agenda a gravação de um slot (sobrescreve o slot de mesmo nome).
+
+        Args:
+            name (str): O nome do slot.
+            label (str): Descrição livre.
+            progress (Optional[Progress]): Chamada a cada passo da cópia, na thread
+                dos saves, com (páginas restantes, total).
+
+        Returns:
+            Future[SaveSlot]: O resumo do slot gravado.
+
+        Raises:
+            ValueError: Se o nome do slot for inválido.
+        """
+        self._manifest_path(name)
+        return self._executor.submit(self._save, name, label, progress)
+
+    def load(
+        self, name: str = QUICK_SLOT, progress: Optional[Progress] = None
+    ) -> "Future[SaveSlot]":
+        """
+        Agenda a restauração de um slot sobre o banco vivo.
+
+        Grave antes a auditoria pendente dos motores (ex: `AuditWriter.flush`):
+        rolagens gravadas depois do load entram no banco restaurado.
+
+        Args:
+            name (str): O nome do slot.
+            progress (Optional[Progress]): Chamada a cada passo da remontagem.
+
+        Returns:
+            Future[SaveSlot]: O resumo do slot restaurado. O Future falha com
+            ValueError se o slot não existir ou estiver corrompido (o banco vivo
+            não é alterado).
+        """
+        self._manifest_path(name)
+        return self._executor.submit(self._load, name, progress)
+
+    def delete(self, name: str) -> "Future[None]":
+        """Agenda a remoção de um slot (os pacotes só somem quando ninguém os usa)."""
+        path = self._manifest_path(name)
+
+        def _delete() -> None:
+            if not path.exists():
+                raise ValueError(f"Slot '{name}' não encontrado.")
+            path.unlink()
+            self._collect_garbage()
+
+        return self._executor.submit(_delete)
+
+    def close(self) -> None:
+        """Aguarda as operações agendadas e encerra a thread dos saves."""
+        self._executor.shutdown(wait=True)
+
+    # ------------------------------------------------------------------ save
+
+    def _snapshot(self, destination: str, progress: Optional[Progress]) -> None:
+        """Copia o banco vivo para `destination`, em passos, a partir de um snapshot fixo."""
+        source = sqlite3.connect(self.db_path, timeout=self.timeout, isolation_level=None)
+        target = sqlite3.connect(destination)
+        try:
+            # A transação de leitura fixa o snapshot do WAL: as gravações dos motores
+            # durante a cópia não reiniciam o backup nem entram nele pela metade
+            source.execute("BEGIN")
+            source.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchone()
+            source.backup(
+                target,
+                pages=self.pages_per_step,
+                progress=(lambda status, remaining, total: progress(remaining, total))
+                if progress is not None
+                else None,
+            )
+            source.execute("COMMIT")
+        finally:
+            target.close()
+            source.close()
+
+    def _base(self, page_size: int) -> Optional[Dict]:
+        """
+        O último slot gravado, de qualquer nome, se puder servir de base incremental.
+
+        O slot mais recente é a cópia mais próxima do banco vivo (e com menos
+        páginas a regravar); um slot de mesmo nome pode ser bem mais antigo.
+        """
+        manifests = [m for m in self._manifests() if m["page_size"] == page_size]
+        if not manifests:
+            return None
+        base = max(manifests, key=lambda manifest: manifest["created_at"])
+        packs = {ref[0] for ref in base["pages"]}
+        # Cadeias longas espalham um save por muitos pacotes: grava completo
+        return base if len(packs) < self.max_packs else None
+
+    def _save(self, name: str, label: str, progress: Optional[Progress]) -> SaveSlot:
+        self._packs.mkdir(parents=True, exist_ok=True)
+        descriptor, copy_path = tempfile.mkstemp(suffix=".db", dir=self.directory)
+        os.close(descriptor)
+        pack_id = uuid.uuid4().hex
+        pack_path = self._packs / f"{pack_id}.pack"
+        try:
+            self._snapshot(copy_path, progress)
+            with closing(sqlite3.connect(copy_path)) as copy:
+                page_size = copy.execute("PRAGMA page_size").fetchone()[0]
+
+            base = self._base(page_size)
+            base_pages: List[PageRef] = base["pages"] if base else []
+            base_hashes: List[str] = base["hashes"] if base else []
+
+            pages: List[PageRef] = []
+            hashes: List[str] = []
+            offset = 0
+            with open(copy_path, "rb") as copy_file, open(pack_path, "wb") as pack:
+                for index, page in enumerate(iter(lambda: copy_file.read(page_size), b"")):
+                    digest = _digest(page)
+                    hashes.append(digest)
+                    if index < len(base_hashes) and base_hashes[index] == digest:
+                        pages.append(tuple(base_pages[index]))
+                        continue
+                    compressed = zlib.compress(page, self.compression_level)
+                    pack.write(compressed)
+                    pages.append((pack_id, offset, len(compressed)))
+                    offset += len(compressed)
+                pack.flush()
+                os.fsync(pack.fileno())
+            if offset == 0:
+                pack_path.unlink()
+
+            manifest = {
+                "name": name,
+                "label": label,
+                "created_at": time.time(),
+                "page_size": page_size,
+                "written_pages": sum(1 for ref in pages if ref[0] == pack_id),
+                "written_bytes": offset,
+                "parent": base["name"] if base else None,
+                "pages": pages,
+                "hashes": hashes,
+            }
+            self._write_atomic(
+                self._manifest_path(name), json.dumps(manifest, separators=(",", ":")).encode()
+            )
+        except BaseException:
+            if pack_path.exists():
+                pack_path.unlink()
+            raise
+        finally:
+            _remove(copy_path)
+        self._collect_garbage()
+        return self._summary(manifest)
+
+    # ------------------------------------------------------------------ load
+
+    def _rebuild(self, manifest: Dict, destination: str, progress: Optional[Progress]) -> None:
+        """Remonta o arquivo do banco a partir das páginas, conferindo os hashes."""
+        total = len(manifest["pages"])
+        handles: Dict[str, object] = {}
+        try:
+            with open(destination, "wb") as output:
+                for index, ((pack_id, offset, length), digest) in enumerate(
+                    zip(manifest["pages"], manifest["hashes"])
+                ):
+                    handle = handles.get(pack_id)
+                    if handle is None:
+                        try:
+                            handle = handles[pack_id] = open(self._packs / f"{pack_id}.pack", "rb")
+                        except FileNotFoundError:
+                            raise ValueError(
+                                f"Slot '{manifest['name']}' corrompido: pacote ausente."
+                            ) from None
+                    handle.seek(offset)
+                    try:
+                        page = zlib.decompress(handle.read(length))
+                    except zlib.error:
+                        page = b""
+                    if _digest(page) != digest:
+                        raise ValueError(
+                            f"Slot '{manifest['name']}' corrompido na página {index + 1}."
+                        )
+                    output.write(page)
+                    if progress is not None and index % self.pages_per_step == 0:
+                        progress(total - index, total)
+        finally:
+            for handle in handles.values():
+                handle.close()
+
+    def _load(self, name: str, progress: Optional[Progress]) -> SaveSlot:
+        manifest = self._read_manifest(name)
+        descriptor, restored_path = tempfile.mkstemp(suffix=".db", dir=self.directory)
+        os.close(descriptor)
+        try:
+            self._rebuild(manifest, restored_path, progress)
+            restored = sqlite3.connect(restored_path, isolation_level=None)
+            live = sqlite3.connect(self.db_path, timeout=self.timeout)
+            try:
+                if restored.execute("PRAGMA quick_check").fetchone()[0] != "ok":
+                    raise ValueError(f"Slot '{name}' corrompido (quick_check).")
+                # Saves de versões anteriores do schema são atualizados antes da troca
+                migrate(restored)
+
+                # Revisões acima de todas as já vistas no banco vivo: todo cache recarrega
+                offset = live.execute("SELECT MAX(revision) FROM cache_revisions").fetchone()[0]
+                restored.execute(
+                    "UPDATE cache_revisions SET revision = revision + ?", ((offset or 0) + 1,)
+                )
+
+                # Troca atômica: um único passo de backup, em uma transação no banco vivo
+                restored.backup(live, pages=-1)
+            finally:
+                live.close()
+                restored.close()
+        finally:
+            _remove(restored_path)
+        if progress is not None:
+            progress(0, len(manifest["pages"]))
+        return self._summary(manifest)
@@ -0,0 +1,216 @@
+"""
+Módulo da Fachada Assíncrona dos Motores (Async Engine Facade)
+==============================================================
+
+Este módulo liga a camada de Apresentação (TUI, Event Loop do asyncio) aos
+motores síncronos do Abraxas. Toda chamada aos motores é executada em uma
+única thread dedicada, dona da sua própria conexão SQLite:
+
+    - O Event Loop nunca espera por I/O de disco, commits ou fsyncs.
+    - Com uma única thread, as escritas são naturalmente serializadas, na
+      ordem em que foram pedidas.
+    - Os motores são criados dentro da thread de trabalho, de modo que a
+      conexão (e o cache de estado) pertencem a ela. Os seus módulos (e o NumPy)
+      também só são importados ali, fora do caminho do primeiro quadro da TUI.
+
+Dependências:
+    - asyncio: Para expor cada chamada como uma corrotina aguardável.
+    - concurrent.futures: Para a thread dedicada (executor de um único worker).
+    - src.mechanics.*: Os motores síncronos que são delegados.
+    - src.mechanics.instrumentation: Medições opcionais feitas na thread de trabalho.
+
+Padrões aplicados:
+    - Facade
+    - Active Object (uma thread dona do estado e da conexão)
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Optional, Tuple, TypeVar
+
+from src.database.connection import DEFAULT_DB_PATH
+from src.mechanics import instrumentation
+from src.mechanics.events import default_bus
+
+if TYPE_CHECKING:
+    from src.mechanics.combat_engine import CombatEngine
+    from src.mechanics.dice_engine import SkillEngine, SuccessLevel
+    from src.mechanics.dice_roller import DiceRoller
+    from src.mechanics.engine import BRPEngine
+
+T = TypeVar("T")
+
+
+@dataclass
+class EngineSet:
+    """
+    Motores que vivem na thread de trabalho e compartilham a sua conexão.
+
+    Attributes:
+        brp (BRPEngine): Atributos derivados e inicialização de estado.
+        skills (SkillEngine): Rolagens de perícia.
+        combat (CombatEngine): Dano e armadura.
+        roller (DiceRoller): Rolagens de dano.
+    """
+
+    brp: "BRPEngine"
+    skills: "SkillEngine"
+    combat: "CombatEngine"
+    roller: "DiceRoller"
+
+
+class AsyncEngine:
+    """
+    Fachada assíncrona que executa os motores em uma thread dedicada.
+
+    Attributes:
+        db_path (str): O arquivo do banco usado pelos motores da thread de trabalho.
+        events (EventBus): Barramento onde os motores publicam as mudanças de estado.
+                           Os assinantes são chamados na thread de trabalho.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, seed: Optional[int] = None) -> None:
+        """
+        Args:
+            db_path (str): O caminho do arquivo do banco de dados SQLite.
+            seed (Optional[int]): Semente do rolador de dano (resultados reprodutíveis).
+        """
+        self.db_path = db_path
+        self.events = default_bus
+        self._seed = seed
+        self._engines: Optional[EngineSet] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="abraxas-engine")
+
+    def _get_engines(self) -> EngineSet:
+        """Cria os motores na primeira chamada (sempre dentro da thread de trabalho)."""
+        if self._engines is None:
+            # Importação tardia: mantém os motores fora da partida da aplicação
+            from src.mechanics.combat_engine import CombatEngine
+            from src.mechanics.dice_engine import SkillEngine
+            from src.mechanics.dice_roller import DiceRoller
+            from src.mechanics.engine import BRPEngine
+
+            self._engines = EngineSet(
+                brp=BRPEngine(self.db_path),
+                skills=SkillEngine(self.db_path),
+                combat=CombatEngine(self.db_path),
+                roller=DiceRoller(self._seed),
+            )
+        return self._engines
+
+    async def run(self, function: Callable[..., T], *args) -> T:
+        """
+        Executa `function(engines, *args)` na thread de trabalho e aguarda o resultado.
+
+        Args:
+            function (Callable[..., T]): Recebe o `EngineSet` como primeiro argumento.
+            *args: Argumentos adicionais repassados à função.
+
+        Returns:
+            T: O retorno da função.
+
+        Raises:
+            RuntimeError: Se a fachada já tiver sido encerrada.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(self._call, function, *args)
+        )
+
+    def _call(self, function: Callable[..., T], *args) -> T:
+        """Ponto de entrada na thread de trabalho."""
+        try:
+            return function(self._get_engines(), *args)
+        finally:
+            instrumentation.mark_idle()
+
+    async def roll_skill(self, char_id: str, skill_id: str) -> Tuple["SuccessLevel", int]:
+        """Versão assíncrona de `SkillEngine.roll_skill`."""
+        return await self.run(lambda engines: engines.skills.roll_skill(char_id, skill_id))
+
+    async def apply_damage(self, target_id: str, rolled_damage: int) -> int:
+        """Versão assíncrona de `CombatEngine.apply_damage`."""
+        return await self.run(
+            lambda engines: engines.combat.apply_damage(target_id, rolled_damage)
+        )
+
+    async def attack(self, attacker_id: str, target_id: str) -> Tuple[str, int, int]:
+        """
+        Rola o dano da arma do atacante e o aplica no alvo, em uma única ida à thread.
+
+        A munição da arma (se ela usar) é gasta na mesma transação do dano.
+
+        Args:
+            attacker_id (str): O personagem que ataca.
+            target_id (str): O personagem atingido.
+
+        Returns:
+            Tuple[str, int, int]: A expressão de dano, o dano rolado e o dano sofrido.
+
+        Raises:
+            ValueError: Se a arma do atacante estiver sem munição.
+        """
+
+        def _attack(engines: EngineSet) -> Tuple[str, int, int]:
+            expression = engines.combat.calculate_raw_damage(attacker_id)
+            rolled = engines.roller.roll(expression)
+            return expression, rolled, engines.combat.attack(attacker_id, target_id, rolled)
+
+        return await self.run(_attack)
+
+    async def get_vitals(self, char_id: str) -> Tuple[Optional[int], Optional[int]]:
+        """Retorna o HP/MP atuais do personagem (None se o estado não foi inicializado)."""
+        return await self.run(lambda engines: engines.brp.state.vitals(char_id))
+
+    async def initialize_character_state(self, char_id: str) -> None:
+        """Versão assíncrona de `BRPEngine.initialize_character_state`."""
+        await self.run(lambda engines: engines.brp.initialize_character_state(char_id))
+
+    async def query(self, function: Callable[..., T], *args) -> T:
+        """
+        Executa uma consulta de leitura (ex: `src.database.queries`) na conexão
+        dos motores, como `function(connection, *args)`.
+
+        A auditoria pendente é gravada antes, de modo que a consulta enxerga as
+        rolagens já anunciadas pelos eventos `RollLogged`.
+
+        Args:
+            function (Callable[..., T]): Recebe a conexão como primeiro argumento.
+            *args: Argumentos adicionais repassados à função.
+
+        Returns:
+            T: O retorno da consulta.
+        """
+
+        def _query(engines: EngineSet) -> T:
+            engines.skills.audit.flush()
+            return function(engines.skills.connection, *args)
+
+        return await self.run(_query)
+
+    async def enable_profiling(self) -> "instrumentation.Profiler":
+        """
+        Liga a instrumentação dos motores e dos comandos SQL da thread de trabalho.
+
+        Os lotes de auditoria gravados pela thread de fundo do `AuditWriter`, em
+        conexão própria, aparecem como a operação `AuditWriter._drain`.
+        """
+        return await self.run(
+            lambda engines: instrumentation.enable([engines.skills.connection])
+        )
+
+    async def disable_profiling(self) -> None:
+        """Desliga a instrumentação (os motores voltam a custo zero de medição)."""
+        await self.run(lambda engines: instrumentation.disable())
+
+    async def export_profile(self, path: str) -> str:
+        """Grava as medições do profiler padrão em JSON, fora do Event Loop."""
+        return await self.run(lambda engines: instrumentation.default_profiler.export(path))
+
+    async def close(self) -> None:
+        """Grava a auditoria pendente na thread de trabalho e encerra a thread."""
+        if self._engines is not None:
+            await self.run(lambda engines: engines.skills.audit.flush())
+        self._executor.shutdown(wait=True)
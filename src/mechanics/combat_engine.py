@@ -8,14 +8,26 @@ resgatar o dano base das armas equipadas e calcular a mitigação física
 proporcionada pelas armaduras, atualizando o estado (HP) das entidades no banco.
 
 Dependências:
-    - sqlite3: Para consulta do equipamento ativo e tabelas de regras de combate.
+    - sqlite3: Para a conexão compartilhada com o banco de dados.
+    - src.database.connection: Para a conexão compartilhada entre os motores.
+    - src.database.audit: Para a fila de auditoria gravada em lote.
+    - src.mechanics.state: Para o cache de estado compartilhado entre os motores.
+    - src.mechanics.rulebook: Para as tabelas de regras carregadas em memória.
+    - src.mechanics.inventory: Para o gasto de munição das armas de fogo.
 
 Padrões aplicados:
-    - Data-Driven Design (Delegação de regras condicionais para o SQL).
+    - Data-Driven Design (Regras condicionais definidas nas tabelas do banco).
     - Separação de Preocupações (SoC - Não realiza rolagens, apenas fornece as fórmulas).
 """
 
 import sqlite3
+from typing import Optional
+
+from src.database.audit import AuditWriter, get_audit_writer
+from src.database.connection import get_connection, transaction
+from src.mechanics.inventory import InventoryEngine
+from src.mechanics.rulebook import Rulebook, get_rulebook
+from src.mechanics.state import CharacterStateStore, get_state_store
 
 
 class CombatEngine:
@@ -28,18 +40,48 @@ class CombatEngine:
 
     Attributes:
         connection (sqlite3.Connection): Conexão ativa com o banco de dados SQLite.
+        audit (AuditWriter): Fila de auditoria de rolagens compartilhada pelos motores.
+        state (CharacterStateStore): Cache write-through do estado dos personagens.
+        rules (Rulebook): Livro de regras em memória (armas, perícias, fórmulas...).
+        inventory (InventoryEngine): Inventário dos personagens (munição das armas).
     """
 
-    def __init__(self, db_path: str = "abraxas.db") -> None:
+    def __init__(
+        self,
+        db_path: str = "abraxas.db",
+        connection: Optional[sqlite3.Connection] = None,
+        audit_writer: Optional[AuditWriter] = None,
+        state_store: Optional[CharacterStateStore] = None,
+        rulebook: Optional[Rulebook] = None,
+        inventory: Optional[InventoryEngine] = None,
+    ) -> None:
         """
         Inicializa o motor de combate conectando-se ao banco de dados.
 
         Args:
             db_path (str): O caminho para o arquivo do banco de dados SQLite.
                            Padrão é "abraxas.db".
+            connection (Optional[sqlite3.Connection]): Conexão já aberta a ser
+                compartilhada (ex: um banco ':memory:' em testes). Se omitida, usa a
+                conexão da thread atual fornecida pelo `ConnectionManager`.
+            audit_writer (Optional[AuditWriter]): Fila de auditoria de rolagens. Se
+                omitida, usa a fila compartilhada pelos motores da mesma conexão.
+            state_store (Optional[CharacterStateStore]): Cache de estado dos personagens.
+                Se omitido, usa o cache compartilhado pelos motores da mesma conexão.
+            rulebook (Optional[Rulebook]): Livro de regras em memória. Se omitido, usa
+                o livro compartilhado pelos motores da mesma conexão.
+            inventory (Optional[InventoryEngine]): Motor de inventário. Se omitido, é
+                criado sobre a mesma conexão, cache de estado e livro de regras.
         """
-        self.connection = sqlite3.connect(db_path)
-        self.connection.row_factory = sqlite3.Row
+        self.connection = get_connection(db_path, connection)
+        self.audit = audit_writer or get_audit_writer(
+            self.connection, None if connection is not None else db_path
+        )
+        self.state = state_store or get_state_store(self.connection)
+        self.rules = rulebook or get_rulebook(self.connection)
+        self.inventory = inventory or InventoryEngine(
+            connection=self.connection, state_store=self.state, rulebook=self.rules
+        )
 
     def get_damage_bonus(self, char_id: str) -> str:
         """
@@ -55,30 +97,12 @@ class CombatEngine:
         Raises:
             ValueError: Se o personagem não possuir atributos base cadastrados.
         """
-        cursor = self.connection.cursor()
-        cursor.execute(
-            "SELECT str, siz FROM characteristics WHERE char_id = ?", (char_id,)
-        )
-        stats = cursor.fetchone()
-
-        if not stats:
-            raise ValueError(
-                f"Características não encontradas para o personagem '{char_id}'."
-            )
-
-        stat_sum = stats["str"] + stats["siz"]
-
-        # O banco de dados resolve a condicional via operador BETWEEN
-        cursor.execute(
-            """
-            SELECT dice_modifier FROM damage_bonus_rules 
-            WHERE ? BETWEEN min_stat AND max_stat
-            """,
-            (stat_sum,),
-        )
-        rule = cursor.fetchone()
+        stats = self.state.characteristics(char_id)
+        stat_sum = stats["STR"] + stats["SIZ"]
 
-        return rule["dice_modifier"] if rule else "+0"
+        # As faixas de `damage_bonus_rules` já estão expandidas em um vetor denso
+        # indexado por STR+SIZ; somas fora de todas as faixas resultam em '+0'
+        return self.rules.snapshot.damage_bonus(stat_sum)
 
     def calculate_raw_damage(self, attacker_id: str) -> str:
         """
@@ -93,32 +117,36 @@ class CombatEngine:
         Returns:
             str: A expressão concatenada pronta para o parser de dados (ex: '1D8+1+1D4').
         """
-        cursor = self.connection.cursor()
-        cursor.execute(
-            """
-            SELECT w.base_damage, w.applies_damage_bonus
-            FROM character_loadout cl
-            JOIN weapons w ON cl.equipped_weapon_id = w.id
-            WHERE cl.char_id = ?
-            """,
-            (attacker_id,),
-        )
-        weapon = cursor.fetchone()
+        weapon_id, _ = self.state.loadout(attacker_id)
+        weapon = self.rules.snapshot.weapon(weapon_id)
 
-        if not weapon:
+        if weapon is None:
             # Dano base de combate desarmado no BRP Quick-Start
             return "1D3"
 
-        damage_expr = weapon["base_damage"]
+        damage_expr = weapon.base_damage
 
         # Armas de fogo e certos projéteis não recebem o bônus de força
-        if weapon["applies_damage_bonus"]:
+        if weapon.applies_damage_bonus:
             db_expr = self.get_damage_bonus(attacker_id)
             if db_expr != "+0":
                 damage_expr += f"{db_expr}"
 
         return damage_expr
 
+    def get_armor_points(self, target_id: str) -> int:
+        """
+        Consulta os Armor Points (AP) da armadura equipada pelo personagem.
+
+        Args:
+            target_id (str): O identificador único do personagem.
+
+        Returns:
+            int: Os pontos de armadura (0 se não houver loadout ou armadura equipada).
+        """
+        _, armor_id = self.state.loadout(target_id)
+        return self.rules.snapshot.armor_points(armor_id)
+
     def apply_damage(self, target_id: str, rolled_damage: int) -> int:
         """
         Aplica a mitigação da armadura (Armor Points) sobre o dano rolado
@@ -134,40 +162,50 @@ class CombatEngine:
         Returns:
             int: O dano real sofrido após a absorção da armadura.
         """
-        cursor = self.connection.cursor()
-
-        # 1. Busca os Armor Points (AP) do alvo. COALESCE previne falhas se não houver armadura.
-        cursor.execute(
-            """
-            SELECT COALESCE(a.armor_points, 0) as ap
-            FROM character_loadout cl
-            LEFT JOIN armors a ON cl.equipped_armor_id = a.id
-            WHERE cl.char_id = ?
-            """,
-            (target_id,),
-        )
-        armor_row = cursor.fetchone()
-        armor_points = armor_row["ap"] if armor_row else 0
+        # 1. Busca os Armor Points (AP) do alvo.
+        armor_points = self.get_armor_points(target_id)
 
         # 2. Subtrai a mitigação. A função max(0, X) impede dano negativo.
         actual_damage = max(0, rolled_damage - armor_points)
 
         if actual_damage > 0:
+            # Garantia de auditoria: as rolagens pendentes são gravadas antes do estado
+            self.audit.flush()
+
             # 3. Atualiza o estado persistente (Hit Points) no SQLite via transação segura
-            with self.connection:
-                self.connection.execute(
-                    """
-                    UPDATE character_state 
-                    SET current_hp = current_hp - ? 
-                    WHERE char_id = ?
-                    """,
-                    (actual_damage, target_id),
-                )
+            #    (write-through: o cache em memória só muda após a escrita no banco)
+            self.state.apply_hp_delta(target_id, -actual_damage)
 
         return actual_damage
 
+    def attack(self, attacker_id: str, target_id: str, rolled_damage: int) -> int:
+        """
+        Resolve o golpe de uma arma: gasta a munição do atacante e aplica o dano.
+
+        O decremento da munição e a mudança de HP do alvo são gravados na mesma
+        transação (ou na transação já aberta, como a de um round inteiro); se
+        faltar munição, nada é gravado.
+
+        Args:
+            attacker_id (str): O identificador único do personagem atacante.
+            target_id (str): O identificador único do personagem atingido.
+            rolled_damage (int): O valor rolado com a expressão de `calculate_raw_damage`.
+
+        Returns:
+            int: O dano real sofrido após a absorção da armadura.
+
+        Raises:
+            ValueError: Se a arma equipada usar munição e o atacante não tiver o bastante.
+        """
+        # Rolagens pendentes são gravadas antes, fora da transação do golpe
+        self.audit.flush()
+        with transaction(self.connection):
+            self.inventory.spend_ammunition(attacker_id)
+            return self.apply_damage(target_id, rolled_damage)
+
 
 # Exemplo de fluxo arquitetural (View -> Engine -> Parser -> Engine -> View):
+# from src.mechanics.dice_roller import DiceRoller
 # engine = CombatEngine()
 # dmg_expr = engine.calculate_raw_damage("001")
 # rolled_dmg = DiceRoller.parse_and_roll(dmg_expr) # Avalia '1D8+1+1D4', resulta em ex: 8
@@ -0,0 +1,308 @@
+"""
+Módulo do Round de Combate (Combat Round Scheduler)
+===================================================
+
+Este módulo compõe a camada de regras bélicas do motor Abraxas.
+Ele organiza o round de combate do BRP em fases:
+
+    1. Declaração: cada combatente declara sua ação (alvo, perícia de ataque e
+       perícia de defesa do alvo).
+    2. Ordenação: as ações entram em uma fila de prioridade (heap) ordenada por
+       DEX, com desempate pela perícia de ataque e pela ordem de declaração.
+    3. Resolução: as ações saem do heap em ordem de DEX e são resolvidas pelo
+       `SkillEngine` (ataque e defesa) e pelo `CombatEngine` (dano e armadura).
+       Quem cai antes de agir (ou está sem munição) perde a ação do round.
+    4. Commit: todas as mudanças de HP, a munição gasta e todas as linhas de
+       auditoria do round são gravadas em uma única transação.
+
+A fase de movimento do BRP não é modelada: o banco ainda não guarda posições.
+
+O heap é montado com `heapify` (O(n)) e cada ação sai em O(log n), de modo que
+rounds com milhares de combatentes (batalhas em massa) continuam lineares no
+custo de resolução. Cada `RoundResult` traz o tempo gasto em cada fase.
+
+Dependências:
+    - heapq: Para a fila de prioridade por DEX.
+    - time: Para as medições de tempo por fase.
+    - src.database.connection: Para a transação única do round.
+    - src.mechanics.dice_engine / combat_engine: Para a resolução das ações.
+    - src.mechanics.dice_roller: Para as rolagens de dano.
+
+Padrões aplicados:
+    - Priority Queue (Heap)
+    - Unit of Work (uma transação por round)
+"""
+
+import heapq
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Tuple
+
+from src.database.connection import transaction
+from src.mechanics.combat_engine import CombatEngine
+from src.mechanics.dice_engine import SkillEngine, SuccessLevel
+from src.mechanics.dice_roller import DiceRoller
+
+
+@dataclass(frozen=True)
+class DeclaredAction:
+    """
+    Ação declarada por um combatente na fase de declaração.
+
+    Attributes:
+        actor_id (str): O personagem que age.
+        target_id (str): O personagem atacado.
+        attack_skill_id (str): A perícia de ataque (padrão: Brawl).
+        defense_skill_id (str): A perícia usada pelo alvo para se defender (padrão: Dodge).
+    """
+
+    actor_id: str
+    target_id: str
+    attack_skill_id: str = "SKL_BRAWL"
+    defense_skill_id: str = "SKL_DODGE"
+
+
+@dataclass
+class ActionOutcome:
+    """
+    Resultado da resolução de uma ação.
+
+    Attributes:
+        action (DeclaredAction): A ação resolvida.
+        dex (int): A DEX do combatente no momento da ordenação.
+        acted (bool): False se o combatente ou o alvo já estava fora de combate,
+            ou se a arma do combatente estava sem munição.
+        attack_level (Optional[SuccessLevel]): O grau de sucesso do ataque.
+        attack_roll (Optional[int]): O d100 do ataque.
+        defense_level (Optional[SuccessLevel]): O grau de sucesso da defesa (se houve).
+        defense_roll (Optional[int]): O d100 da defesa (se houve).
+        hit (bool): Se o ataque superou a defesa e atingiu o alvo.
+        rolled_damage (int): O dano rolado antes da armadura.
+        damage_taken (int): O dano efetivamente sofrido pelo alvo.
+    """
+
+    action: DeclaredAction
+    dex: int
+    acted: bool = True
+    attack_level: Optional[SuccessLevel] = None
+    attack_roll: Optional[int] = None
+    defense_level: Optional[SuccessLevel] = None
+    defense_roll: Optional[int] = None
+    hit: bool = False
+    rolled_damage: int = 0
+    damage_taken: int = 0
+
+
+@dataclass
+class RoundTimings:
+    """
+    Tempo gasto (em segundos) em cada fase de um round.
+
+    Attributes:
+        combatants (int): Quantidade de ações declaradas no round.
+        ordering (float): Montagem do heap (inclui a leitura de DEX e perícias).
+        resolution (float): Resolução das ações em ordem de DEX.
+        commit (float): Descarga da auditoria e COMMIT da transação do round.
+    """
+
+    combatants: int
+    ordering: float = 0.0
+    resolution: float = 0.0
+    commit: float = 0.0
+
+    @property
+    def total(self) -> float:
+        """Tempo total do round."""
+        return self.ordering + self.resolution + self.commit
+
+    @property
+    def actions_per_second(self) -> float:
+        """Vazão de ações resolvidas por segundo."""
+        return self.combatants / self.total if self.total else 0.0
+
+    def summary(self) -> str:
+        """Resumo legível das medições (ex: para o log de desenvolvimento)."""
+        return (
+            f"{self.combatants:,} ações em {self.total * 1000:.1f} ms "
+            f"(ordenação {self.ordering * 1000:.1f} ms | resolução "
+            f"{self.resolution * 1000:.1f} ms | commit {self.commit * 1000:.1f} ms) "
+            f"- {self.actions_per_second:,.0f} ações/s"
+        )
+
+
+@dataclass
+class RoundResult:
+    """
+    Resultado completo de um round.
+
+    Attributes:
+        number (int): O número do round (a partir de 1).
+        outcomes (List[ActionOutcome]): As ações na ordem em que foram resolvidas.
+        incapacitated (List[str]): Personagens que caíram (HP <= 0) neste round.
+        timings (RoundTimings): Os tempos de cada fase.
+    """
+
+    number: int
+    outcomes: List[ActionOutcome]
+    incapacitated: List[str]
+    timings: RoundTimings
+
+
+@dataclass(order=True)
+class _QueueEntry:
+    """Entrada do heap: menor chave sai primeiro (DEX e perícia negativas)."""
+
+    key: Tuple[int, int, int]
+    action: DeclaredAction = field(compare=False)
+    dex: int = field(compare=False)
+
+
+class CombatRound:
+    """
+    Agendador de rounds de combate do BRP, ordenado por DEX.
+
+    Attributes:
+        skill_engine (SkillEngine): Resolve as rolagens de ataque e defesa.
+        combat_engine (CombatEngine): Calcula o dano e aplica a mitigação da armadura.
+        roller (DiceRoller): Rolador das expressões de dano.
+        number (int): O número do último round resolvido.
+        history (List[RoundTimings]): Os tempos de todos os rounds já resolvidos.
+    """
+
+    def __init__(
+        self,
+        skill_engine: SkillEngine,
+        combat_engine: CombatEngine,
+        roller: Optional[DiceRoller] = None,
+    ) -> None:
+        """
+        Args:
+            skill_engine (SkillEngine): Motor de perícias.
+            combat_engine (CombatEngine): Motor de combate. Deve usar a mesma conexão
+                do motor de perícias, para que o round caiba em uma única transação.
+            roller (Optional[DiceRoller]): Rolador de dano (ex: com semente fixa).
+
+        Raises:
+            ValueError: Se os motores usarem conexões diferentes.
+        """
+        if skill_engine.connection is not combat_engine.connection:
+            raise ValueError("SkillEngine e CombatEngine devem compartilhar a mesma conexão.")
+
+        self.skill_engine = skill_engine
+        self.combat_engine = combat_engine
+        self.roller = roller or DiceRoller()
+        self.number = 0
+        self.history: List[RoundTimings] = []
+        self._declared: List[DeclaredAction] = []
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """A conexão compartilhada pelos motores do round."""
+        return self.combat_engine.connection
+
+    def declare(self, action: DeclaredAction) -> None:
+        """
+        Fase de declaração: registra a ação de um combatente para o próximo round.
+
+        Args:
+            action (DeclaredAction): A ação declarada.
+        """
+        self._declared.append(action)
+
+    def declare_many(self, actions: Iterable[DeclaredAction]) -> None:
+        """Registra várias ações de uma só vez (ex: um exército inteiro de NPCs)."""
+        self._declared.extend(actions)
+
+    def _build_queue(self, actions: List[DeclaredAction]) -> List[_QueueEntry]:
+        """Monta o heap de iniciativa: DEX maior, depois perícia maior, depois quem declarou antes."""
+        state = self.skill_engine.state
+        entries = []
+        for order, action in enumerate(actions):
+            dex = state.characteristics(action.actor_id)["DEX"]
+            skill = self.skill_engine.get_skill_total(action.actor_id, action.attack_skill_id)
+            entries.append(_QueueEntry((-dex, -skill, order), action, dex))
+        heapq.heapify(entries)
+        return entries
+
+    def _is_down(self, char_id: str) -> bool:
+        """Indica se o personagem está fora de combate (HP <= 0)."""
+        hp, _ = self.skill_engine.state.vitals(char_id)
+        return hp is not None and hp <= 0
+
+    def _resolve(self, entry: _QueueEntry) -> ActionOutcome:
+        """Resolve uma ação: ataque, defesa do alvo, dano e armadura."""
+        action = entry.action
+        outcome = ActionOutcome(action, entry.dex)
+        inventory = self.combat_engine.inventory
+        if (
+            self._is_down(action.actor_id)
+            or self._is_down(action.target_id)
+            or not inventory.can_attack(action.actor_id)
+        ):
+            outcome.acted = False
+            return outcome
+
+        # O disparo gasta munição mesmo que o golpe erre ou seja defendido
+        inventory.spend_ammunition(action.actor_id)
+
+        outcome.attack_level, outcome.attack_roll = self.skill_engine.roll_skill(
+            action.actor_id, action.attack_skill_id
+        )
+        if outcome.attack_level is SuccessLevel.FAILURE:
+            return outcome
+
+        outcome.defense_level, outcome.defense_roll = self.skill_engine.roll_skill(
+            action.target_id, action.defense_skill_id
+        )
+        # A defesa anula o golpe quando alcança um grau de sucesso igual ou maior
+        if outcome.attack_level.value <= outcome.defense_level.value:
+            return outcome
+
+        outcome.hit = True
+        damage_expression = self.combat_engine.calculate_raw_damage(action.actor_id)
+        outcome.rolled_damage = self.roller.roll(damage_expression)
+        outcome.damage_taken = self.combat_engine.apply_damage(
+            action.target_id, outcome.rolled_damage
+        )
+        return outcome
+
+    def run(self) -> RoundResult:
+        """
+        Resolve o round com as ações declaradas e limpa a declaração.
+
+        Todas as mudanças de HP e as linhas de auditoria do round são gravadas em
+        uma única transação; uma exceção desfaz o round inteiro, descarta as
+        rolagens retidas na fila de auditoria e não publica nenhum `RollLogged`.
+
+        Returns:
+            RoundResult: As ações resolvidas, os personagens abatidos e os tempos.
+        """
+        actions, self._declared = self._declared, []
+        timings = RoundTimings(len(actions))
+        audit = self.skill_engine.audit
+
+        start = time.perf_counter()
+        queue = self._build_queue(actions)
+        timings.ordering = time.perf_counter() - start
+
+        outcomes: List[ActionOutcome] = []
+        incapacitated: List[str] = []
+        # Rolagens anteriores ao round são gravadas antes de reservar a fila
+        audit.flush()
+        with audit.exclusive(), transaction(self.connection):
+            start = time.perf_counter()
+            while queue:
+                outcome = self._resolve(heapq.heappop(queue))
+                outcomes.append(outcome)
+                if outcome.damage_taken and self._is_down(outcome.action.target_id):
+                    incapacitated.append(outcome.action.target_id)
+            timings.resolution = time.perf_counter() - start
+
+            start = time.perf_counter()
+            audit.flush()
+        timings.commit = time.perf_counter() - start
+
+        self.number += 1
+        self.history.append(timings)
+        return RoundResult(self.number, outcomes, incapacitated, timings)
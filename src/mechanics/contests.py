@@ -0,0 +1,354 @@
+"""
+Módulo de Disputas: Rolagens Opostas e Tabela de Resistência (Contests)
+=======================================================================
+
+Este módulo compõe a camada de regras dinâmicas do motor Abraxas.
+Ele resolve os conflitos diretos entre entidades previstos no devlog:
+
+    - Rolagens opostas (ex: Hide vs. Listen): cada lado rola sua perícia e os
+      níveis de sucesso se cancelam (Special > Success > Failure). Vence quem
+      obtiver o nível mais alto; níveis iguais se anulam e ninguém vence.
+    - Tabela de Resistência: característica ativa contra passiva (ex: STR vs. SIZ),
+      com chance `50 + (Ativo - Passivo) * 5`, limitada entre 0 e 100.
+
+A API é em lote: muitas disputas (ex: um grupo inteiro escutando um bando de
+inimigos escondidos) são resolvidas com uma única consulta de perícias, um
+único sorteio vetorizado de d100 e uma única transação de auditoria.
+
+Dependências:
+    - src.mechanics.dice_engine: Para os valores de perícia e os níveis de sucesso.
+    - src.mechanics.dice_roller: Para o sorteio em lote dos d100.
+
+Padrões aplicados:
+    - Lookup Table (matriz de resistência pré-calculada)
+    - Batch Processing (uma consulta, um sorteio e uma transação por lote)
+"""
+
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from src.database.connection import after_commit
+from src.mechanics.dice_engine import SkillEngine, SuccessLevel, resolve_success_level
+from src.mechanics.dice_roller import DiceRoller
+from src.mechanics.events import RollLogged
+
+# Maior valor de característica coberto pela matriz pré-calculada
+MAX_RESISTANCE_VALUE = 100
+
+
+def _resistance_formula(active: int, passive: int) -> int:
+    """Chance da Tabela de Resistência do BRP, limitada entre 0 e 100."""
+    return min(100, max(0, 50 + (active - passive) * 5))
+
+
+# Matriz completa (ativo x passivo) calculada uma única vez na importação
+RESISTANCE_TABLE: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(_resistance_formula(active, passive) for passive in range(MAX_RESISTANCE_VALUE + 1))
+    for active in range(MAX_RESISTANCE_VALUE + 1)
+)
+
+
+def resistance_chance(active: int, passive: int) -> int:
+    """
+    Consulta a chance de sucesso na Tabela de Resistência.
+
+    Args:
+        active (int): O valor da característica ativa (quem tenta).
+        passive (int): O valor da característica passiva (quem resiste).
+
+    Returns:
+        int: A chance percentual de sucesso (0 a 100).
+    """
+    if 0 <= active <= MAX_RESISTANCE_VALUE and 0 <= passive <= MAX_RESISTANCE_VALUE:
+        return RESISTANCE_TABLE[active][passive]
+    # Valores fora da matriz (criaturas gigantes) usam a fórmula diretamente
+    return _resistance_formula(active, passive)
+
+
+@dataclass(frozen=True)
+class OpposedRoll:
+    """
+    Disputa entre duas perícias (ex: Listen do grupo contra Hide do inimigo).
+
+    Attributes:
+        active_id (str): O personagem que age.
+        active_skill_id (str): A perícia de quem age (ex: 'SKL_LISTEN').
+        passive_id (str): O personagem que se opõe.
+        passive_skill_id (str): A perícia de quem se opõe (ex: 'SKL_HIDE').
+    """
+
+    active_id: str
+    active_skill_id: str
+    passive_id: str
+    passive_skill_id: str
+
+
+@dataclass(frozen=True)
+class OpposedResult:
+    """
+    Resultado de uma rolagem oposta.
+
+    Attributes:
+        contest (OpposedRoll): A disputa resolvida.
+        active_level (SuccessLevel): O nível de sucesso de quem age.
+        active_roll (int): O d100 de quem age.
+        passive_level (SuccessLevel): O nível de sucesso de quem se opõe.
+        passive_roll (int): O d100 de quem se opõe.
+    """
+
+    contest: OpposedRoll
+    active_level: SuccessLevel
+    active_roll: int
+    passive_level: SuccessLevel
+    passive_roll: int
+
+    @property
+    def margin(self) -> int:
+        """Níveis de sucesso que sobram após o cancelamento (positivo favorece o ativo)."""
+        return self.active_level.value - self.passive_level.value
+
+    @property
+    def winner(self) -> Optional[str]:
+        """O vencedor da disputa, ou None se os níveis de sucesso se anularam."""
+        if self.margin > 0:
+            return self.contest.active_id
+        if self.margin < 0:
+            return self.contest.passive_id
+        return None
+
+
+@dataclass(frozen=True)
+class ResistanceRoll:
+    """
+    Disputa de características na Tabela de Resistência (ex: STR contra SIZ).
+
+    Attributes:
+        active_id (str): O personagem que tenta (ex: quem empurra).
+        active_characteristic (str): A sigla da característica ativa (ex: 'STR').
+        passive_id (str): O personagem que resiste.
+        passive_characteristic (str): A sigla da característica passiva (ex: 'SIZ').
+    """
+
+    active_id: str
+    active_characteristic: str
+    passive_id: str
+    passive_characteristic: str
+
+    @property
+    def action_name(self) -> str:
+        """Nome da ação gravado em `roll_history` (ex: 'RES_STR_SIZ')."""
+        return f"RES_{self.active_characteristic}_{self.passive_characteristic}".upper()
+
+
+@dataclass(frozen=True)
+class ResistanceResult:
+    """
+    Resultado de uma rolagem na Tabela de Resistência.
+
+    Attributes:
+        contest (ResistanceRoll): A disputa resolvida.
+        chance (int): A chance consultada na tabela.
+        roll (int): O d100 do personagem ativo.
+    """
+
+    contest: ResistanceRoll
+    chance: int
+    roll: int
+
+    @property
+    def success(self) -> bool:
+        """Indica se o personagem ativo venceu a resistência."""
+        return self.roll <= self.chance
+
+
+class ContestEngine:
+    """
+    Resolve rolagens opostas e de resistência em lote sobre um `SkillEngine`.
+
+    Attributes:
+        skill_engine (SkillEngine): Fornece perícias, características e a auditoria.
+        roller (DiceRoller): Sorteia todos os d100 de um lote de uma só vez.
+    """
+
+    def __init__(self, skill_engine: SkillEngine, roller: Optional[DiceRoller] = None) -> None:
+        """
+        Args:
+            skill_engine (SkillEngine): O motor de perícias compartilhado.
+            roller (Optional[DiceRoller]): Rolador dos d100 (ex: com semente fixa).
+        """
+        self.skill_engine = skill_engine
+        self.roller = roller or DiceRoller()
+
+    def _roll_d100(self, n: int) -> List[int]:
+        """Sorteia `n` d100 em um único lote."""
+        rolls = self.roller.roll_many("1D100", n)
+        return rolls.tolist() if hasattr(rolls, "tolist") else list(rolls)
+
+    def _audit(self, rows: List[Tuple[str, str, int, str]]) -> None:
+        """Grava todas as linhas do lote em uma única transação e as anuncia após o COMMIT."""
+        audit = self.skill_engine.audit
+        audit.log_many(rows)
+        audit.flush()
+        publish = self.skill_engine.state.events.publish
+
+        def announce() -> None:
+            for row in rows:
+                publish(RollLogged(*row))
+
+        after_commit(self.skill_engine.connection, announce)
+
+    def opposed_rolls(self, contests: Iterable[OpposedRoll]) -> List[OpposedResult]:
+        """
+        Resolve várias rolagens opostas de uma só vez.
+
+        Cada disputa rola dois d100 independentes (um para cada lado).
+
+        Args:
+            contests (Iterable[OpposedRoll]): As disputas a resolver.
+
+        Returns:
+            List[OpposedResult]: Os resultados, na mesma ordem das disputas.
+
+        Raises:
+            ValueError: Se alguma perícia ou personagem não existir no banco.
+        """
+        contests = list(contests)
+        if not contests:
+            return []
+
+        totals = self.skill_engine.get_skill_totals(
+            pair
+            for contest in contests
+            for pair in (
+                (contest.active_id, contest.active_skill_id),
+                (contest.passive_id, contest.passive_skill_id),
+            )
+        )
+        rolls = self._roll_d100(2 * len(contests))
+
+        results = []
+        audit_rows = []
+        for index, contest in enumerate(contests):
+            active_roll, passive_roll = rolls[2 * index], rolls[2 * index + 1]
+            active_level = resolve_success_level(
+                active_roll, totals[(contest.active_id, contest.active_skill_id)]
+            )
+            passive_level = resolve_success_level(
+                passive_roll, totals[(contest.passive_id, contest.passive_skill_id)]
+            )
+            results.append(
+                OpposedResult(contest, active_level, active_roll, passive_level, passive_roll)
+            )
+            audit_rows.append(
+                (contest.active_id, contest.active_skill_id, active_roll, active_level.name)
+            )
+            audit_rows.append(
+                (contest.passive_id, contest.passive_skill_id, passive_roll, passive_level.name)
+            )
+
+        self._audit(audit_rows)
+        return results
+
+    def group_contest(
+        self,
+        active_ids: Sequence[str],
+        active_skill_id: str,
+        passive_ids: Sequence[str],
+        passive_skill_id: str,
+    ) -> List[OpposedResult]:
+        """
+        Disputa entre grupos: cada participante rola uma única vez e o resultado é
+        comparado com todos os participantes do outro grupo.
+
+        Exemplo: todo o grupo rola Listen contra todos os inimigos rolando Hide.
+
+        Args:
+            active_ids (Sequence[str]): Os personagens do grupo ativo.
+            active_skill_id (str): A perícia do grupo ativo.
+            passive_ids (Sequence[str]): Os personagens do grupo passivo.
+            passive_skill_id (str): A perícia do grupo passivo.
+
+        Returns:
+            List[OpposedResult]: Uma disputa por par (ativo, passivo), em ordem de
+                                 `active_ids` e, dentro dela, de `passive_ids`.
+
+        Raises:
+            ValueError: Se alguma perícia ou personagem não existir no banco.
+        """
+        if not active_ids or not passive_ids:
+            return []
+        # Um único d100 por participante, mesmo que ele apareça em várias disputas
+        participants = list(dict.fromkeys(
+            [(char_id, active_skill_id) for char_id in active_ids]
+            + [(char_id, passive_skill_id) for char_id in passive_ids]
+        ))
+
+        totals = self.skill_engine.get_skill_totals(participants)
+        rolls = self._roll_d100(len(participants))
+
+        outcomes = {}
+        audit_rows = []
+        for (char_id, skill_id), roll in zip(participants, rolls):
+            level = resolve_success_level(roll, totals[(char_id, skill_id)])
+            outcomes[(char_id, skill_id)] = (level, roll)
+            audit_rows.append((char_id, skill_id, roll, level.name))
+
+        results = []
+        for active_id in active_ids:
+            active_level, active_roll = outcomes[(active_id, active_skill_id)]
+            for passive_id in passive_ids:
+                passive_level, passive_roll = outcomes[(passive_id, passive_skill_id)]
+                contest = OpposedRoll(active_id, active_skill_id, passive_id, passive_skill_id)
+                results.append(
+                    OpposedResult(contest, active_level, active_roll, passive_level, passive_roll)
+                )
+
+        self._audit(audit_rows)
+        return results
+
+    def resistance_rolls(self, contests: Iterable[ResistanceRoll]) -> List[ResistanceResult]:
+        """
+        Resolve várias rolagens na Tabela de Resistência de uma só vez.
+
+        Args:
+            contests (Iterable[ResistanceRoll]): As disputas a resolver.
+
+        Returns:
+            List[ResistanceResult]: Os resultados, na mesma ordem das disputas.
+
+        Raises:
+            ValueError: Se algum personagem não existir ou se a sigla da
+                        característica for desconhecida.
+        """
+        contests = list(contests)
+        if not contests:
+            return []
+
+        state = self.skill_engine.state
+        rolls = self._roll_d100(len(contests))
+
+        results = []
+        audit_rows = []
+        for contest, roll in zip(contests, rolls):
+            active = state.characteristics(contest.active_id)
+            passive = state.characteristics(contest.passive_id)
+            try:
+                chance = resistance_chance(
+                    active[contest.active_characteristic.upper()],
+                    passive[contest.passive_characteristic.upper()],
+                )
+            except KeyError as error:
+                raise ValueError(f"Característica desconhecida: {error.args[0]}.") from None
+            result = ResistanceResult(contest, chance, roll)
+            results.append(result)
+            audit_rows.append(
+                (
+                    contest.active_id,
+                    contest.action_name,
+                    roll,
+                    (SuccessLevel.SUCCESS if result.success else SuccessLevel.FAILURE).name,
+                )
+            )
+
+        self._audit(audit_rows)
+        return results
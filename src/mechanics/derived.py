@@ -0,0 +1,315 @@
+"""
+Módulo de Recomputação Incremental (Formula Dependency Graph)
+=============================================================
+
+Este módulo compõe a camada de gerenciamento de estado do motor Abraxas.
+Ele mantém em memória os valores derivados de cada personagem (fórmulas de
+`brp_formulas`, como MAX_HP, e as bases de `skills.base_formula`, como
+'DEX * 2') e sabe exatamente quais deles dependem de cada característica:
+
+    - Grafo: as fórmulas já compiladas pelo `Rulebook` informam as siglas que
+      usam; o grafo liga cada característica aos valores derivados dependentes.
+    - Sujeira (dirty tracking): quando uma característica muda (ex: dreno de STR),
+      apenas os dependentes são marcados; os demais continuam válidos.
+    - Recomputação: preguiçosa, na próxima leitura, ou imediata, em lote, para
+      todos os valores sujos do personagem (ver `set_characteristics`).
+    - Contador: `evaluations` conta cada avaliação de fórmula por valor derivado,
+      permitindo verificar que valores não relacionados nunca são reavaliados.
+
+Mudanças feitas por outros caminhos (ex: outra conexão ou o `CharacterStateStore`
+diretamente) também são detectadas: a cada leitura as características atuais são
+comparadas às usadas no último cálculo, e só os dependentes das diferentes sujam.
+
+Dependências:
+    - src.mechanics.rulebook: Para as fórmulas compiladas e as suas variáveis.
+    - src.mechanics.state: Para as características e a escrita write-through.
+
+Padrões aplicados:
+    - Dependency Graph (invalidação seletiva)
+    - Lazy Evaluation / Dirty Flag
+"""
+
+import sqlite3
+import threading
+import weakref
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, Mapping, Optional, Set, Tuple
+
+from src.database.connection import transaction
+from src.mechanics.formulas import CompiledFormula
+from src.mechanics.rulebook import Rulebook, RuleSnapshot, get_rulebook
+from src.mechanics.state import CharacterStateStore, get_state_store
+
+# Valor derivado: ('formula', 'MAX_HP') ou ('skill', 'SKL_DODGE')
+DerivedKey = Tuple[str, str]
+
+FORMULA = "formula"
+SKILL = "skill"
+
+
+class DependencyGraph:
+    """
+    Grafo das características para os valores derivados de um livro de regras.
+
+    Attributes:
+        snapshot (RuleSnapshot): O livro de regras que originou o grafo.
+        formulas (Mapping[DerivedKey, CompiledFormula]): A fórmula de cada valor derivado.
+        dependents (Mapping[str, FrozenSet[DerivedKey]]): Os valores derivados que
+            dependem de cada característica (sigla em maiúsculas).
+    """
+
+    def __init__(self, snapshot: RuleSnapshot) -> None:
+        self.snapshot = snapshot
+        formulas: Dict[DerivedKey, CompiledFormula] = {}
+        for stat_name, formula in snapshot.formulas.items():
+            formulas[(FORMULA, stat_name)] = formula
+        for skill_id, skill in snapshot.skills.items():
+            formulas[(SKILL, skill_id)] = skill.base_formula
+
+        dependents: Dict[str, Set[DerivedKey]] = {}
+        for key, formula in formulas.items():
+            for name in formula.variables:
+                dependents.setdefault(name, set()).add(key)
+
+        self.formulas: Mapping[DerivedKey, CompiledFormula] = formulas
+        self.dependents: Mapping[str, FrozenSet[DerivedKey]] = {
+            name: frozenset(keys) for name, keys in dependents.items()
+        }
+
+    def affected(self, names: Iterable[str]) -> Set[DerivedKey]:
+        """
+        Retorna os valores derivados afetados por uma mudança de características.
+
+        Args:
+            names (Iterable[str]): As siglas alteradas (ex: ['STR']).
+
+        Returns:
+            Set[DerivedKey]: Os valores derivados que precisam ser recalculados.
+        """
+        affected: Set[DerivedKey] = set()
+        for name in names:
+            affected.update(self.dependents.get(name.upper(), ()))
+        return affected
+
+    def formula(self, key: DerivedKey) -> CompiledFormula:
+        """
+        Retorna a fórmula de um valor derivado.
+
+        Raises:
+            ValueError: Se a fórmula ou a perícia não estiver configurada no banco.
+        """
+        formula = self.formulas.get(key)
+        if formula is None:
+            kind, name = key
+            # Reaproveita as mensagens de erro do livro de regras
+            if kind == SKILL:
+                self.snapshot.skill(name)
+            self.snapshot.formula(name)
+        return formula
+
+
+@dataclass
+class _DerivedEntry:
+    """Valores derivados de um personagem e as características usadas no cálculo."""
+
+    basis: Dict[str, int] = field(default_factory=dict)
+    values: Dict[DerivedKey, float] = field(default_factory=dict)
+
+
+class DerivedStateCache:
+    """
+    Cache de valores derivados por personagem, com recomputação seletiva.
+
+    Attributes:
+        state (CharacterStateStore): A origem das características.
+        rules (Rulebook): A origem das fórmulas.
+        maxsize (int): Quantidade máxima de personagens mantidos em memória.
+        evaluations (Counter): Avaliações de fórmula por valor derivado.
+    """
+
+    def __init__(
+        self, state: CharacterStateStore, rules: Rulebook, maxsize: int = 10_000
+    ) -> None:
+        self.state = state
+        self.rules = rules
+        self.maxsize = maxsize
+        self.evaluations: Counter = Counter()
+        self._entries: "OrderedDict[str, _DerivedEntry]" = OrderedDict()
+        self._graph: Optional[DependencyGraph] = None
+        self._lock = threading.RLock()
+
+    @property
+    def graph(self) -> DependencyGraph:
+        """O grafo do livro de regras atual (refeito quando as regras mudam)."""
+        snapshot = self.rules.snapshot
+        if self._graph is None or self._graph.snapshot is not snapshot:
+            # Regras novas: todos os valores derivados perdem a validade
+            self._graph = DependencyGraph(snapshot)
+            self._entries.clear()
+        return self._graph
+
+    def _entry(self, char_id: str, graph: DependencyGraph) -> _DerivedEntry:
+        """Retorna o registro do personagem, descartando os valores que ficaram sujos."""
+        characteristics = self.state.characteristics(char_id)
+        entry = self._entries.get(char_id)
+        if entry is None:
+            entry = self._entries[char_id] = _DerivedEntry(dict(characteristics))
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(char_id)
+            if entry.basis != characteristics:
+                changed = [
+                    name for name, value in characteristics.items()
+                    if entry.basis.get(name) != value
+                ]
+                for key in graph.affected(changed):
+                    entry.values.pop(key, None)
+                entry.basis = dict(characteristics)
+        return entry
+
+    def value(self, char_id: str, key: DerivedKey) -> float:
+        """
+        Retorna um valor derivado, recalculando-o apenas se estiver sujo.
+
+        Args:
+            char_id (str): O identificador do personagem.
+            key (DerivedKey): O valor desejado (ex: ('formula', 'MAX_HP')).
+
+        Returns:
+            float: O resultado bruto da fórmula (sem arredondamento).
+
+        Raises:
+            ValueError: Se o personagem, a fórmula ou a perícia não existir.
+        """
+        with self._lock:
+            graph = self.graph
+            entry = self._entry(char_id, graph)
+            result = entry.values.get(key)
+            if result is None:
+                result = entry.values[key] = graph.formula(key)(entry.basis)
+                self.evaluations[key] += 1
+            return result
+
+    def formula_value(self, char_id: str, stat_name: str) -> float:
+        """Atalho para o valor de uma fórmula de `brp_formulas` (ex: 'MAX_HP')."""
+        return self.value(char_id, (FORMULA, stat_name))
+
+    def skill_base(self, char_id: str, skill_id: str) -> float:
+        """Atalho para a base avaliada de uma perícia (sem os pontos alocados)."""
+        return self.value(char_id, (SKILL, skill_id))
+
+    def dirty(self, char_id: str) -> Set[DerivedKey]:
+        """
+        Lista os valores derivados do personagem que serão recalculados na próxima leitura.
+
+        Args:
+            char_id (str): O identificador do personagem.
+
+        Returns:
+            Set[DerivedKey]: Os valores sujos ou ainda não calculados.
+        """
+        with self._lock:
+            graph = self.graph
+            entry = self._entry(char_id, graph)
+            return set(graph.formulas) - set(entry.values)
+
+    def refresh(self, char_id: str) -> int:
+        """
+        Recalcula de uma só vez todos os valores sujos já calculados antes.
+
+        Valores que nunca foram lidos continuam preguiçosos.
+
+        Args:
+            char_id (str): O identificador do personagem.
+
+        Returns:
+            int: A quantidade de valores recalculados.
+        """
+        with self._lock:
+            graph = self.graph
+            entry = self._entries.get(char_id)
+            if entry is None:
+                return 0
+            previous = set(entry.values)
+            entry = self._entry(char_id, graph)
+            stale = previous - set(entry.values)
+            for key in stale:
+                entry.values[key] = graph.formula(key)(entry.basis)
+                self.evaluations[key] += 1
+            return len(stale)
+
+    def set_characteristics(
+        self, char_id: str, changes: Mapping[str, int], eager: bool = False
+    ) -> Set[DerivedKey]:
+        """
+        Altera características (write-through) e suja apenas os valores dependentes.
+
+        Args:
+            char_id (str): O identificador do personagem.
+            changes (Mapping[str, int]): Siglas e novos valores (ex: {'STR': 10}).
+            eager (bool): Recalcula os dependentes imediatamente, em lote. Por
+                          padrão, o recálculo acontece na próxima leitura.
+
+        Returns:
+            Set[DerivedKey]: Os valores derivados afetados pela mudança.
+
+        Raises:
+            ValueError: Se alguma característica não existir no personagem.
+        """
+        with self._lock:
+            # Garante que o cálculo atual use as características anteriores
+            self._entry(char_id, self.graph)
+            with transaction(self.state.connection):
+                for name, value in changes.items():
+                    self.state.set_characteristic(char_id, name, value)
+            affected = self.graph.affected(changes)
+            if eager:
+                self.refresh(char_id)
+            return affected
+
+    def invalidate(self, char_id: Optional[str] = None) -> None:
+        """Descarta os valores derivados de um personagem (ou de todos)."""
+        with self._lock:
+            if char_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(char_id, None)
+
+
+# Valores fracos: a entrada some junto com o último motor que usa o cache
+_caches: "weakref.WeakValueDictionary[int, DerivedStateCache]" = weakref.WeakValueDictionary()
+_caches_lock = threading.Lock()
+
+
+def get_derived_cache(
+    connection: sqlite3.Connection,
+    state: Optional[CharacterStateStore] = None,
+    rules: Optional[Rulebook] = None,
+) -> DerivedStateCache:
+    """
+    Retorna o cache de valores derivados compartilhado pelos motores de uma conexão.
+
+    Motores criados com um cache de estado ou livro de regras próprios (ex: em
+    testes) recebem um cache derivado exclusivo, ligado a essas instâncias.
+
+    Args:
+        connection (sqlite3.Connection): A conexão usada pelos motores.
+        state (Optional[CharacterStateStore]): O cache de estado do motor.
+        rules (Optional[Rulebook]): O livro de regras do motor.
+
+    Returns:
+        DerivedStateCache: O cache associado à conexão.
+    """
+    shared_state = get_state_store(connection)
+    shared_rules = get_rulebook(connection)
+    if (state is not None and state is not shared_state) or (
+        rules is not None and rules is not shared_rules
+    ):
+        return DerivedStateCache(state or shared_state, rules or shared_rules)
+    with _caches_lock:
+        cache = _caches.get(id(connection))
+        if cache is None or cache.state is not shared_state or cache.rules is not shared_rules:
+            cache = _caches[id(connection)] = DerivedStateCache(shared_state, shared_rules)
+        return cache
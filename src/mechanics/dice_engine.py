@@ -9,8 +9,13 @@ as rolagens estocásticas (d100) características do sistema Basic Role-Playing
 
 Dependências:
     - sqlite3: Para consulta do catálogo de perícias e do save do jogador.
+    - src.database.connection: Para a conexão compartilhada entre os motores.
+    - src.database.audit: Para a fila de auditoria gravada em lote.
+    - src.mechanics.state: Para o cache de estado compartilhado entre os motores.
+    - src.mechanics.rulebook: Para as tabelas de regras carregadas em memória.
     - random: Para geração do número pseudoaleatório (o dado d100).
     - math: Para os arredondamentos mecânicos exigidos pelo sistema BRP.
+    - json: Para enviar listas de pares (personagem, perícia) em um único parâmetro.
     - enum: Para tipagem estrita dos níveis de sucesso.
 
 Padrões aplicados:
@@ -21,8 +26,16 @@ Padrões aplicados:
 import sqlite3
 import random
 import math
+import json
 from enum import Enum
-from typing import Dict, Tuple
+from typing import Dict, Iterable, Optional, Tuple
+
+from src.database.audit import AuditWriter, get_audit_writer
+from src.database.connection import after_commit, get_connection
+from src.mechanics.derived import DerivedStateCache, get_derived_cache
+from src.mechanics.events import RollLogged
+from src.mechanics.rulebook import Rulebook, get_rulebook
+from src.mechanics.state import CharacterStateStore, get_state_store
 
 
 class SuccessLevel(Enum):
@@ -38,6 +51,29 @@ class SuccessLevel(Enum):
     SPECIAL_SUCCESS = 2
 
 
+def resolve_success_level(roll: int, total_skill: int) -> SuccessLevel:
+    """
+    Classifica um resultado de d100 contra o rating total de uma perícia.
+
+    A mecânica de Sucesso Especial do BRP Quick-Start define que resultados
+    iguais ou inferiores a 20% (1/5) da chance total da perícia, arredondados
+    para cima, geram um efeito ampliado. Esta é a única implementação da regra,
+    compartilhada pela rolagem real, pelas probabilidades exatas e pelas simulações.
+
+    Args:
+        roll (int): O resultado bruto do dado (1 a 100).
+        total_skill (int): A chance percentual final da perícia.
+
+    Returns:
+        SuccessLevel: O grau de sucesso alcançado.
+    """
+    if roll <= math.ceil(total_skill / 5.0):
+        return SuccessLevel.SPECIAL_SUCCESS
+    if roll <= total_skill:
+        return SuccessLevel.SUCCESS
+    return SuccessLevel.FAILURE
+
+
 class SkillEngine:
     """
     Motor focado na resolução matemática de Perícias e Rolagens (d100) do BRP.
@@ -47,18 +83,48 @@ class SkillEngine:
 
     Attributes:
         connection (sqlite3.Connection): Conexão ativa com o banco de dados SQLite.
+        audit (AuditWriter): Fila de auditoria de rolagens compartilhada pelos motores.
+        state (CharacterStateStore): Cache write-through do estado dos personagens.
+        rules (Rulebook): Livro de regras em memória (armas, perícias, fórmulas...).
+        derived (DerivedStateCache): Valores derivados com recálculo incremental.
     """
 
-    def __init__(self, db_path: str = "abraxas.db") -> None:
+    def __init__(
+        self,
+        db_path: str = "abraxas.db",
+        connection: Optional[sqlite3.Connection] = None,
+        audit_writer: Optional[AuditWriter] = None,
+        state_store: Optional[CharacterStateStore] = None,
+        rulebook: Optional[Rulebook] = None,
+        derived_cache: Optional[DerivedStateCache] = None,
+    ) -> None:
         """
         Inicializa o motor de perícias conectando-se ao banco de dados.
 
         Args:
             db_path (str): O caminho para o arquivo do banco de dados SQLite.
                            Padrão é "abraxas.db".
+            connection (Optional[sqlite3.Connection]): Conexão já aberta a ser
+                compartilhada (ex: um banco ':memory:' em testes). Se omitida, usa a
+                conexão da thread atual fornecida pelo `ConnectionManager`.
+            audit_writer (Optional[AuditWriter]): Fila de auditoria de rolagens. Se
+                omitida, usa a fila compartilhada pelos motores da mesma conexão.
+            state_store (Optional[CharacterStateStore]): Cache de estado dos personagens.
+                Se omitido, usa o cache compartilhado pelos motores da mesma conexão.
+            rulebook (Optional[Rulebook]): Livro de regras em memória. Se omitido, usa
+                o livro compartilhado pelos motores da mesma conexão.
+            derived_cache (Optional[DerivedStateCache]): Cache de valores derivados.
+                Se omitido, usa o cache compartilhado pelos motores da mesma conexão.
         """
-        self.connection = sqlite3.connect(db_path)
-        self.connection.row_factory = sqlite3.Row
+        self.connection = get_connection(db_path, connection)
+        self.audit = audit_writer or get_audit_writer(
+            self.connection, None if connection is not None else db_path
+        )
+        self.state = state_store or get_state_store(self.connection)
+        self.rules = rulebook or get_rulebook(self.connection)
+        self.derived = derived_cache or get_derived_cache(
+            self.connection, state_store, rulebook
+        )
 
     def _get_characteristics(self, char_id: str) -> Dict[str, int]:
         """
@@ -74,16 +140,7 @@ class SkillEngine:
         Raises:
             ValueError: Se o `char_id` não for encontrado na tabela de características.
         """
-        cursor = self.connection.cursor()
-        cursor.execute("SELECT * FROM characteristics WHERE char_id = ?", (char_id,))
-        row = cursor.fetchone()
-
-        if not row:
-            raise ValueError(f"Personagem '{char_id}' não encontrado.")
-
-        return {
-            key.upper(): value for key, value in dict(row).items() if key != "char_id"
-        }
+        return self.state.characteristics(char_id)
 
     def get_skill_total(self, char_id: str, skill_id: str) -> int:
         """
@@ -102,41 +159,80 @@ class SkillEngine:
         Raises:
             ValueError: Se a perícia especificada não existir no catálogo do banco.
         """
-        cursor = self.connection.cursor()
-        # O LEFT JOIN garante que, mesmo que o jogador não tenha pontos alocados (NULL),
-        # a perícia ainda possa ser rolada usando apenas sua base padrão (COALESCE para 0).
-        cursor.execute(
+        self.rules.snapshot.skill(skill_id)
+
+        # Avalia se a base é fixa (ex: '25') ou dependente de status (ex: 'DEX * 2').
+        # A fórmula já chega compilada pelo livro de regras e o resultado só é
+        # reavaliado quando muda alguma característica usada por ela.
+        base_val = int(self.derived.skill_base(char_id, skill_id))
+        # Mesmo sem pontos alocados, a perícia pode ser rolada usando apenas sua base (0).
+        return base_val + self.state.allocated_points(char_id, skill_id)
+
+    def get_skill_totals(
+        self, requests: Iterable[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], int]:
+        """
+        Versão em lote de `get_skill_total` (ex: um grupo inteiro rolando Listen).
+
+        Características e pontos alocados de todos os pares são lidos com uma única
+        consulta; os pares são enviados como um único parâmetro JSON e expandidos
+        pelo `json_each`, evitando o limite de variáveis do SQLite.
+
+        Args:
+            requests (Iterable[Tuple[str, str]]): Pares (char_id, skill_id).
+
+        Returns:
+            Dict[Tuple[str, str], int]: Mapeia cada par ao valor final da perícia.
+
+        Raises:
+            ValueError: Se alguma perícia não existir no catálogo do banco ou se
+                        algum personagem não possuir características cadastradas.
+        """
+        requested = list(dict.fromkeys(requests))
+        rules = self.rules.snapshot
+        skills = {skill_id: rules.skill(skill_id) for _, skill_id in requested}
+
+        cursor = self.connection.execute(
             """
-            SELECT s.base_formula, COALESCE(cs.allocated_points, 0) as allocated_points
-            FROM skills s
-            LEFT JOIN character_skills cs ON s.id = cs.skill_id AND cs.char_id = ?
-            WHERE s.id = ?
+            SELECT json_extract(p.value, '$[1]') AS requested_skill,
+                   COALESCE(cs.allocated_points, 0) AS allocated_points,
+                   c.*
+            FROM json_each(?) p
+            JOIN characteristics c ON c.char_id = json_extract(p.value, '$[0]')
+            LEFT JOIN character_skills cs
+                ON cs.char_id = c.char_id AND cs.skill_id = json_extract(p.value, '$[1]')
             """,
-            (char_id, skill_id),
+            (json.dumps(requested),),
         )
-        row = cursor.fetchone()
-
-        if not row:
-            raise ValueError(f"Perícia '{skill_id}' não configurada no banco.")
-
-        chars = self._get_characteristics(char_id)
-        # Avalia se a base é fixa (ex: '25') ou dependente de status (ex: 'DEX * 2')
-        base_val = int(eval(row["base_formula"], {}, chars))
-        return base_val + row["allocated_points"]
+        # As duas primeiras colunas são de controle; as demais (exceto char_id)
+        # são as características, mapeadas para as siglas em MAIÚSCULAS
+        names = [description[0].upper() for description in cursor.description[2:]]
+
+        totals: Dict[Tuple[str, str], int] = {}
+        for row in cursor:
+            chars = dict(zip(names, row[2:]))
+            char_id = chars.pop("CHAR_ID")
+            skill_id = row[0]
+            base_val = int(skills[skill_id].base_formula(chars))
+            totals[(char_id, skill_id)] = base_val + row[1]
+
+        if len(totals) != len(requested):
+            missing = sorted({char_id for char_id, skill_id in requested
+                              if (char_id, skill_id) not in totals})
+            raise ValueError(f"Personagens {missing} não encontrados nas características base.")
+        return totals
 
     def _log_roll_audit(self, char_id: str, action_name: str, die_result: int, success_level: str) -> None:
         """
-        Método privado. Persiste o resultado da rolagem no banco de dados.
-        A TUI não faz ideia de que isso está acontecendo.
+        Método privado. Enfileira o resultado da rolagem no `AuditWriter`, que o
+        persiste no banco em lote (sem um commit por rolagem).
+        A TUI não faz ideia de que isso está acontecendo: ela apenas recebe o
+        evento `RollLogged` pelo barramento do cache de estado. Dentro de uma
+        transação (ex: um round de combate), o evento só sai após o COMMIT.
         """
-        with self.connection:
-            self.connection.execute(
-                """
-                INSERT INTO roll_history (char_id, action_name, die_result, success_level)
-                VALUES (?, ?, ?, ?)
-                """,
-                (char_id, action_name, die_result, success_level)
-            )
+        self.audit.log(char_id, action_name, die_result, success_level)
+        event = RollLogged(char_id, action_name, die_result, success_level)
+        after_commit(self.connection, lambda: self.state.events.publish(event))
     
     def roll_skill(self, char_id: str, skill_id: str) -> Tuple[SuccessLevel, int]:
         """
@@ -156,17 +252,10 @@ class SkillEngine:
         """
         total_skill = self.get_skill_total(char_id, skill_id)
         roll = random.randint(1, 100)
-        
-        special_chance = math.ceil(total_skill / 5.0)
-        
-        if roll <= special_chance:
-            result = SuccessLevel.SPECIAL_SUCCESS
-        elif roll <= total_skill:
-            result = SuccessLevel.SUCCESS
-        else:
-            result = SuccessLevel.FAILURE
+        result = resolve_success_level(roll, total_skill)
             
-        # A MÁGICA AQUI: O motor grava no banco sozinho antes de devolver a resposta!
+        # A MÁGICA AQUI: O motor audita a rolagem sozinho antes de devolver a resposta!
+        # (a linha entra na fila do AuditWriter e é gravada no próximo lote)
         self._log_roll_audit(char_id, skill_id, roll, result.name)
             
         return result, roll
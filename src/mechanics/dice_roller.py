@@ -0,0 +1,200 @@
+"""
+Módulo de Rolagem de Expressões de Dados (Dice Roller)
+======================================================
+
+Este módulo é o parser de dados do motor Abraxas. Ele recebe as expressões
+no formato clássico de RPG construídas pelo `CombatEngine.calculate_raw_damage`
+(ex: '1D8+1+1D4', '1D6-1D4') e as resolve em números.
+
+Cada expressão é convertida uma única vez em uma forma compilada (`DiceExpression`)
+e guardada em cache, de modo que rolagens repetidas não voltam a fazer parsing.
+Para simulações, `roll_many` sorteia todos os dados de N rolagens em uma única
+passada vetorizada (NumPy quando disponível).
+
+Dependências:
+    - re: Para a tokenização das expressões de dados.
+    - random: Gerador pseudoaleatório padrão (injetável e semeável).
+    - numpy (opcional): Para as rolagens vetorizadas em lote.
+
+Padrões aplicados:
+    - Interpreter (expressão compilada em termos de dados e constante)
+    - Injeção de Dependência (gerador aleatório semeável para reprodutibilidade)
+"""
+
+import random
+import re
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional (extra "perf"); há fallback em Python puro
+    np = None
+
+# Um termo com sinal opcional: dados ('2D6', 'D4') ou constante ('1', '0')
+_TERM_PATTERN = re.compile(r"([+-]?)(?:(\d*)[dD](\d+)|(\d+))")
+
+
+class DiceExpression:
+    """
+    Forma compilada de uma expressão de dados.
+
+    Attributes:
+        source (str): A expressão original (ex: '1D8+1-1D6').
+        dice (Tuple[Tuple[int, int, int], ...]): Termos de dados no formato
+            (sinal, quantidade, faces). Ex: '-1D6' vira (-1, 1, 6).
+        constant (int): A soma de todos os modificadores fixos da expressão.
+    """
+
+    __slots__ = ("source", "dice", "constant")
+
+    def __init__(self, source: str, dice: Tuple[Tuple[int, int, int], ...], constant: int) -> None:
+        self.source = source
+        self.dice = dice
+        self.constant = constant
+
+    @property
+    def minimum(self) -> int:
+        """O menor resultado possível da expressão."""
+        return self.constant + sum(
+            sign * count * (1 if sign > 0 else sides) for sign, count, sides in self.dice
+        )
+
+    @property
+    def maximum(self) -> int:
+        """O maior resultado possível da expressão."""
+        return self.constant + sum(
+            sign * count * (sides if sign > 0 else 1) for sign, count, sides in self.dice
+        )
+
+    def __repr__(self) -> str:
+        return f"DiceExpression({self.source!r})"
+
+
+@lru_cache(maxsize=1024)
+def parse_expression(expression: str) -> DiceExpression:
+    """
+    Converte uma expressão de dados em sua forma compilada (com cache pelo texto).
+
+    Args:
+        expression (str): A expressão (ex: '1D8+1+1D4', '-1D6', '+0').
+
+    Returns:
+        DiceExpression: A expressão compilada, reaproveitada em chamadas seguintes.
+
+    Raises:
+        ValueError: Se a expressão estiver vazia ou contiver termos inválidos.
+    """
+    compact = "".join(expression.split())
+    if not compact:
+        raise ValueError("Expressão de dados vazia.")
+
+    dice: List[Tuple[int, int, int]] = []
+    constant = 0
+    position = 0
+    while position < len(compact):
+        match = _TERM_PATTERN.match(compact, position)
+        # Todo termo após o primeiro precisa de um sinal explícito ('1D8+1', não '1D81D4')
+        if not match or match.end() == position or (position and not match.group(1)):
+            raise ValueError(f"Expressão de dados inválida: '{expression}'.")
+
+        sign = -1 if match.group(1) == "-" else 1
+        if match.group(3) is not None:
+            count = int(match.group(2) or 1)
+            sides = int(match.group(3))
+            if sides < 1:
+                raise ValueError(f"Dado sem faces na expressão '{expression}'.")
+            if count:
+                dice.append((sign, count, sides))
+        else:
+            constant += sign * int(match.group(4))
+        position = match.end()
+
+    return DiceExpression(expression, tuple(dice), constant)
+
+
+class DiceRoller:
+    """
+    Rolador de expressões de dados com gerador aleatório injetável.
+
+    Duas instâncias criadas com a mesma semente produzem exatamente a mesma
+    sequência de resultados, tanto em `roll` quanto em `roll_many`.
+
+    Attributes:
+        rng (random.Random): Gerador usado pelas rolagens individuais.
+    """
+
+    def __init__(self, seed: Optional[int] = None, rng: Optional[random.Random] = None) -> None:
+        """
+        Args:
+            seed (Optional[int]): Semente para resultados reprodutíveis.
+            rng (Optional[random.Random]): Gerador já existente a ser reutilizado.
+                Tem prioridade sobre `seed` para as rolagens individuais.
+        """
+        self.rng = rng if rng is not None else random.Random(seed)
+        self._np_rng = None
+        if np is not None:
+            # O gerador vetorizado deriva do gerador principal quando não há semente
+            np_seed = seed if seed is not None else self.rng.getrandbits(64)
+            self._np_rng = np.random.default_rng(np_seed)
+
+    def roll(self, expression: str) -> int:
+        """
+        Rola uma expressão de dados uma única vez.
+
+        Args:
+            expression (str): A expressão (ex: '1D8+1+1D4').
+
+        Returns:
+            int: O resultado bruto. Pode ser negativo (ex: '1D3-1D6'); a mitigação
+                 mínima de dano é responsabilidade do `CombatEngine.apply_damage`.
+        """
+        compiled = parse_expression(expression)
+        random_value = self.rng.random
+        total = compiled.constant
+        for sign, count, sides in compiled.dice:
+            subtotal = count
+            for _ in range(count):
+                subtotal += int(random_value() * sides)
+            total += sign * subtotal
+        return total
+
+    def roll_many(self, expression: str, n: int) -> Sequence[int]:
+        """
+        Rola a mesma expressão `n` vezes sorteando todos os dados de uma só vez.
+
+        Args:
+            expression (str): A expressão (ex: '1D8+1+1D4').
+            n (int): A quantidade de rolagens independentes.
+
+        Returns:
+            Sequence[int]: Os `n` resultados. Um `numpy.ndarray` (int64) quando o
+                           NumPy está disponível, ou uma lista de inteiros.
+        """
+        compiled = parse_expression(expression)
+
+        if self._np_rng is not None:
+            totals = np.full(n, compiled.constant, dtype=np.int64)
+            for sign, count, sides in compiled.dice:
+                draws = self._np_rng.integers(1, sides + 1, size=(n, count), dtype=np.int64)
+                totals += sign * draws.sum(axis=1)
+            return totals
+
+        return [self.roll(expression) for _ in range(n)]
+
+    @classmethod
+    def parse_and_roll(cls, expression: str) -> int:
+        """
+        Atalho para rolar uma expressão com o rolador compartilhado do processo.
+
+        Args:
+            expression (str): A expressão (ex: o retorno de `calculate_raw_damage`).
+
+        Returns:
+            int: O resultado bruto da rolagem.
+        """
+        return default_roller.roll(expression)
+
+
+# Rolador compartilhado (não semeado) usado por `DiceRoller.parse_and_roll`.
+default_roller = DiceRoller()
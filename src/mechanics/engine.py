@@ -13,7 +13,13 @@ calculando atributos derivados e atualizando o estado do jogador na persistênci
 
 Dependências:
     - sqlite3: Para comunicação nativa com o banco de dados embarcado.
+    - src.database.connection: Para a conexão compartilhada entre os motores.
+    - src.database.audit: Para a fila de auditoria gravada em lote.
+    - src.mechanics.state: Para o cache de estado compartilhado entre os motores.
+    - src.mechanics.rulebook: Para as tabelas de regras carregadas em memória.
     - math: Para os arredondamentos mecânicos exigidos pelo sistema BRP.
+    - json: Para enviar listas de personagens em um único parâmetro (json_each).
+    - numpy (opcional): Para a avaliação vetorizada das fórmulas em lote.
 
 Padrões aplicados:
     - Data-Driven Design
@@ -22,7 +28,20 @@ Padrões aplicados:
 
 import sqlite3
 import math
-from typing import Dict
+import json
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.database.audit import AuditWriter, get_audit_writer
+from src.database.connection import get_connection
+from src.mechanics.derived import DerivedKey, DerivedStateCache, get_derived_cache
+from src.mechanics.rulebook import Rulebook, get_rulebook
+from src.mechanics.state import CharacterStateStore, get_state_store
+from src.mechanics.formulas import CompiledFormula
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional (extra "perf"); há fallback em Python puro
+    np = None
 
 
 class BRPEngine:
@@ -34,19 +53,49 @@ class BRPEngine:
 
     Attributes:
         connection (sqlite3.Connection): Conexão ativa com o banco de dados SQLite.
+        audit (AuditWriter): Fila de auditoria de rolagens compartilhada pelos motores.
+        state (CharacterStateStore): Cache write-through do estado dos personagens.
+        rules (Rulebook): Livro de regras em memória (armas, perícias, fórmulas...).
+        derived (DerivedStateCache): Valores derivados com recálculo incremental.
     """
 
-    def __init__(self, db_path: str = "abraxas.db") -> None:
+    def __init__(
+        self,
+        db_path: str = "abraxas.db",
+        connection: Optional[sqlite3.Connection] = None,
+        audit_writer: Optional[AuditWriter] = None,
+        state_store: Optional[CharacterStateStore] = None,
+        rulebook: Optional[Rulebook] = None,
+        derived_cache: Optional[DerivedStateCache] = None,
+    ) -> None:
         """
         Inicializa o motor conectando-se ao banco de dados.
 
         Args:
             db_path (str): O caminho para o arquivo do banco de dados SQLite.
                            Padrão é "abraxas.db".
+            connection (Optional[sqlite3.Connection]): Conexão já aberta a ser
+                compartilhada (ex: um banco ':memory:' em testes). Se omitida, usa a
+                conexão da thread atual fornecida pelo `ConnectionManager`.
+            audit_writer (Optional[AuditWriter]): Fila de auditoria de rolagens. Se
+                omitida, usa a fila compartilhada pelos motores da mesma conexão.
+            state_store (Optional[CharacterStateStore]): Cache de estado dos personagens.
+                Se omitido, usa o cache compartilhado pelos motores da mesma conexão.
+            rulebook (Optional[Rulebook]): Livro de regras em memória. Se omitido, usa
+                o livro compartilhado pelos motores da mesma conexão.
+            derived_cache (Optional[DerivedStateCache]): Cache de valores derivados.
+                Se omitido, usa o cache compartilhado pelos motores da mesma conexão.
         """
-        self.connection = sqlite3.connect(db_path)
-        # Permite acessar colunas por nome ao invés de apenas por índice numérico
-        self.connection.row_factory = sqlite3.Row
+        # A conexão compartilhada já usa sqlite3.Row, permitindo acessar colunas por nome
+        self.connection = get_connection(db_path, connection)
+        self.audit = audit_writer or get_audit_writer(
+            self.connection, None if connection is not None else db_path
+        )
+        self.state = state_store or get_state_store(self.connection)
+        self.rules = rulebook or get_rulebook(self.connection)
+        self.derived = derived_cache or get_derived_cache(
+            self.connection, state_store, rulebook
+        )
 
     def _get_characteristics(self, char_id: str) -> Dict[str, int]:
         """
@@ -62,52 +111,18 @@ class BRPEngine:
         Raises:
             ValueError: Se o `char_id` não for encontrado na tabela `characteristics`.
         """
-        cursor = self.connection.cursor()
-        cursor.execute("SELECT * FROM characteristics WHERE char_id = ?", (char_id,))
-        row = cursor.fetchone()
-
-        if not row:
-            raise ValueError(
-                f"Personagem {char_id} não encontrado nas características base."
-            )
-
-        # Converte a Row do SQLite para um dicionário, transformando as chaves em MAIÚSCULAS
-        # Isso facilita o mapeamento (eval) com as fórmulas do banco (ex: 'CON', 'SIZ')
-        return {
-            key.upper(): value for key, value in dict(row).items() if key != "char_id"
-        }
-
-    def _get_formula(self, stat_name: str) -> str:
-        """
-        Consulta uma fórmula matemática abstrata armazenada no banco de dados.
-
-        Args:
-            stat_name (str): O nome da estatística derivada a ser consultada (ex: 'MAX_HP').
-
-        Returns:
-            str: A string contendo a fórmula matemática (ex: '(CON + SIZ) / 2').
-
-        Raises:
-            ValueError: Se a fórmula solicitada não existir na tabela `brp_formulas`.
-        """
-        cursor = self.connection.cursor()
-        cursor.execute(
-            "SELECT formula FROM brp_formulas WHERE stat_name = ?", (stat_name,)
-        )
-        row = cursor.fetchone()
-
-        if not row:
-            raise ValueError(f"Fórmula para '{stat_name}' não definida no banco.")
-
-        return row["formula"]
+        # O CharacterStateStore lê a linha do SQLite apenas no primeiro acesso e já
+        # devolve as chaves em MAIÚSCULAS, prontas para as fórmulas (ex: 'CON', 'SIZ')
+        return self.state.characteristics(char_id)
 
     def calculate_derived_stats(self, char_id: str) -> Dict[str, int]:
         """
         Processador de Regras: Injeta os valores das características nas fórmulas
         abstraídas pelo banco de dados para calcular os status derivados do personagem.
 
-        Utiliza avaliação determinística via `eval` de forma segura, pois o contexto
-        está confinado às fórmulas do próprio sistema e aos atributos limpos do personagem.
+        As fórmulas são validadas e compiladas uma única vez pelo `Rulebook`, e os
+        resultados ficam no `DerivedStateCache`: só são reavaliados quando muda
+        alguma característica da qual dependem (ver `set_characteristics`).
 
         Args:
             char_id (str): O identificador único do personagem.
@@ -116,14 +131,9 @@ class BRPEngine:
             Dict[str, int]: Um dicionário com os atributos derivados calculados e
                             arredondados. Contém as chaves 'max_hp' e 'max_mp'.
         """
-        chars = self._get_characteristics(char_id)
-
-        hp_formula = self._get_formula("MAX_HP")
-        mp_formula = self._get_formula("MAX_MP")
-
-        # Avaliação das fórmulas com os atributos do personagem
-        max_hp_raw = eval(hp_formula, {}, chars)
-        max_mp_raw = eval(mp_formula, {}, chars)
+        # Avaliação (ou reaproveitamento) das fórmulas com os atributos do personagem
+        max_hp_raw = self.derived.formula_value(char_id, "MAX_HP")
+        max_mp_raw = self.derived.formula_value(char_id, "MAX_MP")
 
         # O sistema BRP dita que frações no HP devem ser arredondadas para cima (math.ceil),
         # enquanto o MP baseia-se diretamente no valor inteiro da fórmula.
@@ -142,18 +152,174 @@ class BRPEngine:
         """
         derived = self.calculate_derived_stats(char_id)
 
-        with self.connection:
-            self.connection.execute(
+        # Garantia de auditoria: as rolagens pendentes são gravadas antes do estado
+        self.audit.flush()
+        self.state.set_vitals(char_id, derived["max_hp"], derived["max_mp"])
+
+    def set_characteristics(
+        self, char_id: str, changes: Dict[str, int], eager: bool = False
+    ) -> List[DerivedKey]:
+        """
+        Altera características do personagem (ex: dreno de STR, bênção de POW).
+
+        Todas as mudanças são gravadas em uma única transação. Apenas os status
+        derivados e as perícias que usam as características alteradas são marcados
+        para recálculo; os demais continuam valendo sem nova avaliação. O HP e o MP
+        atuais não mudam: `initialize_character_state` os restaura aos novos máximos.
+
+        Args:
+            char_id (str): O identificador único do personagem.
+            changes (Dict[str, int]): Siglas e novos valores (ex: {'STR': 10}).
+            eager (bool): Recalcula os valores afetados imediatamente, em lote. Por
+                          padrão, o recálculo acontece na próxima consulta.
+
+        Returns:
+            List[DerivedKey]: Os valores derivados afetados, em ordem
+                              (ex: [('formula', 'MAX_HP')] para uma mudança de CON).
+
+        Raises:
+            ValueError: Se alguma característica não existir no personagem.
+        """
+        self.audit.flush()
+        return sorted(self.derived.set_characteristics(char_id, changes, eager))
+
+    def _get_characteristics_batch(
+        self, char_ids: Optional[Iterable[str]] = None
+    ) -> Tuple[List[str], Dict[str, List[int]]]:
+        """
+        Lê as características de vários personagens com uma única consulta.
+
+        A lista de identificadores é enviada como um único parâmetro JSON e
+        expandida pelo `json_each`, evitando o limite de variáveis do SQLite.
+
+        Args:
+            char_ids (Optional[Iterable[str]]): Os personagens desejados. Se `None`,
+                                                todos os personagens cadastrados.
+
+        Returns:
+            Tuple[List[str], Dict[str, List[int]]]: Os identificadores na ordem lida e
+                as colunas de características (siglas em maiúsculas -> valores).
+
+        Raises:
+            ValueError: Se algum `char_id` solicitado não existir em `characteristics`.
+        """
+        if char_ids is None:
+            cursor = self.connection.execute("SELECT * FROM characteristics")
+            requested = None
+        else:
+            requested = list(dict.fromkeys(char_ids))
+            cursor = self.connection.execute(
                 """
-                INSERT INTO character_state (char_id, current_hp, current_mp)
-                VALUES (?, ?, ?)
-                ON CONFLICT(char_id) DO UPDATE SET 
-                    current_hp = excluded.current_hp,
-                    current_mp = excluded.current_mp
+                SELECT * FROM characteristics
+                WHERE char_id IN (SELECT value FROM json_each(?))
                 """,
-                (char_id, derived["max_hp"], derived["max_mp"]),
+                (json.dumps(requested),),
+            )
+
+        names = [description[0] for description in cursor.description]
+        rows = cursor.fetchall()
+
+        if requested is not None and len(rows) != len(requested):
+            found = {row["char_id"] for row in rows}
+            missing = [char_id for char_id in requested if char_id not in found]
+            raise ValueError(
+                f"Personagens {missing} não encontrados nas características base."
             )
 
+        # Transposição linha -> coluna (uma lista por característica)
+        columns = dict(zip(names, map(list, zip(*rows)))) if rows else {n: [] for n in names}
+        ids = columns.pop("char_id")
+        return ids, {key.upper(): values for key, values in columns.items()}
+
+    @staticmethod
+    def _evaluate_columns(
+        formula: CompiledFormula, columns: Dict[str, List[int]], size: int
+    ) -> Sequence[Any]:
+        """
+        Avalia uma fórmula compilada sobre colunas inteiras de características.
+
+        Com NumPy disponível, a fórmula é executada uma única vez sobre arrays
+        (a aritmética das fórmulas é a mesma para escalares e vetores). Sem NumPy,
+        a avaliação recai para um laço em Python puro, linha a linha.
+
+        Returns:
+            Sequence[Any]: Os resultados brutos, um por personagem, sem arredondamento.
+        """
+        if np is not None:
+            arrays = {name: np.asarray(columns[name]) for name in formula.variables}
+            # Fórmulas constantes (ex: '25') devolvem um escalar: expande para a coluna
+            return np.broadcast_to(formula(arrays), (size,))
+
+        variables = sorted(formula.variables)
+        if not variables:
+            return [formula({})] * size
+        return [
+            formula(dict(zip(variables, values)))
+            for values in zip(*(columns[name] for name in variables))
+        ]
+
+    def calculate_derived_stats_batch(
+        self, char_ids: Optional[Iterable[str]] = None
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Versão em lote de `calculate_derived_stats` para elencos inteiros (ex: NPCs).
+
+        Lê todas as características com uma única consulta e avalia MAX_HP/MAX_MP
+        coluna a coluna, mantendo os mesmos arredondamentos do cálculo individual
+        (HP com `math.ceil`, MP truncado com `int`).
+
+        Args:
+            char_ids (Optional[Iterable[str]]): Os personagens a calcular. Se `None`,
+                                                todos os personagens cadastrados.
+
+        Returns:
+            Dict[str, Dict[str, int]]: Mapeia cada `char_id` para um dicionário
+                                       com as chaves 'max_hp' e 'max_mp'.
+        """
+        ids, columns = self._get_characteristics_batch(char_ids)
+        size = len(ids)
+
+        rules = self.rules.snapshot
+        max_hp_raw = self._evaluate_columns(rules.formula("MAX_HP"), columns, size)
+        max_mp_raw = self._evaluate_columns(rules.formula("MAX_MP"), columns, size)
+
+        if np is not None:
+            max_hp = np.ceil(max_hp_raw).astype(np.int64).tolist()
+            max_mp = np.trunc(max_mp_raw).astype(np.int64).tolist()
+        else:
+            max_hp = [math.ceil(value) for value in max_hp_raw]
+            max_mp = [int(value) for value in max_mp_raw]
+
+        return {
+            char_id: {"max_hp": hp, "max_mp": mp}
+            for char_id, hp, mp in zip(ids, max_hp, max_mp)
+        }
+
+    def initialize_characters_state(
+        self, char_ids: Optional[Iterable[str]] = None
+    ) -> int:
+        """
+        Versão em lote de `initialize_character_state`.
+
+        Todas as linhas de `character_state` são gravadas com um único
+        `executemany` dentro de uma única transação, trocando milhares de
+        commits (e fsyncs) por apenas um.
+
+        Args:
+            char_ids (Optional[Iterable[str]]): Os personagens a inicializar. Se `None`,
+                                                todos os personagens cadastrados.
+
+        Returns:
+            int: A quantidade de personagens inicializados.
+        """
+        derived = self.calculate_derived_stats_batch(char_ids)
+
+        self.audit.flush()
+        return self.state.set_vitals_many(
+            (char_id, stats["max_hp"], stats["max_mp"])
+            for char_id, stats in derived.items()
+        )
+
 
 # Uso pelo sistema (desacoplado da TUI):
 # engine = BRPEngine()
@@ -0,0 +1,217 @@
+"""
+Módulo de Eventos de Estado (Event Bus)
+=======================================
+
+Este módulo compõe a camada de gerenciamento de estado do motor Abraxas.
+Em vez de a interface reler o estado inteiro do banco após cada ação, os
+motores publicam eventos tipados e imutáveis descrevendo o que mudou:
+
+    - `HPChanged` / `MPChanged`: variação de HP/MP (ex: `apply_damage`).
+    - `StateInitialized`: HP/MP recalculados a partir das fórmulas.
+    - `RollLogged`: uma rolagem entrou na fila de auditoria.
+
+As mudanças de estado só são publicadas após o COMMIT da transação que as
+gravou (ver `after_commit`), de modo que um round desfeito nunca é anunciado.
+
+Os assinantes são chamados na thread que publicou o evento (ex: a thread dos
+motores da `AsyncEngine`). O `EventCoalescer` agrupa rajadas de eventos (ex: um
+round de combate em massa) e as entrega de uma só vez, no ritmo de quadros da UI.
+
+Dependências:
+    - threading: Para assinaturas e agrupamentos seguros entre threads.
+
+Padrões aplicados:
+    - Publish/Subscribe (Observer)
+    - Coalescing (último valor por chave, uma entrega por quadro)
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, List, Optional, Type, TypeVar
+
+E = TypeVar("E", bound="StateEvent")
+
+# Intervalo de um quadro da interface (60 quadros por segundo)
+FRAME_INTERVAL = 1 / 60
+
+
+@dataclass(frozen=True)
+class StateEvent:
+    """
+    Base de todos os eventos publicados pelos motores.
+
+    Attributes:
+        char_id (str): O personagem afetado.
+    """
+
+    char_id: str
+
+
+@dataclass(frozen=True)
+class HPChanged(StateEvent):
+    """
+    O HP atual do personagem mudou (dano ou cura).
+
+    Attributes:
+        hp (Optional[int]): O novo HP atual.
+        delta (int): A variação aplicada (negativa para dano).
+    """
+
+    hp: Optional[int]
+    delta: int
+
+
+@dataclass(frozen=True)
+class MPChanged(StateEvent):
+    """
+    O MP atual do personagem mudou (gasto ou recuperação).
+
+    Attributes:
+        mp (Optional[int]): O novo MP atual.
+        delta (int): A variação aplicada (negativa para gasto).
+    """
+
+    mp: Optional[int]
+    delta: int
+
+
+@dataclass(frozen=True)
+class StateInitialized(StateEvent):
+    """
+    O estado vital do personagem foi (re)inicializado.
+
+    Attributes:
+        hp (int): O HP atual gravado.
+        mp (int): O MP atual gravado.
+    """
+
+    hp: int
+    mp: int
+
+
+@dataclass(frozen=True)
+class RollLogged(StateEvent):
+    """
+    Uma rolagem entrou na fila de auditoria de `roll_history`.
+
+    Attributes:
+        action_name (str): A perícia ou ação rolada.
+        die_result (int): O resultado bruto do dado.
+        success_level (str): O nome do nível de sucesso.
+    """
+
+    action_name: str
+    die_result: int
+    success_level: str
+
+
+Handler = Callable[[StateEvent], None]
+
+
+class EventBus:
+    """
+    Barramento de eventos em processo, com assinatura por tipo de evento.
+
+    Assinar uma classe base (ex: `StateEvent`) recebe também todas as subclasses.
+    """
+
+    def __init__(self) -> None:
+        self._handlers: Dict[Type[StateEvent], List[Handler]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, event_type: Type[E], handler: Callable[[E], None]) -> Callable[[], None]:
+        """
+        Registra um assinante para um tipo de evento.
+
+        Args:
+            event_type (Type[E]): A classe do evento (ou uma classe base).
+            handler (Callable[[E], None]): A função chamada a cada publicação.
+
+        Returns:
+            Callable[[], None]: Função que cancela a assinatura.
+        """
+        with self._lock:
+            # Copy-on-write: publicações em curso seguem com a lista anterior
+            self._handlers[event_type] = self._handlers.get(event_type, []) + [handler]
+
+        def unsubscribe() -> None:
+            with self._lock:
+                handlers = [h for h in self._handlers.get(event_type, []) if h is not handler]
+                self._handlers[event_type] = handlers
+
+        return unsubscribe
+
+    def publish(self, event: StateEvent) -> None:
+        """
+        Entrega um evento a todos os assinantes do seu tipo e dos tipos base.
+
+        Args:
+            event (StateEvent): O evento publicado.
+        """
+        handlers = self._handlers
+        for event_type in type(event).__mro__:
+            for handler in handlers.get(event_type, ()):
+                handler(event)
+
+
+class EventCoalescer:
+    """
+    Agrupa rajadas de eventos e as entrega em um único lote por quadro.
+
+    Cada evento é indexado por `key`; dentro do mesmo quadro, um evento mais novo
+    substitui o anterior de mesma chave (ex: apenas o último HP de cada personagem
+    interessa para redesenhar a tela). Sem `key`, todos os eventos são mantidos.
+
+    Attributes:
+        deliver (Callable[[List[StateEvent]], None]): Recebe o lote agrupado.
+        schedule (Callable[[Callable[[], None]], None]): Agenda a entrega do lote
+            (ex: no Event Loop da UI, após um quadro).
+    """
+
+    def __init__(
+        self,
+        deliver: Callable[[List[StateEvent]], None],
+        schedule: Callable[[Callable[[], None]], None],
+        key: Optional[Callable[[StateEvent], Hashable]] = None,
+    ) -> None:
+        self.deliver = deliver
+        self.schedule = schedule
+        self._key = key
+        self._pending: Dict[Hashable, StateEvent] = {}
+        self._sequence = 0
+        self._scheduled = False
+        self._lock = threading.Lock()
+
+    def __call__(self, event: StateEvent) -> None:
+        """Acumula o evento; o primeiro evento do quadro agenda a entrega."""
+        with self._lock:
+            if self._key is not None:
+                key = self._key(event)
+                # Reinsere no fim: o lote mantém a ordem da última mudança
+                self._pending.pop(key, None)
+            else:
+                key = self._sequence
+                self._sequence += 1
+            self._pending[key] = event
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self.schedule(self._flush)
+
+    def _flush(self) -> None:
+        """Entrega todos os eventos acumulados desde o agendamento."""
+        with self._lock:
+            events = list(self._pending.values())
+            self._pending.clear()
+            self._scheduled = False
+        if events:
+            self.deliver(events)
+
+
+def latest_per_character(event: StateEvent) -> Hashable:
+    """Chave de agrupamento: último evento de cada tipo para cada personagem."""
+    return type(event), event.char_id
+
+
+# Barramento padrão do processo, usado pelos motores quando nenhum é injetado
+default_bus = EventBus()
@@ -0,0 +1,180 @@
+"""
+Módulo de Evolução por Experiência (Experience Pass)
+====================================================
+
+Este módulo compõe a camada de regras dinâmicas do motor Abraxas.
+Ele executa a rolagem de evolução de fim de sessão do BRP: toda perícia marcada
+com `experience_check` rola 1d100 contra o seu valor total e, se o resultado
+for MAIOR que o valor (falha), a perícia evolui 1D6 pontos.
+
+Em vez de um `get_skill_total` por linha (várias consultas por perícia), o
+passe é um pipeline orientado a conjuntos:
+
+    1. Uma única consulta lê, em blocos, todas as linhas marcadas junto com as
+       características do personagem.
+    2. Os valores totais são avaliados bloco a bloco, com as fórmulas base já
+       compiladas pelo livro de regras compartilhado, e os d100/1D6 de cada
+       bloco são sorteados de uma só vez.
+    3. Os ganhos, as marcas zeradas e as linhas de auditoria são gravados com
+       `executemany` em uma única transação.
+
+Na auditoria, cada rolagem é gravada com o seu nível de sucesso real (o d100
+contra o total); a evolução fica no nome da ação: 'EXP_<perícia>' para as
+verificações sem ganho e 'EXP_UP_<perícia>' para as perícias que evoluíram.
+
+Dependências:
+    - time: Para a medição do tempo do passe.
+    - src.database.connection: Para a transação única do passe.
+    - src.mechanics.dice_engine: Para a conexão, o cache de estado e a auditoria.
+    - src.mechanics.dice_roller: Para o sorteio em lote dos dados.
+    - src.mechanics.rulebook: Para as fórmulas base já compiladas (via `SkillEngine.rules`).
+
+Padrões aplicados:
+    - Set-Based Processing
+    - Unit of Work (uma transação por passe)
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from src.database.connection import transaction
+from src.mechanics.dice_engine import SkillEngine, resolve_success_level
+from src.mechanics.dice_roller import DiceRoller
+
+# Lê as perícias marcadas já com as características do dono
+_FLAGGED_SKILLS_SQL = """
+    SELECT cs.skill_id, COALESCE(cs.allocated_points, 0) AS allocated_points, c.*
+    FROM character_skills cs
+    JOIN skills s ON s.id = cs.skill_id
+    JOIN characteristics c ON c.char_id = cs.char_id
+    WHERE cs.experience_check
+"""
+
+
+@dataclass(frozen=True)
+class SkillImprovement:
+    """
+    Perícia que evoluiu no passe de experiência.
+
+    Attributes:
+        char_id (str): O personagem.
+        skill_id (str): A perícia.
+        total (int): O valor total da perícia antes da evolução.
+        roll (int): O d100 rolado (maior que `total`).
+        gain (int): Os pontos ganhos (1D6).
+    """
+
+    char_id: str
+    skill_id: str
+    total: int
+    roll: int
+    gain: int
+
+
+@dataclass
+class ExperienceReport:
+    """
+    Resumo de um passe de experiência.
+
+    Attributes:
+        checked (int): Quantidade de perícias marcadas que foram roladas.
+        improvements (List[SkillImprovement]): As perícias que evoluíram.
+        elapsed (float): Duração do passe, em segundos.
+    """
+
+    checked: int = 0
+    improvements: List[SkillImprovement] = field(default_factory=list)
+    elapsed: float = 0.0
+
+
+class ExperienceEngine:
+    """
+    Executa o passe de experiência de fim de sessão em lote.
+
+    Attributes:
+        skill_engine (SkillEngine): Fornece a conexão, o cache de estado e a auditoria.
+        roller (DiceRoller): Sorteia os d100 e os 1D6 de cada bloco de uma só vez.
+        chunk_size (int): Quantidade de linhas lidas e avaliadas por bloco.
+    """
+
+    def __init__(
+        self,
+        skill_engine: SkillEngine,
+        roller: Optional[DiceRoller] = None,
+        chunk_size: int = 10_000,
+    ) -> None:
+        """
+        Args:
+            skill_engine (SkillEngine): O motor de perícias compartilhado.
+            roller (Optional[DiceRoller]): Rolador dos dados (ex: com semente fixa).
+            chunk_size (int): Tamanho dos blocos lidos do cursor.
+        """
+        self.skill_engine = skill_engine
+        self.roller = roller or DiceRoller()
+        self.chunk_size = chunk_size
+
+    def _roll(self, expression: str, n: int) -> List[int]:
+        """Sorteia `n` rolagens de uma expressão em um único lote."""
+        rolls = self.roller.roll_many(expression, n)
+        return rolls.tolist() if hasattr(rolls, "tolist") else list(rolls)
+
+    def run_session_end(self) -> ExperienceReport:
+        """
+        Rola a evolução de todas as perícias marcadas e zera as marcas.
+
+        A leitura das marcas e a gravação dos ganhos acontecem na mesma transação,
+        de modo que nenhuma marca feita por outra conexão no meio do passe é perdida.
+
+        Returns:
+            ExperienceReport: As perícias verificadas e as que evoluíram.
+        """
+        start = time.perf_counter()
+        report = ExperienceReport()
+        connection = self.skill_engine.connection
+        audit = self.skill_engine.audit
+        audit_rows = []
+        checked = []
+
+        audit.flush()
+        with audit.exclusive(), transaction(connection):
+            # Fórmulas base compiladas uma única vez pelo livro de regras compartilhado
+            skills = self.skill_engine.rules.snapshot.skills
+            cursor = connection.execute(_FLAGGED_SKILLS_SQL)
+            # Colunas: skill_id, allocated_points, char_id, características...
+            names = [description[0].upper() for description in cursor.description[3:]]
+
+            while True:
+                rows = cursor.fetchmany(self.chunk_size)
+                if not rows:
+                    break
+
+                totals = [
+                    int(skills[row[0]].base_formula(dict(zip(names, row[3:])))) + row[1]
+                    for row in rows
+                ]
+                rolls = self._roll("1D100", len(rows))
+                gains = self._roll("1D6", len(rows))
+
+                for row, total, roll, gain in zip(rows, totals, rolls, gains):
+                    char_id, skill_id = row[2], row[0]
+                    checked.append((char_id, skill_id))
+                    action = f"EXP_{skill_id}"
+                    if roll > total:
+                        report.improvements.append(
+                            SkillImprovement(char_id, skill_id, total, roll, gain)
+                        )
+                        action = f"EXP_UP_{skill_id}"
+                    level = resolve_success_level(roll, total)
+                    audit_rows.append((char_id, action, roll, level.name))
+                report.checked += len(rows)
+
+            self.skill_engine.state.apply_skill_improvements(
+                ((item.char_id, item.skill_id, item.gain) for item in report.improvements),
+                checked,
+            )
+            audit.log_many(audit_rows)
+            audit.flush()
+
+        report.elapsed = time.perf_counter() - start
+        return report
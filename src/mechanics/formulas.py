@@ -0,0 +1,183 @@
+"""
+Módulo de Compilação de Fórmulas (Formula Compiler)
+===================================================
+
+Este módulo centraliza a avaliação das expressões matemáticas guardadas no
+banco de dados (`brp_formulas.formula` e `skills.base_formula`).
+
+Antes, cada chamada dos motores executava `eval()` sobre o texto cru da fórmula,
+o que obrigava o Python a re-interpretar e re-compilar a string a cada rolagem.
+Aqui cada fórmula é validada uma única vez (apenas aritmética sobre as siglas
+das características), compilada para uma função Python reutilizável e guardada
+em cache pelo seu texto.
+
+Dependências:
+    - ast: Para a validação estrutural da expressão antes da compilação.
+
+Padrões aplicados:
+    - Data-Driven Design (as regras continuam vivendo no banco)
+    - Flyweight (uma única instância compilada por texto de fórmula)
+"""
+
+import ast
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Mapping, Tuple
+
+# Siglas oficiais do BRP, na mesma grafia usada nas fórmulas do banco.
+CHARACTERISTIC_NAMES: Tuple[str, ...] = ("STR", "CON", "SIZ", "INT", "POW", "DEX", "APP")
+
+
+class CompiledFormula:
+    """
+    Fórmula validada e compilada em uma função Python reutilizável.
+
+    A função gerada recebe as características por nome, de modo que a mesma
+    instância serve tanto para um único personagem (valores `int`) quanto para
+    colunas inteiras de personagens (ex: arrays NumPy).
+
+    Attributes:
+        source (str): O texto original da fórmula (ex: '(CON + SIZ) / 2').
+        variables (FrozenSet[str]): As siglas de características usadas na fórmula.
+    """
+
+    __slots__ = ("source", "variables", "_function")
+
+    def __init__(
+        self, source: str, variables: FrozenSet[str], function: Callable[..., Any]
+    ) -> None:
+        self.source = source
+        self.variables = variables
+        self._function = function
+
+    def __call__(self, characteristics: Mapping[str, Any]) -> Any:
+        """
+        Avalia a fórmula com as características informadas.
+
+        Args:
+            characteristics (Mapping[str, Any]): Siglas em maiúsculas e seus valores
+                                                 (ex: {'CON': 14, 'SIZ': 12}).
+
+        Returns:
+            Any: O resultado bruto da expressão, sem arredondamentos.
+        """
+        return self._function(**characteristics)
+
+    def __repr__(self) -> str:
+        return f"CompiledFormula({self.source!r})"
+
+
+class FormulaCompiler:
+    """
+    Validador e compilador de fórmulas com cache LRU indexado pelo texto.
+
+    Apenas números, as siglas permitidas e operadores aritméticos são aceitos.
+    Chamadas de função, atributos, índices e qualquer outra construção Python
+    são recusadas antes da compilação, eliminando o risco do `eval()` livre.
+
+    Attributes:
+        allowed_names (FrozenSet[str]): Siglas que podem aparecer nas fórmulas.
+        maxsize (int): Quantidade máxima de fórmulas mantidas em cache.
+    """
+
+    # Nós sintáticos aceitos. Subclasses podem ampliar o conjunto.
+    _ALLOWED_NODES: Tuple[type, ...] = (
+        ast.Expression,
+        ast.BinOp,
+        ast.UnaryOp,
+        ast.Constant,
+        ast.Name,
+        ast.Load,
+        ast.Add,
+        ast.Sub,
+        ast.Mult,
+        ast.Div,
+        ast.FloorDiv,
+        ast.Mod,
+        ast.UAdd,
+        ast.USub,
+    )
+
+    def __init__(
+        self, allowed_names: Iterable[str] = CHARACTERISTIC_NAMES, maxsize: int = 1024
+    ) -> None:
+        self.allowed_names = frozenset(allowed_names)
+        self.maxsize = maxsize
+        self._cache: "OrderedDict[str, CompiledFormula]" = OrderedDict()
+
+    def compile(self, source: str) -> CompiledFormula:
+        """
+        Retorna a versão compilada de uma fórmula, compilando-a apenas na primeira vez.
+
+        Args:
+            source (str): O texto da fórmula (ex: 'DEX * 2').
+
+        Returns:
+            CompiledFormula: A fórmula pronta para ser avaliada.
+
+        Raises:
+            ValueError: Se a fórmula tiver sintaxe inválida ou construções não permitidas.
+        """
+        cached = self._cache.get(source)
+        if cached is not None:
+            self._cache.move_to_end(source)
+            return cached
+
+        compiled = self._build(source)
+        self._cache[source] = compiled
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        return compiled
+
+    def clear(self) -> None:
+        """Descarta todas as fórmulas compiladas em cache."""
+        self._cache.clear()
+
+    def _validate(self, source: str) -> Tuple[ast.Expression, FrozenSet[str]]:
+        """
+        Faz o parsing da fórmula e garante que ela contém apenas aritmética permitida.
+
+        Returns:
+            Tuple[ast.Expression, FrozenSet[str]]: A árvore sintática e as siglas usadas.
+        """
+        try:
+            tree = ast.parse(source.strip(), mode="eval")
+        except SyntaxError as exc:
+            raise ValueError(f"Fórmula '{source}' possui sintaxe inválida.") from exc
+
+        variables = set()
+        for node in ast.walk(tree):
+            if not isinstance(node, self._ALLOWED_NODES):
+                raise ValueError(
+                    f"Construção '{type(node).__name__}' não permitida na fórmula '{source}'."
+                )
+            if isinstance(node, ast.Constant) and (
+                isinstance(node.value, bool) or not isinstance(node.value, (int, float))
+            ):
+                raise ValueError(f"Constante inválida na fórmula '{source}'.")
+            if isinstance(node, ast.Name):
+                if node.id not in self.allowed_names:
+                    raise ValueError(
+                        f"Atributo desconhecido '{node.id}' na fórmula '{source}'."
+                    )
+                variables.add(node.id)
+
+        return tree, frozenset(variables)
+
+    def _build(self, source: str) -> CompiledFormula:
+        """Valida a fórmula e gera a função Python equivalente."""
+        tree, variables = self._validate(source)
+
+        # As siglas viram parâmetros nomeados; '**_' descarta as características
+        # que a fórmula não utiliza, permitindo repassar o dicionário completo.
+        params = "".join(f"{name}, " for name in sorted(variables))
+        prefix = f"*, {params}" if params else ""
+        lambda_source = f"lambda {prefix}**_: ({ast.unparse(tree.body)})"
+        function = eval(  # noqa: S307 - árvore validada acima, sem builtins
+            compile(lambda_source, f"<formula {source!r}>", "eval"),
+            {"__builtins__": {}},
+        )
+        return CompiledFormula(source, variables, function)
+
+
+# Compilador compartilhado por todos os motores do processo.
+default_compiler = FormulaCompiler()
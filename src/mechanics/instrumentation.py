@@ -0,0 +1,433 @@
+"""
+Módulo de Instrumentação dos Caminhos Críticos (Profiler)
+=========================================================
+
+Este módulo compõe a camada de diagnóstico do motor Abraxas.
+Quando uma rolagem parece lenta, ele responde para onde foi o tempo: SQL,
+avaliação de fórmulas ou commits. A instrumentação é opcional:
+
+    - Desligada: nada é instalado. Os métodos dos motores são as funções
+      originais e as conexões não têm callbacks, ou seja, custo zero.
+    - Ligada: os métodos públicos de `BRPEngine`, `SkillEngine` e `CombatEngine`
+      são envolvidos por cronômetros (`perf_counter_ns`), e as conexões
+      informadas recebem os hooks de trace e de progresso do sqlite3, que
+      contam e cronometram cada comando (inclusive COMMITs). As descargas em
+      lote do `AuditWriter` também são cronometradas (`AuditWriter._drain`):
+      elas rodam na conexão da thread de fundo, onde os hooks não chegam, e
+      incluem o COMMIT de cada lote de `roll_history`.
+
+O tempo de um comando SQL vai do seu início (hook de trace) até o início do
+próximo comando na mesma thread, o retorno do método instrumentado que o
+executou ou uma chamada a `mark_idle`; inclui, portanto, a leitura das linhas
+pelo Python. O hook de progresso soma as instruções da VM do SQLite executadas
+por cada comando.
+
+As medições são agregadas em histogramas logarítmicos por operação, exibidos
+no painel de depuração da TUI e exportáveis para JSON.
+
+Dependências:
+    - sqlite3: Para os hooks de trace e de progresso.
+    - threading: Para a agregação segura entre threads.
+
+Padrões aplicados:
+    - Decorator (cronômetros instalados e removidos em tempo de execução)
+    - Histograma logarítmico (agregação em memória constante)
+"""
+
+import functools
+import inspect
+import json
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Instruções da VM entre duas chamadas do hook de progresso
+PROGRESS_STEPS = 1_000
+
+# Quatro baldes por potência de 2 (resolução de 25%), até ~2^64 ns
+_BUCKETS = 256
+
+
+def _bucket(elapsed_ns: int) -> int:
+    """Índice do balde: expoente binário e os 2 bits seguintes ao mais significativo."""
+    if elapsed_ns < 4:
+        return max(elapsed_ns, 0)
+    bits = elapsed_ns.bit_length()
+    return min((bits - 2) * 4 + ((elapsed_ns >> (bits - 3)) & 3), _BUCKETS - 1)
+
+
+def _bucket_upper(index: int) -> int:
+    """Maior valor (em ns) que cai no balde `index`."""
+    if index < 4:
+        return index
+    bits, mantissa = index // 4 + 2, index % 4
+    return ((5 + mantissa) << (bits - 3)) - 1
+
+
+class Histogram:
+    """
+    Histograma logarítmico de latências (nanossegundos), com quatro baldes por
+    potência de 2.
+
+    Attributes:
+        count (int): Quantidade de medições.
+        total_ns (int): Soma das medições.
+        min_ns (int): Menor medição.
+        max_ns (int): Maior medição.
+    """
+
+    __slots__ = ("count", "total_ns", "min_ns", "max_ns", "buckets")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+        self.buckets = [0] * _BUCKETS
+
+    def add(self, elapsed_ns: int) -> None:
+        """Registra uma medição."""
+        if self.count == 0 or elapsed_ns < self.min_ns:
+            self.min_ns = elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.count += 1
+        self.total_ns += elapsed_ns
+        self.buckets[_bucket(elapsed_ns)] += 1
+
+    def percentile(self, fraction: float) -> int:
+        """
+        Estima um percentil pelo limite superior do balde que o contém.
+
+        Args:
+            fraction (float): O percentil desejado (ex: 0.99).
+
+        Returns:
+            int: A latência estimada em nanossegundos (limitada à maior medição).
+        """
+        if self.count == 0:
+            return 0
+        rank = fraction * self.count
+        seen = 0
+        for index, amount in enumerate(self.buckets):
+            seen += amount
+            if seen >= rank:
+                return min(_bucket_upper(index), self.max_ns)
+        return self.max_ns
+
+
+@dataclass(frozen=True)
+class OperationStats:
+    """
+    Resumo de uma operação medida.
+
+    Attributes:
+        name (str): A operação (ex: 'SkillEngine.roll_skill' ou 'sql SELECT ...').
+        count (int): Quantidade de chamadas.
+        total_ms (float): Tempo total em milissegundos.
+        mean_us (float): Latência média em microssegundos.
+        p50_us (float): Latência mediana estimada em microssegundos.
+        p99_us (float): Latência p99 estimada em microssegundos.
+        max_us (float): Maior latência em microssegundos.
+        vm_steps (int): Instruções da VM do SQLite (apenas comandos SQL).
+    """
+
+    name: str
+    count: int
+    total_ms: float
+    mean_us: float
+    p50_us: float
+    p99_us: float
+    max_us: float
+    vm_steps: int = 0
+
+
+class Profiler:
+    """
+    Agregador das medições, com um histograma por operação.
+    """
+
+    def __init__(self) -> None:
+        self._histograms: Dict[str, Histogram] = {}
+        self._vm_steps: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def record(self, name: str, elapsed_ns: int) -> None:
+        """
+        Registra a duração de uma chamada.
+
+        Args:
+            name (str): A operação.
+            elapsed_ns (int): A duração em nanossegundos.
+        """
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.add(elapsed_ns)
+
+    def add_vm_steps(self, name: str, steps: int) -> None:
+        """Soma instruções da VM do SQLite executadas por um comando."""
+        with self._lock:
+            self._vm_steps[name] = self._vm_steps.get(name, 0) + steps
+
+    def reset(self) -> None:
+        """Descarta todas as medições."""
+        with self._lock:
+            self._histograms.clear()
+            self._vm_steps.clear()
+            self.started_at = time.time()
+
+    def stats(self) -> List[OperationStats]:
+        """
+        Resume as operações medidas, da que consumiu mais tempo à que consumiu menos.
+
+        Returns:
+            List[OperationStats]: Um resumo por operação.
+        """
+        with self._lock:
+            items = [
+                (name, histogram, self._vm_steps.get(name, 0))
+                for name, histogram in self._histograms.items()
+            ]
+            summaries = [
+                OperationStats(
+                    name=name,
+                    count=histogram.count,
+                    total_ms=histogram.total_ns / 1e6,
+                    mean_us=histogram.total_ns / histogram.count / 1e3,
+                    p50_us=histogram.percentile(0.50) / 1e3,
+                    p99_us=histogram.percentile(0.99) / 1e3,
+                    max_us=histogram.max_ns / 1e3,
+                    vm_steps=steps,
+                )
+                for name, histogram, steps in items
+            ]
+        return sorted(summaries, key=lambda stats: stats.total_ms, reverse=True)
+
+    def report(self, limit: int = 20, width: int = 60) -> str:
+        """
+        Formata as operações mais custosas como uma tabela de texto.
+
+        Args:
+            limit (int): A quantidade máxima de linhas.
+            width (int): A largura máxima do nome da operação.
+
+        Returns:
+            str: A tabela pronta para exibição.
+        """
+        lines = [
+            f"{'operação':<{width}} {'chamadas':>9} {'total ms':>10} "
+            f"{'p50 µs':>9} {'p99 µs':>9} {'máx µs':>9}"
+        ]
+        for stats in self.stats()[:limit]:
+            name = stats.name if len(stats.name) <= width else stats.name[: width - 1] + "…"
+            lines.append(
+                f"{name:<{width}} {stats.count:>9,} {stats.total_ms:>10.1f} "
+                f"{stats.p50_us:>9.1f} {stats.p99_us:>9.1f} {stats.max_us:>9.1f}"
+            )
+        return "\n".join(lines)
+
+    def export(self, path: str) -> str:
+        """
+        Grava as medições em JSON.
+
+        Args:
+            path (str): O arquivo de destino.
+
+        Returns:
+            str: O próprio caminho, para encadeamento.
+        """
+        document = {
+            "started_at": self.started_at,
+            "exported_at": time.time(),
+            "operations": [asdict(stats) for stats in self.stats()],
+        }
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(document, handle, indent=2, ensure_ascii=False)
+        return path
+
+
+# Profiler padrão do processo
+default_profiler = Profiler()
+
+# --- Comandos SQL -------------------------------------------------------------
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SPACES = re.compile(r"\s+")
+
+# Comando SQL em curso em cada thread: (nome, início em ns, profiler)
+_current = threading.local()
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    Agrupa comandos que diferem apenas nos valores (o trace recebe o SQL expandido).
+
+    Args:
+        statement (str): O comando como recebido pelo hook de trace.
+
+    Returns:
+        str: O comando com literais trocados por '?' e espaços colapsados.
+    """
+    return _SPACES.sub(" ", _LITERALS.sub("?", statement)).strip()
+
+
+def mark_idle() -> None:
+    """
+    Encerra a medição do comando SQL em curso na thread atual.
+
+    Para pontos de entrada fora dos motores (ex: consultas da TUI executadas pela
+    `AsyncEngine`), em que nenhum método cronometrado marca o fim do comando.
+    """
+    _close_statement(time.perf_counter_ns())
+
+
+def _close_statement(now: int) -> None:
+    """Encerra a medição do comando em curso na thread atual."""
+    open_statement = getattr(_current, "statement", None)
+    if open_statement is not None:
+        name, start, profiler = open_statement
+        _current.statement = None
+        profiler.record(name, now - start)
+
+
+class SqlTracer:
+    """
+    Hooks de trace e de progresso instalados em uma conexão.
+
+    Attributes:
+        connection (sqlite3.Connection): A conexão observada.
+        profiler (Profiler): O destino das medições.
+    """
+
+    def __init__(self, connection: sqlite3.Connection, profiler: Profiler) -> None:
+        self.connection = connection
+        self.profiler = profiler
+
+    def install(self) -> None:
+        """Instala os hooks (na thread dona da conexão)."""
+        self.connection.set_trace_callback(self._on_statement)
+        self.connection.set_progress_handler(self._on_progress, PROGRESS_STEPS)
+
+    def uninstall(self) -> None:
+        """Remove os hooks e encerra a medição em curso."""
+        self.connection.set_trace_callback(None)
+        self.connection.set_progress_handler(None, PROGRESS_STEPS)
+        _close_statement(time.perf_counter_ns())
+
+    def _on_statement(self, statement: str) -> None:
+        now = time.perf_counter_ns()
+        _close_statement(now)
+        _current.statement = (f"sql {normalize_sql(statement)}", now, self.profiler)
+
+    def _on_progress(self) -> int:
+        open_statement = getattr(_current, "statement", None)
+        if open_statement is not None:
+            self.profiler.add_vm_steps(open_statement[0], PROGRESS_STEPS)
+        return 0  # 0 = continuar a execução
+
+
+# --- Métodos dos motores ------------------------------------------------------
+
+_patched: Dict[Tuple[type, str], Callable] = {}
+_tracers: Dict[int, SqlTracer] = {}
+_state_lock = threading.Lock()
+
+
+def _timed(function: Callable, name: str, profiler: Profiler) -> Callable:
+    """Envolve `function` com um cronômetro."""
+    clock = time.perf_counter_ns
+    record = profiler.record
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = clock()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            end = clock()
+            _close_statement(end)
+            record(name, end - start)
+
+    return wrapper
+
+
+def _background_methods() -> Tuple[Tuple[type, str], ...]:
+    from src.database.audit import AuditWriter
+
+    return ((AuditWriter, "_drain"),)
+
+
+def _engine_classes() -> Tuple[type, ...]:
+    from src.mechanics.combat_engine import CombatEngine
+    from src.mechanics.dice_engine import SkillEngine
+    from src.mechanics.engine import BRPEngine
+
+    return BRPEngine, SkillEngine, CombatEngine
+
+
+def is_enabled() -> bool:
+    """Indica se os cronômetros dos motores estão instalados."""
+    return bool(_patched)
+
+
+def enable(
+    connections: Iterable[sqlite3.Connection] = (),
+    profiler: Profiler = default_profiler,
+    classes: Optional[Iterable[type]] = None,
+) -> Profiler:
+    """
+    Liga a instrumentação (chamadas repetidas apenas adicionam conexões).
+
+    Args:
+        connections (Iterable[sqlite3.Connection]): Conexões cujos comandos serão
+            medidos. Cada uma deve ser passada pela thread que a utiliza.
+        profiler (Profiler): O destino das medições.
+        classes (Optional[Iterable[type]]): As classes cujos métodos públicos
+            serão cronometrados. Por padrão, os três motores e as descargas do
+            `AuditWriter`.
+
+    Returns:
+        Profiler: O profiler em uso.
+    """
+    with _state_lock:
+        methods = []
+        for cls in classes if classes is not None else _engine_classes():
+            for name, attribute in vars(cls).items():
+                if not name.startswith("_") and inspect.isfunction(attribute):
+                    methods.append((cls, name))
+        if classes is None:
+            methods.extend(_background_methods())
+
+        for cls, name in methods:
+            if (cls, name) in _patched:
+                continue
+            attribute = vars(cls)[name]
+            _patched[(cls, name)] = attribute
+            setattr(cls, name, _timed(attribute, f"{cls.__name__}.{name}", profiler))
+
+        for connection in connections:
+            if id(connection) not in _tracers:
+                tracer = SqlTracer(connection, profiler)
+                tracer.install()
+                _tracers[id(connection)] = tracer
+    return profiler
+
+
+def disable() -> None:
+    """
+    Desliga a instrumentação, restaurando os métodos originais e removendo os
+    hooks. Deve ser chamada pela thread dona das conexões instrumentadas.
+    """
+    with _state_lock:
+        for (cls, name), original in _patched.items():
+            setattr(cls, name, original)
+        _patched.clear()
+        for tracer in _tracers.values():
+            tracer.uninstall()
+        _tracers.clear()
@@ -0,0 +1,266 @@
+"""
+Módulo de Inventário e Carga (Inventory Engine)
+===============================================
+
+Este módulo compõe a camada de Regras de Negócio do motor Abraxas.
+Ele gerencia os itens carregados por cada personagem (equipamento, consumíveis
+e munição) e a carga (ENC) resultante:
+
+    - Agregado incremental: a carga carregada fica em `character_encumbrance` e é
+      mantida pelos triggers de `character_inventory`; cada inclusão, retirada ou
+      consumo soma apenas a sua diferença. Nenhuma verificação executa SUM.
+    - Munição: a quantidade é a própria linha (personagem, cartucho) do
+      inventário, lida e decrementada pela chave primária.
+    - Limite de carga: a fórmula 'CARRY_LIMIT' de `brp_formulas`, servida pelo
+      cache de valores derivados (recalculada apenas quando STR muda).
+
+As escritas usam `transaction` e participam da transação já aberta na conexão:
+o gasto de munição de um ataque é gravado junto com o dano (ver
+`CombatEngine.attack`) e, em um round, junto com todos os golpes.
+
+Dependências:
+    - src.database.connection: Para a conexão compartilhada e as transações.
+    - src.mechanics.rulebook: Para o catálogo de itens e a munição das armas.
+    - src.mechanics.derived: Para o limite de carga (fórmula derivada).
+
+Padrões aplicados:
+    - Data-Driven Design (catálogo e limite de carga definidos no banco)
+    - Materialized Aggregate (carga mantida por triggers)
+"""
+
+import math
+import sqlite3
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from src.database.connection import get_connection, transaction
+from src.mechanics.derived import DerivedStateCache, get_derived_cache
+from src.mechanics.rulebook import Rulebook, get_rulebook
+from src.mechanics.state import CharacterStateStore, get_state_store
+
+# Nome da fórmula de `brp_formulas` que define a carga máxima sem penalidade
+CARRY_LIMIT = "CARRY_LIMIT"
+
+
+@dataclass(frozen=True)
+class Encumbrance:
+    """
+    Carga atual de um personagem frente ao seu limite.
+
+    Attributes:
+        carried (float): A soma de ENC dos itens carregados.
+        limit (int): A carga máxima sem penalidade (fórmula 'CARRY_LIMIT').
+    """
+
+    carried: float
+    limit: int
+
+    @property
+    def overloaded(self) -> bool:
+        """Indica se o personagem carrega mais do que o limite."""
+        return self.carried > self.limit
+
+
+class InventoryEngine:
+    """
+    Motor Lógico do inventário e da carga dos personagens.
+
+    Attributes:
+        connection (sqlite3.Connection): Conexão ativa com o banco de dados SQLite.
+        state (CharacterStateStore): Cache write-through do estado dos personagens.
+        rules (Rulebook): Livro de regras em memória (catálogo de itens e munição).
+        derived (DerivedStateCache): Valores derivados (limite de carga).
+    """
+
+    def __init__(
+        self,
+        db_path: str = "abraxas.db",
+        connection: Optional[sqlite3.Connection] = None,
+        state_store: Optional[CharacterStateStore] = None,
+        rulebook: Optional[Rulebook] = None,
+        derived_cache: Optional[DerivedStateCache] = None,
+    ) -> None:
+        """
+        Args:
+            db_path (str): O caminho para o arquivo do banco de dados SQLite.
+            connection (Optional[sqlite3.Connection]): Conexão já aberta a ser
+                compartilhada. Se omitida, usa a conexão da thread atual.
+            state_store (Optional[CharacterStateStore]): Cache de estado dos personagens.
+                Se omitido, usa o cache compartilhado pelos motores da mesma conexão.
+            rulebook (Optional[Rulebook]): Livro de regras em memória. Se omitido, usa
+                o livro compartilhado pelos motores da mesma conexão.
+            derived_cache (Optional[DerivedStateCache]): Cache de valores derivados.
+                Se omitido, usa o cache compartilhado pelos motores da mesma conexão.
+        """
+        self.connection = get_connection(db_path, connection)
+        self.state = state_store or get_state_store(self.connection)
+        self.rules = rulebook or get_rulebook(self.connection)
+        self.derived = derived_cache or get_derived_cache(
+            self.connection, state_store, rulebook
+        )
+
+    def quantity(self, char_id: str, item_id: str) -> int:
+        """Quantidade de um item carregada pelo personagem (0 se não tiver)."""
+        row = self.connection.execute(
+            "SELECT quantity FROM character_inventory WHERE char_id = ? AND item_id = ?",
+            (char_id, item_id),
+        ).fetchone()
+        return row[0] if row else 0
+
+    def items(self, char_id: str) -> Dict[str, int]:
+        """
+        Lista o inventário do personagem.
+
+        Args:
+            char_id (str): O identificador do personagem.
+
+        Returns:
+            Dict[str, int]: Ids dos itens e quantidades carregadas.
+        """
+        return dict(
+            self.connection.execute(
+                "SELECT item_id, quantity FROM character_inventory WHERE char_id = ?",
+                (char_id,),
+            )
+        )
+
+    def add_item(self, char_id: str, item_id: str, quantity: int = 1) -> int:
+        """
+        Adiciona unidades de um item ao inventário.
+
+        Args:
+            char_id (str): O identificador do personagem.
+            item_id (str): O item do catálogo.
+            quantity (int): Unidades adicionadas.
+
+        Returns:
+            int: A nova quantidade do item.
+
+        Raises:
+            ValueError: Se o item não existir no catálogo ou a quantidade não for positiva.
+        """
+        self.rules.snapshot.item(item_id)
+        if quantity <= 0:
+            raise ValueError(f"Quantidade inválida de '{item_id}': {quantity}.")
+        with transaction(self.connection):
+            self.connection.execute(
+                """
+                INSERT INTO character_inventory (char_id, item_id, quantity) VALUES (?, ?, ?)
+                ON CONFLICT(char_id, item_id) DO UPDATE SET quantity = quantity + excluded.quantity
+                """,
+                (char_id, item_id, quantity),
+            )
+            return self.quantity(char_id, item_id)
+
+    def remove_item(self, char_id: str, item_id: str, quantity: int = 1) -> int:
+        """
+        Retira unidades de um item do inventário (a linha some ao chegar a zero).
+
+        Args:
+            char_id (str): O identificador do personagem.
+            item_id (str): O item retirado.
+            quantity (int): Unidades retiradas.
+
+        Returns:
+            int: A quantidade restante do item.
+
+        Raises:
+            ValueError: Se a quantidade não for positiva ou o personagem não tiver
+                unidades suficientes (nada é alterado).
+        """
+        if quantity <= 0:
+            raise ValueError(f"Quantidade inválida de '{item_id}': {quantity}.")
+        with transaction(self.connection):
+            updated = self.connection.execute(
+                """
+                UPDATE character_inventory SET quantity = quantity - ?
+                WHERE char_id = ? AND item_id = ? AND quantity > ?
+                """,
+                (quantity, char_id, item_id, quantity),
+            ).rowcount
+            if updated:
+                return self.quantity(char_id, item_id)
+            removed = self.connection.execute(
+                """
+                DELETE FROM character_inventory
+                WHERE char_id = ? AND item_id = ? AND quantity = ?
+                """,
+                (char_id, item_id, quantity),
+            ).rowcount
+        if not removed:
+            raise ValueError(f"Personagem '{char_id}' não possui {quantity}x '{item_id}'.")
+        return 0
+
+    def consume(self, char_id: str, item_id: str, quantity: int = 1) -> int:
+        """
+        Gasta unidades de um consumível ou de munição.
+
+        Raises:
+            ValueError: Se o item não for consumível nem munição, ou faltarem unidades.
+        """
+        if self.rules.snapshot.item(item_id).kind not in ("CONSUMABLE", "AMMO"):
+            raise ValueError(f"Item '{item_id}' não é consumível.")
+        return self.remove_item(char_id, item_id, quantity)
+
+    def carried(self, char_id: str) -> float:
+        """A carga (ENC) carregada, lida do agregado mantido pelos triggers."""
+        row = self.connection.execute(
+            "SELECT carried_enc FROM character_encumbrance WHERE char_id = ?", (char_id,)
+        ).fetchone()
+        # Somas de frações acumulam resíduos de ponto flutuante
+        return round(row[0], 6) if row else 0.0
+
+    def carry_limit(self, char_id: str) -> int:
+        """
+        A carga máxima sem penalidade (fórmula 'CARRY_LIMIT', truncada).
+
+        Raises:
+            ValueError: Se a fórmula não existir ou o personagem não tiver atributos.
+        """
+        return math.floor(self.derived.formula_value(char_id, CARRY_LIMIT))
+
+    def encumbrance(self, char_id: str) -> Encumbrance:
+        """Carga carregada e limite do personagem (ver `Encumbrance.overloaded`)."""
+        return Encumbrance(self.carried(char_id), self.carry_limit(char_id))
+
+    def ammunition(self, char_id: str) -> Optional[int]:
+        """
+        Munição disponível para a arma equipada.
+
+        Returns:
+            Optional[int]: As unidades do cartucho da arma (None se ela não usa munição).
+        """
+        weapon_id, _ = self.state.loadout(char_id)
+        rule = self.rules.snapshot.ammunition_for(weapon_id)
+        return self.quantity(char_id, rule.ammo_id) if rule is not None else None
+
+    def can_attack(self, char_id: str) -> bool:
+        """Indica se a arma equipada tem munição para um ataque (sempre, se não usa)."""
+        weapon_id, _ = self.state.loadout(char_id)
+        rule = self.rules.snapshot.ammunition_for(weapon_id)
+        return rule is None or self.quantity(char_id, rule.ammo_id) >= rule.rounds_per_attack
+
+    def spend_ammunition(self, char_id: str) -> int:
+        """
+        Gasta a munição de um ataque com a arma equipada.
+
+        Participa da transação aberta pelo chamador: dentro de `CombatEngine.attack`
+        ou de um round, o decremento é gravado junto com o dano.
+
+        Returns:
+            int: As unidades gastas (0 se a arma não usa munição).
+
+        Raises:
+            ValueError: Se faltar munição.
+        """
+        weapon_id, _ = self.state.loadout(char_id)
+        rule = self.rules.snapshot.ammunition_for(weapon_id)
+        if rule is None:
+            return 0
+        try:
+            self.remove_item(char_id, rule.ammo_id, rule.rounds_per_attack)
+        except ValueError:
+            raise ValueError(
+                f"Personagem '{char_id}' está sem munição para '{weapon_id}'."
+            ) from None
+        return rule.rounds_per_attack
@@ -0,0 +1,533 @@
+"""
+Módulo da Camada Narrativa (Narrative Graph Engine)
+===================================================
+
+Este módulo compõe a camada de Regras de Negócio da literatura ergódica do
+Abraxas: nós de texto ligados por escolhas, algumas delas bloqueadas por
+atributos e itens do personagem.
+
+    - Grafo: os nós e as suas escolhas de saída são lidos pelo índice do nó de
+      origem e guardados em um cache LRU; roteiros com dezenas de milhares de nós
+      nunca são carregados inteiros.
+    - Passagens: o texto longo fica em `narrative_passages` e só é lido na
+      transição (pelo mmap do SQLite configurado na conexão), sem ficar em memória.
+    - Condições: compiladas uma única vez pelo `ConditionCompiler`, uma extensão
+      do compilador de `brp_formulas` com comparações e operadores lógicos; o
+      vocabulário é o mesmo das fórmulas (STR, DEX...) mais os ids dos itens.
+    - Reavaliação: o veredito de cada escolha é guardado com os valores que
+      usou; só é recalculado quando muda uma característica ou item do qual a
+      condição depende.
+
+Dependências:
+    - json: Para enviar listas de nós em um único parâmetro (json_each).
+    - src.mechanics.formulas: Para a validação e compilação das condições.
+    - src.mechanics.rulebook: Para o catálogo de itens.
+    - src.mechanics.state: Para as características do personagem.
+    - src.mechanics.inventory: Para as quantidades de itens carregadas.
+
+Padrões aplicados:
+    - Lazy Loading (passagens lidas sob demanda)
+    - Flyweight (uma condição compilada por texto)
+    - Memoization com dependências (vereditos por valores usados)
+"""
+
+import ast
+import json
+import sqlite3
+import threading
+import weakref
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from src.database.connection import get_connection, transaction
+from src.mechanics.formulas import CHARACTERISTIC_NAMES, CompiledFormula, FormulaCompiler
+from src.mechanics.inventory import InventoryEngine
+from src.mechanics.rulebook import Rulebook, RuleSnapshot, get_rulebook
+from src.mechanics.state import CharacterStateStore, get_state_store
+
+
+class ConditionCompiler(FormulaCompiler):
+    """
+    Compilador das condições de desbloqueio das escolhas.
+
+    Aceita tudo o que as fórmulas aceitam, mais comparações (`<`, `>=`, `==`...)
+    e operadores lógicos (`and`, `or`, `not`). Além das siglas das
+    características, os ids dos itens do catálogo podem aparecer como variáveis
+    e valem a quantidade possuída (ex: 'STR >= 12 and WPN_BROADSWORD').
+    """
+
+    _ALLOWED_NODES = FormulaCompiler._ALLOWED_NODES + (
+        ast.Compare,
+        ast.Eq,
+        ast.NotEq,
+        ast.Lt,
+        ast.LtE,
+        ast.Gt,
+        ast.GtE,
+        ast.BoolOp,
+        ast.And,
+        ast.Or,
+        ast.Not,
+    )
+
+    def __init__(self, item_names: Iterable[str] = (), maxsize: int = 4096) -> None:
+        super().__init__(CHARACTERISTIC_NAMES + tuple(item_names), maxsize)
+
+
+def item_catalog(snapshot: RuleSnapshot) -> FrozenSet[str]:
+    """Os ids de itens que as condições podem citar (catálogo, armas e armaduras)."""
+    return frozenset(snapshot.items).union(snapshot.weapons, snapshot.armors)
+
+
+@dataclass(frozen=True)
+class Choice:
+    """
+    Escolha de saída de um nó.
+
+    Attributes:
+        choice_id (int): O identificador da escolha.
+        from_node (str): O nó de origem.
+        to_node (str): O nó de destino.
+        label (str): O texto exibido.
+        condition (Optional[CompiledFormula]): A condição compilada (None = livre).
+        names (Tuple[str, ...]): As características e itens citados pela condição.
+    """
+
+    choice_id: int
+    from_node: str
+    to_node: str
+    label: str
+    condition: Optional[CompiledFormula] = None
+    names: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class NarrativeNode:
+    """
+    Nó do grafo, sem o texto da passagem (ver `NarrativeGraph.passage`).
+
+    Attributes:
+        node_id (str): O identificador do nó.
+        script_id (str): O roteiro do nó.
+        title (str): O título exibido.
+        choices (Tuple[Choice, ...]): As escolhas de saída, em ordem de exibição.
+    """
+
+    node_id: str
+    script_id: str
+    title: str
+    choices: Tuple[Choice, ...]
+
+
+def _read_narrative_revision(connection: sqlite3.Connection) -> object:
+    """Lê a revisão 'narrative'; sem a tabela, devolve um marcador sempre novo."""
+    try:
+        row = connection.execute(
+            "SELECT revision FROM cache_revisions WHERE scope = 'narrative'"
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return object()
+    return row[0] if row else object()
+
+
+class NarrativeGraph:
+    """
+    Cache LRU dos nós do grafo narrativo, com as condições já compiladas.
+
+    Attributes:
+        connection (sqlite3.Connection): Conexão usada nas leituras.
+        rules (Rulebook): A origem do catálogo de itens.
+        maxsize (int): Quantidade máxima de nós mantidos em memória.
+    """
+
+    def __init__(self, connection: sqlite3.Connection, rules: Rulebook, maxsize: int = 4096) -> None:
+        self.connection = connection
+        self.rules = rules
+        self.maxsize = maxsize
+        self._nodes: "OrderedDict[str, NarrativeNode]" = OrderedDict()
+        self._compiler: Optional[ConditionCompiler] = None
+        self._snapshot: Optional[RuleSnapshot] = None
+        self._data_version: Optional[int] = None
+        self._revision: object = None
+        self._lock = threading.RLock()
+
+    def _sync(self) -> None:
+        """Descarta os nós se os roteiros ou o catálogo de itens mudaram."""
+        snapshot = self.rules.snapshot
+        if snapshot is not self._snapshot:
+            self._snapshot = snapshot
+            self._compiler = ConditionCompiler(item_catalog(snapshot))
+            self._nodes.clear()
+        version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._data_version:
+            self._data_version = version
+            revision = _read_narrative_revision(self.connection)
+            if revision != self._revision:
+                self._nodes.clear()
+                self._revision = revision
+
+    @property
+    def compiler(self) -> ConditionCompiler:
+        """O compilador de condições do catálogo de itens atual."""
+        with self._lock:
+            self._sync()
+            return self._compiler
+
+    def clear(self) -> None:
+        """Descarta os nós em memória (ex: após importar um roteiro pela própria conexão)."""
+        with self._lock:
+            self._nodes.clear()
+            self._revision = None
+            self._data_version = None
+
+    def _load(self, node_id: str) -> NarrativeNode:
+        row = self.connection.execute(
+            "SELECT script_id, title FROM narrative_nodes WHERE node_id = ?", (node_id,)
+        ).fetchone()
+        if row is None:
+            raise ValueError(f"Nó narrativo '{node_id}' não encontrado.")
+
+        choices = []
+        for choice_id, to_node, label, source in self.connection.execute(
+            """
+            SELECT choice_id, to_node, label, condition FROM narrative_choices
+            WHERE from_node = ?
+            ORDER BY position, choice_id
+            """,
+            (node_id,),
+        ):
+            condition = self._compiler.compile(source) if source else None
+            names = tuple(sorted(condition.variables)) if condition is not None else ()
+            choices.append(Choice(choice_id, node_id, to_node, label, condition, names))
+        return NarrativeNode(node_id, row[0], row[1], tuple(choices))
+
+    def node(self, node_id: str) -> NarrativeNode:
+        """
+        Retorna um nó com as suas escolhas de saída.
+
+        Args:
+            node_id (str): O identificador do nó.
+
+        Returns:
+            NarrativeNode: O nó, com as condições já compiladas.
+
+        Raises:
+            ValueError: Se o nó não existir ou alguma condição for inválida.
+        """
+        with self._lock:
+            self._sync()
+            node = self._nodes.get(node_id)
+            if node is not None:
+                self._nodes.move_to_end(node_id)
+                return node
+            node = self._nodes[node_id] = self._load(node_id)
+            if len(self._nodes) > self.maxsize:
+                self._nodes.popitem(last=False)
+            return node
+
+    def passage(self, node_id: str) -> str:
+        """
+        Lê o texto da passagem de um nó (sob demanda, sem cache).
+
+        Args:
+            node_id (str): O identificador do nó.
+
+        Returns:
+            str: O texto (vazio se o nó não tiver passagem).
+        """
+        row = self.connection.execute(
+            "SELECT body FROM narrative_passages WHERE node_id = ?", (node_id,)
+        ).fetchone()
+        return row[0] if row else ""
+
+
+# Valores fracos: a entrada some junto com o último motor que usa o grafo
+_graphs: "weakref.WeakValueDictionary[int, NarrativeGraph]" = weakref.WeakValueDictionary()
+_graphs_lock = threading.Lock()
+
+
+def get_narrative_graph(connection: sqlite3.Connection) -> NarrativeGraph:
+    """
+    Retorna o grafo narrativo compartilhado pelos motores de uma conexão.
+
+    Args:
+        connection (sqlite3.Connection): A conexão usada pelos motores.
+
+    Returns:
+        NarrativeGraph: O grafo associado à conexão.
+    """
+    with _graphs_lock:
+        graph = _graphs.get(id(connection))
+        if graph is None or graph.connection is not connection:
+            graph = _graphs[id(connection)] = NarrativeGraph(connection, get_rulebook(connection))
+        return graph
+
+
+def import_script(
+    connection: sqlite3.Connection,
+    script_id: str,
+    nodes: Iterable[Tuple[str, str, str]],
+    choices: Iterable[Tuple[str, str, str, Optional[str]]],
+    compiler: Optional[ConditionCompiler] = None,
+) -> Tuple[int, int]:
+    """
+    Importa (ou substitui) um roteiro em uma única transação.
+
+    Todas as condições são validadas antes da gravação: um roteiro com uma
+    condição inválida não é importado pela metade. Na substituição, os nós do
+    roteiro ausentes da nova versão são removidos, junto com as suas passagens
+    e as escolhas que saem deles ou levam a eles (inclusive de outros roteiros).
+
+    Args:
+        connection (sqlite3.Connection): A conexão com o banco.
+        script_id (str): O identificador do roteiro.
+        nodes (Iterable[Tuple[str, str, str]]): Tuplas (node_id, título, passagem).
+        choices (Iterable[Tuple[str, str, str, Optional[str]]]): Tuplas (origem,
+            destino, texto, condição); a ordem define a posição em cada nó.
+        compiler (Optional[ConditionCompiler]): Compilador das condições. Se omitido,
+            usa o do grafo compartilhado da conexão (catálogo de itens atual).
+
+    Returns:
+        Tuple[int, int]: A quantidade de nós e de escolhas gravados.
+
+    Raises:
+        ValueError: Se alguma condição for inválida, ou se algum personagem estiver
+            posicionado em um nó que a nova versão remove (nada é alterado).
+    """
+    compiler = compiler or get_narrative_graph(connection).compiler
+    nodes = list(nodes)
+    kept = {node_id for node_id, _, _ in nodes}
+    positions: Counter = Counter()
+    rows = []
+    for from_node, to_node, label, condition in choices:
+        if condition:
+            compiler.compile(condition)
+        rows.append((from_node, to_node, positions[from_node], label, condition or None))
+        positions[from_node] += 1
+
+    with transaction(connection):
+        removed = json.dumps([
+            row[0]
+            for row in connection.execute(
+                "SELECT node_id FROM narrative_nodes WHERE script_id = ?", (script_id,)
+            )
+            if row[0] not in kept
+        ])
+        stranded = connection.execute(
+            """
+            SELECT char_id, node_id FROM character_narrative
+            WHERE node_id IN (SELECT value FROM json_each(?))
+            """,
+            (removed,),
+        ).fetchall()
+        if stranded:
+            where = ", ".join(f"'{char_id}' em '{node_id}'" for char_id, node_id in stranded)
+            raise ValueError(f"O roteiro '{script_id}' remove nós onde há personagens: {where}.")
+        connection.execute(
+            """
+            DELETE FROM narrative_choices
+            WHERE from_node IN (SELECT node_id FROM narrative_nodes WHERE script_id = ?)
+               OR to_node IN (SELECT value FROM json_each(?))
+            """,
+            (script_id, removed),
+        )
+        connection.execute(
+            "DELETE FROM narrative_passages WHERE node_id IN (SELECT value FROM json_each(?))",
+            (removed,),
+        )
+        connection.execute(
+            "DELETE FROM narrative_nodes WHERE node_id IN (SELECT value FROM json_each(?))",
+            (removed,),
+        )
+        connection.executemany(
+            """
+            INSERT INTO narrative_nodes (node_id, script_id, title) VALUES (?, ?, ?)
+            ON CONFLICT(node_id) DO UPDATE SET
+                script_id = excluded.script_id, title = excluded.title
+            """,
+            ((node_id, script_id, title) for node_id, title, _ in nodes),
+        )
+        connection.executemany(
+            "INSERT OR REPLACE INTO narrative_passages (node_id, body) VALUES (?, ?)",
+            ((node_id, body) for node_id, _, body in nodes),
+        )
+        connection.executemany(
+            """
+            INSERT INTO narrative_choices (from_node, to_node, position, label, condition)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            rows,
+        )
+    get_narrative_graph(connection).clear()
+    return len(nodes), len(rows)
+
+
+class NarrativeEngine:
+    """
+    Motor de navegação do personagem pelo grafo narrativo.
+
+    Attributes:
+        connection (sqlite3.Connection): Conexão ativa com o banco de dados SQLite.
+        state (CharacterStateStore): Cache write-through do estado dos personagens.
+        graph (NarrativeGraph): Os nós em memória, com as condições compiladas.
+        inventory (InventoryEngine): Os itens carregados (vocabulário das condições).
+        evaluations (Counter): Avaliações de condição por escolha (choice_id).
+    """
+
+    def __init__(
+        self,
+        db_path: str = "abraxas.db",
+        connection: Optional[sqlite3.Connection] = None,
+        state_store: Optional[CharacterStateStore] = None,
+        graph: Optional[NarrativeGraph] = None,
+        inventory: Optional[InventoryEngine] = None,
+        maxsize: int = 100_000,
+    ) -> None:
+        """
+        Args:
+            db_path (str): O caminho para o arquivo do banco de dados SQLite.
+            connection (Optional[sqlite3.Connection]): Conexão já aberta a ser
+                compartilhada. Se omitida, usa a conexão da thread atual.
+            state_store (Optional[CharacterStateStore]): Cache de estado dos personagens.
+                Se omitido, usa o cache compartilhado pelos motores da mesma conexão.
+            graph (Optional[NarrativeGraph]): Grafo em memória. Se omitido, usa o
+                grafo compartilhado pelos motores da mesma conexão.
+            inventory (Optional[InventoryEngine]): Motor de inventário. Se omitido, é
+                criado sobre a mesma conexão e cache de estado.
+            maxsize (int): Quantidade máxima de vereditos (personagem, escolha) guardados.
+        """
+        self.connection = get_connection(db_path, connection)
+        self.state = state_store or get_state_store(self.connection)
+        self.graph = graph or get_narrative_graph(self.connection)
+        self.inventory = inventory or InventoryEngine(
+            connection=self.connection, state_store=self.state, rulebook=self.graph.rules
+        )
+        self.maxsize = maxsize
+        self.evaluations: Counter = Counter()
+        # (char_id, choice_id) -> (condição, valores usados, veredito)
+        self._verdicts: "OrderedDict[Tuple[str, int], Tuple[CompiledFormula, Tuple, bool]]" = (
+            OrderedDict()
+        )
+
+    def held_items(self, char_id: str) -> Dict[str, int]:
+        """
+        Quantidade de cada item possuído pelo personagem (vocabulário das condições).
+
+        Args:
+            char_id (str): O identificador do personagem.
+
+        Returns:
+            Dict[str, int]: Ids dos itens e quantidades (itens ausentes valem 0).
+        """
+        return self.inventory.items(char_id)
+
+    def _is_available(
+        self, char_id: str, choice: Choice, characteristics: Dict[str, int], items: Dict[str, int]
+    ) -> bool:
+        """Veredito da condição, reavaliada só se um valor do qual ela depende mudou."""
+        condition = choice.condition
+        if condition is None:
+            return True
+        arguments = {
+            name: characteristics[name] if name in characteristics else items.get(name, 0)
+            for name in choice.names
+        }
+        basis = tuple(arguments.values())
+        key = (char_id, choice.choice_id)
+        cached = self._verdicts.get(key)
+        if cached is not None and cached[0] is condition and cached[1] == basis:
+            self._verdicts.move_to_end(key)
+            return cached[2]
+
+        verdict = bool(condition(arguments))
+        self.evaluations[choice.choice_id] += 1
+        self._verdicts[key] = (condition, basis, verdict)
+        if len(self._verdicts) > self.maxsize:
+            self._verdicts.popitem(last=False)
+        return verdict
+
+    def position(self, char_id: str) -> Optional[str]:
+        """O nó atual do personagem (None se ele ainda não entrou em um roteiro)."""
+        row = self.connection.execute(
+            "SELECT node_id FROM character_narrative WHERE char_id = ?", (char_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _move(self, char_id: str, node_id: str) -> None:
+        with transaction(self.connection):
+            self.connection.execute(
+                """
+                INSERT INTO character_narrative (char_id, node_id) VALUES (?, ?)
+                ON CONFLICT(char_id) DO UPDATE SET
+                    node_id = excluded.node_id, updated_at = CURRENT_TIMESTAMP
+                """,
+                (char_id, node_id),
+            )
+
+    def start(self, char_id: str, node_id: str) -> NarrativeNode:
+        """
+        Posiciona o personagem em um nó (ex: início de um capítulo).
+
+        Raises:
+            ValueError: Se o nó não existir.
+        """
+        node = self.graph.node(node_id)
+        self._move(char_id, node_id)
+        return node
+
+    def choices(self, char_id: str, node_id: Optional[str] = None) -> List[Tuple[Choice, bool]]:
+        """
+        Lista as escolhas de um nó e se cada uma está desbloqueada para o personagem.
+
+        Args:
+            char_id (str): O identificador do personagem.
+            node_id (Optional[str]): O nó consultado. Se omitido, o nó atual.
+
+        Returns:
+            List[Tuple[Choice, bool]]: As escolhas, em ordem, com o seu veredito.
+
+        Raises:
+            ValueError: Se o personagem não estiver em nenhum nó ou o nó não existir.
+        """
+        node_id = node_id or self.position(char_id)
+        if node_id is None:
+            raise ValueError(f"Personagem '{char_id}' não está em nenhum nó narrativo.")
+        node = self.graph.node(node_id)
+        characteristics = self.state.characteristics(char_id)
+        items = self.held_items(char_id)
+        return [
+            (choice, self._is_available(char_id, choice, characteristics, items))
+            for choice in node.choices
+        ]
+
+    def available_choices(self, char_id: str, node_id: Optional[str] = None) -> List[Choice]:
+        """Apenas as escolhas desbloqueadas (ver `choices`)."""
+        return [choice for choice, available in self.choices(char_id, node_id) if available]
+
+    def choose(self, char_id: str, choice_id: int) -> NarrativeNode:
+        """
+        Segue uma escolha do nó atual e grava a nova posição do personagem.
+
+        Args:
+            char_id (str): O identificador do personagem.
+            choice_id (int): A escolha feita.
+
+        Returns:
+            NarrativeNode: O nó de destino (o texto é lido com `passage`).
+
+        Raises:
+            ValueError: Se a escolha não sair do nó atual ou estiver bloqueada.
+        """
+        for choice, available in self.choices(char_id):
+            if choice.choice_id == choice_id:
+                if not available:
+                    raise ValueError(f"Escolha '{choice.label}' bloqueada para '{char_id}'.")
+                node = self.graph.node(choice.to_node)
+                self._move(char_id, node.node_id)
+                return node
+        raise ValueError(f"Escolha {choice_id} não disponível no nó atual de '{char_id}'.")
+
+    def passage(self, node_id: str) -> str:
+        """O texto da passagem de um nó, lido sob demanda."""
+        return self.graph.passage(node_id)
@@ -0,0 +1,242 @@
+"""
+Módulo de Probabilidades Exatas (Odds Analytics)
+================================================
+
+Este módulo calcula, sem amostragem, as distribuições de probabilidade das
+rolagens do motor Abraxas, para balanceamento de encontros e para exibir
+chances ao vivo na TUI.
+
+    - Dano: a distribuição de uma expressão de `calculate_raw_damage`
+      (ex: '1D8+1+1D4') é obtida convoluindo as distribuições uniformes de cada
+      dado, e a mitigação da armadura (`armors.armor_points`) é aplicada sobre ela
+      com a mesma regra de `CombatEngine.apply_damage` (dano mínimo 0).
+    - Perícias: as chances de FAILURE/SUCCESS/SPECIAL_SUCCESS de um `roll_skill`
+      são contadas sobre as 100 faces do d100 com `resolve_success_level`, a
+      mesma função usada na rolagem real.
+
+Os resultados são memorizados por expressão. Dados repetidos (ex: '10D6') são
+combinados por exponenciação binária de convoluções, e com NumPy disponível as
+convoluções usam `numpy.convolve`.
+
+Dependências:
+    - functools: Para a memorização das distribuições por expressão.
+    - numpy (opcional): Para as convoluções vetorizadas.
+
+Padrões aplicados:
+    - Memoization
+    - Reutilização das regras do motor (nenhuma regra duplicada aqui)
+"""
+
+from functools import lru_cache
+from itertools import accumulate
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, List, Mapping, Sequence, Tuple
+
+from src.mechanics.dice_engine import SuccessLevel, resolve_success_level
+from src.mechanics.dice_roller import parse_expression
+
+if TYPE_CHECKING:
+    from src.mechanics.combat_engine import CombatEngine
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional (extra "perf"); há fallback em Python puro
+    np = None
+
+
+class Distribution:
+    """
+    Distribuição de probabilidade discreta sobre um intervalo de inteiros.
+
+    Attributes:
+        offset (int): O menor valor com probabilidade registrada.
+        pmf (Tuple[float, ...]): Probabilidades de `offset`, `offset + 1`, ...
+    """
+
+    __slots__ = ("offset", "pmf", "_cdf")
+
+    def __init__(self, offset: int, pmf: Sequence[float]) -> None:
+        self.offset = offset
+        self.pmf = tuple(float(p) for p in pmf)
+        self._cdf = None
+
+    @property
+    def minimum(self) -> int:
+        """O menor valor possível."""
+        return self.offset
+
+    @property
+    def maximum(self) -> int:
+        """O maior valor possível."""
+        return self.offset + len(self.pmf) - 1
+
+    @property
+    def cdf(self) -> Tuple[float, ...]:
+        """Probabilidades acumuladas P(X <= v) para cada valor do intervalo."""
+        if self._cdf is None:
+            self._cdf = tuple(accumulate(self.pmf))
+        return self._cdf
+
+    @property
+    def expected_value(self) -> float:
+        """A média (valor esperado) da distribuição."""
+        return sum((self.offset + i) * p for i, p in enumerate(self.pmf))
+
+    def probability(self, value: int) -> float:
+        """Retorna P(X == value)."""
+        index = value - self.offset
+        return self.pmf[index] if 0 <= index < len(self.pmf) else 0.0
+
+    def at_most(self, value: int) -> float:
+        """Retorna P(X <= value)."""
+        index = value - self.offset
+        if index < 0:
+            return 0.0
+        return self.cdf[min(index, len(self.pmf) - 1)]
+
+    def at_least(self, value: int) -> float:
+        """Retorna P(X >= value)."""
+        return 1.0 - self.at_most(value - 1)
+
+    def as_dict(self) -> Dict[int, float]:
+        """Converte a distribuição em um dicionário {valor: probabilidade}."""
+        return {self.offset + i: p for i, p in enumerate(self.pmf) if p}
+
+    def __repr__(self) -> str:
+        return (
+            f"Distribution({self.minimum}..{self.maximum}, "
+            f"E={self.expected_value:.3f})"
+        )
+
+
+def _convolve(left: Sequence[float], right: Sequence[float]) -> Sequence[float]:
+    """Convolução discreta de duas distribuições (soma de variáveis independentes)."""
+    if np is not None:
+        return np.convolve(left, right)
+
+    result = [0.0] * (len(left) + len(right) - 1)
+    for i, p in enumerate(left):
+        if p:
+            for j, q in enumerate(right):
+                result[i + j] += p * q
+    return result
+
+
+@lru_cache(maxsize=256)
+def _dice_pmf(count: int, sides: int) -> Tuple[float, ...]:
+    """
+    Distribuição da soma de `count` dados de `sides` faces (deslocada: índice 0 = `count`).
+
+    Usa exponenciação binária: '16D6' custa 4 convoluções ao invés de 15.
+    """
+    single: Sequence[float] = [1.0 / sides] * sides
+    result: Sequence[float] = [1.0]
+    power = single
+    remaining = count
+    while remaining:
+        if remaining & 1:
+            result = _convolve(result, power)
+        remaining >>= 1
+        if remaining:
+            power = _convolve(power, power)
+    return tuple(float(p) for p in result)
+
+
+@lru_cache(maxsize=1024)
+def dice_distribution(expression: str) -> Distribution:
+    """
+    Calcula a distribuição exata de uma expressão de dados.
+
+    Args:
+        expression (str): A expressão (ex: '1D8+1+1D4', '1D6-1D4').
+
+    Returns:
+        Distribution: A distribuição do resultado bruto da expressão.
+
+    Raises:
+        ValueError: Se a expressão for inválida.
+    """
+    compiled = parse_expression(expression)
+    pmf: Sequence[float] = [1.0]
+    offset = compiled.constant
+
+    for sign, count, sides in compiled.dice:
+        term = _dice_pmf(count, sides)
+        if sign > 0:
+            offset += count
+        else:
+            # Um termo negativo é a distribuição espelhada: -count*sides .. -count
+            term = term[::-1]
+            offset -= count * sides
+        pmf = _convolve(pmf, term)
+
+    return Distribution(offset, pmf)
+
+
+@lru_cache(maxsize=4096)
+def damage_distribution(expression: str, armor_points: int = 0) -> Distribution:
+    """
+    Calcula a distribuição exata do dano sofrido após a mitigação da armadura.
+
+    Segue a regra de `CombatEngine.apply_damage`: dano = max(0, rolado - AP).
+
+    Args:
+        expression (str): A expressão de dano (retorno de `calculate_raw_damage`).
+        armor_points (int): Os pontos de armadura do alvo.
+
+    Returns:
+        Distribution: A distribuição do dano efetivamente sofrido (mínimo 0).
+    """
+    raw = dice_distribution(expression)
+    shifted_offset = raw.offset - armor_points
+    if shifted_offset >= 0:
+        return Distribution(shifted_offset, raw.pmf)
+
+    # Os índices 0..cut resultam em dano <= 0: toda essa massa é absorvida em 0
+    cut = -shifted_offset
+    mitigated: List[float] = [sum(raw.pmf[: cut + 1])]
+    mitigated.extend(raw.pmf[cut + 1 :])
+    return Distribution(0, mitigated)
+
+
+def attack_damage_odds(combat_engine: "CombatEngine", attacker_id: str, target_id: str) -> Distribution:
+    """
+    Distribuição exata do dano de um ataque entre dois personagens do banco.
+
+    Args:
+        combat_engine (CombatEngine): Motor usado para ler a expressão de dano do
+                                      atacante e a armadura do alvo.
+        attacker_id (str): O identificador do personagem atacante.
+        target_id (str): O identificador do personagem alvo.
+
+    Returns:
+        Distribution: A distribuição do dano sofrido pelo alvo após a armadura.
+    """
+    expression = combat_engine.calculate_raw_damage(attacker_id)
+    return damage_distribution(expression, combat_engine.get_armor_points(target_id))
+
+
+@lru_cache(maxsize=512)
+def skill_outcome_probabilities(total_skill: int) -> Mapping[SuccessLevel, float]:
+    """
+    Calcula as chances exatas de cada nível de sucesso de um `roll_skill`.
+
+    Args:
+        total_skill (int): A chance percentual final da perícia (`get_skill_total`).
+
+    Returns:
+        Mapping[SuccessLevel, float]: A probabilidade de cada `SuccessLevel`
+            (somente leitura: o resultado é memorizado e compartilhado).
+    """
+    counts = {level: 0 for level in SuccessLevel}
+    for roll in range(1, 101):
+        counts[resolve_success_level(roll, total_skill)] += 1
+    return MappingProxyType({level: count / 100 for level, count in counts.items()})
+
+
+def clear_cache() -> None:
+    """Descarta todas as distribuições memorizadas (ex: após editar as regras)."""
+    _dice_pmf.cache_clear()
+    dice_distribution.cache_clear()
+    damage_distribution.cache_clear()
+    skill_outcome_probabilities.cache_clear()
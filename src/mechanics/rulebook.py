@@ -0,0 +1,403 @@
+"""
+Módulo do Livro de Regras em Memória (Rulebook)
+===============================================
+
+Este módulo compõe a camada de regras do motor Abraxas.
+Ele carrega de uma só vez as tabelas estáticas de regras (`damage_bonus_rules`,
+`weapons`, `armors`, `items`, `weapon_ammunition`, `skills` e `brp_formulas`)
+para estruturas de consulta O(1),
+para que os motores não executem um SELECT (ou um BETWEEN) a cada golpe.
+
+    - Bônus de dano: a tabela de faixas vira um vetor denso indexado por STR+SIZ.
+    - Armas, armaduras, itens e perícias: dicionários somente-leitura indexados pelo id.
+    - Fórmulas: já validadas e compiladas pelo `FormulaCompiler`.
+
+Cada carga produz um `RuleSnapshot` imutável. Quando as tabelas de regras são
+editadas (homebrew), a revisão 'rules' de `cache_revisions` muda e um novo
+snapshot é montado e trocado atomicamente; quem já segura o snapshot anterior
+termina a operação com regras consistentes.
+
+Dependências:
+    - sqlite3: Para a leitura das tabelas de regras.
+    - src.mechanics.formulas: Para a compilação das fórmulas de perícias e atributos.
+
+Padrões aplicados:
+    - Immutable Snapshot (Copy-on-Reload)
+    - Lookup Table (vetor denso para as faixas de bônus de dano)
+"""
+
+import sqlite3
+import threading
+import weakref
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+
+from src.mechanics.formulas import CompiledFormula, FormulaCompiler, default_compiler
+
+# Modificador usado quando STR+SIZ não está coberto por nenhuma faixa da tabela
+NO_DAMAGE_BONUS = "+0"
+
+
+@dataclass(frozen=True)
+class WeaponRule:
+    """
+    Linha da tabela `weapons`.
+
+    Attributes:
+        id (str): Identificador da arma (ex: 'WPN_BROADSWORD').
+        name (str): Nome de exibição.
+        base_damage (str): Expressão de dano base (ex: '1D8+1').
+        applies_damage_bonus (bool): Se o bônus de dano do atacante é somado.
+    """
+
+    id: str
+    name: str
+    base_damage: str
+    applies_damage_bonus: bool
+
+
+@dataclass(frozen=True)
+class ArmorRule:
+    """
+    Linha da tabela `armors`.
+
+    Attributes:
+        id (str): Identificador da armadura (ex: 'ARM_HARD_LEATHER').
+        name (str): Nome de exibição.
+        armor_points (int): Pontos de armadura (mitigação direta de dano).
+    """
+
+    id: str
+    name: str
+    armor_points: int
+
+
+@dataclass(frozen=True)
+class ItemRule:
+    """
+    Linha da tabela `items` (catálogo do inventário).
+
+    Attributes:
+        id (str): Identificador do item (ex: 'AMMO_9MM').
+        name (str): Nome de exibição.
+        kind (str): Categoria ('GEAR', 'WEAPON', 'ARMOR', 'CONSUMABLE' ou 'AMMO').
+        enc (float): Carga (ENC) de uma unidade.
+    """
+
+    id: str
+    name: str
+    kind: str
+    enc: float
+
+
+@dataclass(frozen=True)
+class AmmunitionRule:
+    """
+    Linha da tabela `weapon_ammunition`.
+
+    Attributes:
+        weapon_id (str): A arma que dispara (ex: 'WPN_PISTOL_9MM').
+        ammo_id (str): O item consumido a cada ataque (ex: 'AMMO_9MM').
+        rounds_per_attack (int): Unidades gastas por ataque.
+    """
+
+    weapon_id: str
+    ammo_id: str
+    rounds_per_attack: int
+
+
+@dataclass(frozen=True)
+class SkillRule:
+    """
+    Linha da tabela `skills`, com a fórmula base já compilada.
+
+    Attributes:
+        id (str): Identificador da perícia (ex: 'SKL_DODGE').
+        name (str): Nome de exibição.
+        base_formula (CompiledFormula): A fórmula base (ex: 'DEX * 2').
+    """
+
+    id: str
+    name: str
+    base_formula: CompiledFormula
+
+
+class RuleSnapshot:
+    """
+    Cópia imutável das tabelas de regras em um dado momento.
+
+    Attributes:
+        revision (Optional[int]): Revisão 'rules' de `cache_revisions` na carga.
+        weapons (Mapping[str, WeaponRule]): Armas indexadas pelo id.
+        armors (Mapping[str, ArmorRule]): Armaduras indexadas pelo id.
+        items (Mapping[str, ItemRule]): Itens do inventário indexados pelo id.
+        ammunition (Mapping[str, AmmunitionRule]): Munição por id de arma.
+        skills (Mapping[str, SkillRule]): Perícias indexadas pelo id.
+        formulas (Mapping[str, CompiledFormula]): Fórmulas de `brp_formulas` pelo nome.
+    """
+
+    __slots__ = (
+        "revision", "weapons", "armors", "items", "ammunition", "skills", "formulas",
+        "_damage_bonus",
+    )
+
+    def __init__(
+        self,
+        revision: Optional[int],
+        damage_bonus: Tuple[str, ...],
+        weapons: Dict[str, WeaponRule],
+        armors: Dict[str, ArmorRule],
+        skills: Dict[str, SkillRule],
+        formulas: Dict[str, CompiledFormula],
+        items: Optional[Dict[str, ItemRule]] = None,
+        ammunition: Optional[Dict[str, AmmunitionRule]] = None,
+    ) -> None:
+        self.revision = revision
+        self._damage_bonus = damage_bonus
+        self.weapons: Mapping[str, WeaponRule] = MappingProxyType(weapons)
+        self.armors: Mapping[str, ArmorRule] = MappingProxyType(armors)
+        self.items: Mapping[str, ItemRule] = MappingProxyType(items or {})
+        self.ammunition: Mapping[str, AmmunitionRule] = MappingProxyType(ammunition or {})
+        self.skills: Mapping[str, SkillRule] = MappingProxyType(skills)
+        self.formulas: Mapping[str, CompiledFormula] = MappingProxyType(formulas)
+
+    @classmethod
+    def load(
+        cls, connection: sqlite3.Connection, compiler: Optional[FormulaCompiler] = None
+    ) -> "RuleSnapshot":
+        """
+        Lê todas as tabelas de regras e monta um novo snapshot.
+
+        A leitura acontece dentro de uma única transação de leitura, de modo que o
+        snapshot nunca mistura regras de antes e depois de uma edição concorrente.
+
+        Args:
+            connection (sqlite3.Connection): A conexão usada na leitura.
+            compiler (Optional[FormulaCompiler]): Compilador das fórmulas. Se omitido,
+                usa o compilador padrão do módulo `formulas`.
+
+        Returns:
+            RuleSnapshot: O snapshot carregado.
+
+        Raises:
+            ValueError: Se alguma fórmula de perícia ou atributo for inválida.
+        """
+        compiler = compiler or default_compiler
+        own_transaction = not connection.in_transaction
+        if own_transaction:
+            connection.execute("BEGIN")
+        try:
+            revision = _read_rules_revision(connection)
+            ranges = connection.execute(
+                "SELECT min_stat, max_stat, dice_modifier FROM damage_bonus_rules"
+            ).fetchall()
+            weapons = {
+                row[0]: WeaponRule(row[0], row[1], row[2], bool(row[3]))
+                for row in connection.execute(
+                    "SELECT id, name, base_damage, applies_damage_bonus FROM weapons"
+                )
+            }
+            armors = {
+                row[0]: ArmorRule(row[0], row[1], row[2])
+                for row in connection.execute("SELECT id, name, armor_points FROM armors")
+            }
+            items, ammunition = _read_inventory_rules(connection)
+            skills = {
+                row[0]: SkillRule(row[0], row[1], compiler.compile(row[2]))
+                for row in connection.execute("SELECT id, name, base_formula FROM skills")
+            }
+            formulas = {
+                row[0]: compiler.compile(row[1])
+                for row in connection.execute("SELECT stat_name, formula FROM brp_formulas")
+            }
+        finally:
+            if own_transaction:
+                connection.rollback()
+
+        # Vetor denso: a posição STR+SIZ guarda o modificador da faixa que a contém
+        size = max((row[1] for row in ranges), default=-1) + 1
+        damage_bonus = [NO_DAMAGE_BONUS] * max(size, 0)
+        for min_stat, max_stat, modifier in ranges:
+            for stat_sum in range(max(min_stat, 0), max_stat + 1):
+                damage_bonus[stat_sum] = modifier
+
+        return cls(
+            revision, tuple(damage_bonus), weapons, armors, skills, formulas, items, ammunition
+        )
+
+    def damage_bonus(self, stat_sum: int) -> str:
+        """
+        Retorna o modificador de dano para uma soma STR+SIZ.
+
+        Args:
+            stat_sum (int): A soma de STR e SIZ do personagem.
+
+        Returns:
+            str: O modificador em formato de dado (ex: '-1D6', '+0', '+1D4').
+        """
+        if 0 <= stat_sum < len(self._damage_bonus):
+            return self._damage_bonus[stat_sum]
+        return NO_DAMAGE_BONUS
+
+    def weapon(self, weapon_id: Optional[str]) -> Optional[WeaponRule]:
+        """Retorna a arma pelo id (None se desarmado ou se a arma não existir)."""
+        return self.weapons.get(weapon_id) if weapon_id is not None else None
+
+    def armor_points(self, armor_id: Optional[str]) -> int:
+        """Retorna os pontos de armadura pelo id (0 se não houver armadura)."""
+        armor = self.armors.get(armor_id) if armor_id is not None else None
+        return armor.armor_points if armor else 0
+
+    def item(self, item_id: str) -> ItemRule:
+        """
+        Retorna o item do catálogo pelo id.
+
+        Raises:
+            ValueError: Se o item não estiver cadastrado na tabela `items`.
+        """
+        rule = self.items.get(item_id)
+        if rule is None:
+            raise ValueError(f"Item '{item_id}' não cadastrado no catálogo.")
+        return rule
+
+    def ammunition_for(self, weapon_id: Optional[str]) -> Optional[AmmunitionRule]:
+        """Retorna a munição gasta pela arma (None se ela não usa munição)."""
+        return self.ammunition.get(weapon_id) if weapon_id is not None else None
+
+    def skill(self, skill_id: str) -> SkillRule:
+        """
+        Retorna a perícia pelo id.
+
+        Raises:
+            ValueError: Se a perícia não estiver cadastrada na tabela `skills`.
+        """
+        rule = self.skills.get(skill_id)
+        if rule is None:
+            raise ValueError(f"Perícia '{skill_id}' não configurada no banco.")
+        return rule
+
+    def formula(self, stat_name: str) -> CompiledFormula:
+        """
+        Retorna a fórmula compilada de uma estatística derivada.
+
+        Raises:
+            ValueError: Se a fórmula não existir na tabela `brp_formulas`.
+        """
+        compiled = self.formulas.get(stat_name)
+        if compiled is None:
+            raise ValueError(f"Fórmula para '{stat_name}' não definida no banco.")
+        return compiled
+
+
+def _read_rules_revision(connection: sqlite3.Connection) -> Optional[int]:
+    """Lê a revisão 'rules' (None em bancos sem a tabela `cache_revisions`)."""
+    try:
+        row = connection.execute(
+            "SELECT revision FROM cache_revisions WHERE scope = 'rules'"
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
+
+def _read_inventory_rules(
+    connection: sqlite3.Connection,
+) -> Tuple[Dict[str, ItemRule], Dict[str, AmmunitionRule]]:
+    """Lê o catálogo de itens e a munição (vazios em bancos sem as tabelas de inventário)."""
+    try:
+        items = {
+            row[0]: ItemRule(row[0], row[1], row[2], row[3])
+            for row in connection.execute("SELECT id, name, kind, enc FROM items")
+        }
+        ammunition = {
+            row[0]: AmmunitionRule(row[0], row[1], row[2])
+            for row in connection.execute(
+                "SELECT weapon_id, ammo_id, rounds_per_attack FROM weapon_ammunition"
+            )
+        }
+    except sqlite3.OperationalError:
+        return {}, {}
+    return items, ammunition
+
+
+class Rulebook:
+    """
+    Mantém o snapshot de regras vigente de uma conexão e o recarrega quando preciso.
+
+    A verificação de mudança é barata: o `PRAGMA data_version` (gravações de outras
+    conexões) e o `total_changes` (gravações da própria conexão) só disparam a
+    leitura da revisão 'rules' quando algo foi gravado; o snapshot só é remontado
+    se essa revisão mudou.
+
+    Attributes:
+        connection (sqlite3.Connection): Conexão usada nas leituras.
+        compiler (FormulaCompiler): Compilador das fórmulas de perícias e atributos.
+    """
+
+    def __init__(
+        self, connection: sqlite3.Connection, compiler: Optional[FormulaCompiler] = None
+    ) -> None:
+        self.connection = connection
+        self.compiler = compiler or default_compiler
+        self._snapshot: Optional[RuleSnapshot] = None
+        self._marker: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def snapshot(self) -> RuleSnapshot:
+        """
+        O snapshot vigente. Chamadores devem lê-lo uma vez por operação e usar
+        a mesma referência até o fim, para não misturar duas versões das regras.
+        """
+        marker = (
+            self.connection.execute("PRAGMA data_version").fetchone()[0],
+            self.connection.total_changes,
+        )
+        snapshot = self._snapshot
+        if snapshot is not None and marker == self._marker:
+            return snapshot
+
+        with self._lock:
+            if self._snapshot is None or (
+                marker != self._marker
+                and _read_rules_revision(self.connection) != self._snapshot.revision
+            ):
+                # Troca atômica: a referência antiga continua válida para quem a segura
+                self._snapshot = RuleSnapshot.load(self.connection, self.compiler)
+            self._marker = marker
+            return self._snapshot
+
+    def reload(self) -> RuleSnapshot:
+        """
+        Força a remontagem do snapshot (ex: bancos sem a tabela `cache_revisions`).
+
+        Returns:
+            RuleSnapshot: O novo snapshot vigente.
+        """
+        with self._lock:
+            self._snapshot = RuleSnapshot.load(self.connection, self.compiler)
+            self._marker = None
+            return self._snapshot
+
+
+# Valores fracos: a entrada some junto com o último motor que usa o livro
+_rulebooks: "weakref.WeakValueDictionary[int, Rulebook]" = weakref.WeakValueDictionary()
+_rulebooks_lock = threading.Lock()
+
+
+def get_rulebook(connection: sqlite3.Connection) -> Rulebook:
+    """
+    Retorna o livro de regras compartilhado pelos motores de uma conexão.
+
+    Args:
+        connection (sqlite3.Connection): A conexão usada pelos motores.
+
+    Returns:
+        Rulebook: O livro de regras associado à conexão.
+    """
+    with _rulebooks_lock:
+        rulebook = _rulebooks.get(id(connection))
+        if rulebook is None or rulebook.connection is not connection:
+            rulebook = _rulebooks[id(connection)] = Rulebook(connection)
+        return rulebook
@@ -0,0 +1,325 @@
+"""
+Módulo de Simulação de Combate em Massa (Monte Carlo Simulator)
+===============================================================
+
+Este módulo roda duelos BRP inteiramente em memória para o balanceamento de
+armas e armaduras. Os combatentes são lidos do banco uma única vez (snapshot
+das características, perícias e loadout) e, a partir daí, nenhuma consulta ou
+commit acontece durante a simulação.
+
+Regras de cada round (as mesmas dos motores):
+    1. Age primeiro quem tiver maior DEX (empate: o primeiro combatente).
+    2. O atacante rola a perícia de ataque e o defensor rola a perícia de defesa
+       (Dodge); ambos são classificados com `resolve_success_level`.
+    3. O golpe acerta se o nível de sucesso do ataque superar o da defesa
+       (níveis iguais se cancelam, como nas rolagens opostas do BRP).
+    4. O dano é a expressão de `calculate_raw_damage`, mitigada pela armadura do
+       alvo como em `apply_damage` (mínimo 0). HP <= 0 encerra o duelo.
+
+Os rounds são vetorizados entre milhares de duelos simultâneos (NumPy quando
+disponível) e os lotes de duelos são distribuídos entre núcleos com um pool de
+processos.
+
+Dependências:
+    - concurrent.futures: Para o pool de processos (um lote de duelos por núcleo).
+    - numpy (opcional): Para os rounds vetorizados.
+
+Padrões aplicados:
+    - Snapshot (estado imutável lido uma única vez do banco)
+    - Map-Reduce (lotes independentes combinados em um único resultado)
+"""
+
+import math
+import os
+import sqlite3
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from src.mechanics.combat_engine import CombatEngine
+from src.mechanics.dice_engine import SkillEngine, resolve_success_level
+from src.mechanics.dice_roller import DiceRoller
+from src.mechanics.engine import BRPEngine
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional (extra "perf"); há fallback em Python puro
+    np = None
+
+
+@dataclass(frozen=True)
+class CombatantSnapshot:
+    """
+    Estado imutável de um combatente, suficiente para simular duelos sem o banco.
+
+    Attributes:
+        char_id (str): O identificador do personagem.
+        hp (int): Pontos de vida no início do duelo.
+        dex (int): Destreza, usada na ordem de ação.
+        attack_skill (int): Chance total da perícia de ataque.
+        defense_skill (int): Chance total da perícia de defesa (Dodge).
+        damage_expression (str): Expressão de dano (ex: '1D8+1+1D4').
+        armor_points (int): Pontos de armadura equipados.
+    """
+
+    char_id: str
+    hp: int
+    dex: int
+    attack_skill: int
+    defense_skill: int
+    damage_expression: str
+    armor_points: int
+
+
+@dataclass
+class SimulationResult:
+    """
+    Resultado agregado de uma rodada de duelos simulados.
+
+    Attributes:
+        duels (int): Quantidade de duelos simulados.
+        wins_a (int): Vitórias do primeiro combatente.
+        wins_b (int): Vitórias do segundo combatente.
+        draws (int): Duelos sem vencedor ao atingir o limite de rounds.
+        rounds_to_kill (Dict[int, int]): Histograma {rounds: duelos decididos}.
+        elapsed (float): Tempo total de parede em segundos.
+    """
+
+    duels: int = 0
+    wins_a: int = 0
+    wins_b: int = 0
+    draws: int = 0
+    rounds_to_kill: Dict[int, int] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def win_rate_a(self) -> float:
+        return self.wins_a / self.duels if self.duels else 0.0
+
+    @property
+    def win_rate_b(self) -> float:
+        return self.wins_b / self.duels if self.duels else 0.0
+
+    @property
+    def duels_per_second(self) -> float:
+        return self.duels / self.elapsed if self.elapsed else 0.0
+
+    def merge(self, other: "SimulationResult") -> None:
+        """Acumula o resultado de outro lote neste resultado."""
+        self.duels += other.duels
+        self.wins_a += other.wins_a
+        self.wins_b += other.wins_b
+        self.draws += other.draws
+        histogram = Counter(self.rounds_to_kill)
+        histogram.update(other.rounds_to_kill)
+        self.rounds_to_kill = dict(sorted(histogram.items()))
+
+    def summary(self) -> str:
+        """Texto legível com taxas de vitória, histograma e vazão."""
+        lines = [
+            f"Duelos: {self.duels:,} em {self.elapsed:.2f}s "
+            f"({self.duels_per_second:,.0f} duelos/s)",
+            f"Vitórias A: {self.win_rate_a:.2%} | Vitórias B: {self.win_rate_b:.2%} "
+            f"| Empates: {self.draws / self.duels if self.duels else 0:.2%}",
+            "Rounds até a queda:",
+        ]
+        lines.extend(f"  {rounds:>3}: {count:,}" for rounds, count in self.rounds_to_kill.items())
+        return "\n".join(lines)
+
+
+def snapshot_combatant(
+    char_id: str,
+    attack_skill_id: str = "SKL_BRAWL",
+    defense_skill_id: str = "SKL_DODGE",
+    db_path: str = "abraxas.db",
+    connection: Optional[sqlite3.Connection] = None,
+) -> CombatantSnapshot:
+    """
+    Lê do banco, uma única vez, tudo o que a simulação precisa de um combatente.
+
+    O HP inicial é o `current_hp` salvo em `character_state`; se o personagem ainda
+    não tiver estado inicializado, usa o MAX_HP calculado pelo `BRPEngine`.
+
+    Args:
+        char_id (str): O identificador do personagem.
+        attack_skill_id (str): A perícia rolada para atacar.
+        defense_skill_id (str): A perícia rolada para se defender.
+        db_path (str): O caminho do banco de dados.
+        connection (Optional[sqlite3.Connection]): Conexão já aberta a ser reutilizada.
+
+    Returns:
+        CombatantSnapshot: O estado imutável do combatente.
+    """
+    brp = BRPEngine(db_path, connection)
+    skills = SkillEngine(db_path, brp.connection, brp.audit)
+    combat = CombatEngine(db_path, brp.connection, brp.audit)
+
+    state = brp.connection.execute(
+        "SELECT current_hp FROM character_state WHERE char_id = ?", (char_id,)
+    ).fetchone()
+    hp = state["current_hp"] if state else brp.calculate_derived_stats(char_id)["max_hp"]
+
+    return CombatantSnapshot(
+        char_id=char_id,
+        hp=hp,
+        dex=brp._get_characteristics(char_id)["DEX"],
+        attack_skill=skills.get_skill_total(char_id, attack_skill_id),
+        defense_skill=skills.get_skill_total(char_id, defense_skill_id),
+        damage_expression=combat.calculate_raw_damage(char_id),
+        armor_points=combat.get_armor_points(char_id),
+    )
+
+
+def _thresholds(total: int) -> Tuple[int, int]:
+    """Limites (especial, sucesso) de uma perícia, idênticos a `resolve_success_level`."""
+    return math.ceil(total / 5.0), total
+
+
+def _levels(rolls, total: int):
+    """Versão vetorizada de `resolve_success_level` (0=FAILURE, 1=SUCCESS, 2=SPECIAL)."""
+    special, success = _thresholds(total)
+    return np.where(rolls <= special, 2, np.where(rolls <= success, 1, 0))
+
+
+def _simulate_chunk_vectorized(
+    first: CombatantSnapshot, second: CombatantSnapshot, duels: int, seed: Optional[int], max_rounds: int
+) -> Tuple[int, int, int, Dict[int, int]]:
+    """Simula `duels` duelos em paralelo, round a round, com arrays NumPy."""
+    roller = DiceRoller(seed)
+    hp = [np.full(duels, first.hp, dtype=np.int64), np.full(duels, second.hp, dtype=np.int64)]
+    fighters = (first, second)
+    finished_at = np.zeros(duels, dtype=np.int64)
+    winner = np.full(duels, -1, dtype=np.int64)
+    active = np.arange(duels)
+
+    for round_number in range(1, max_rounds + 1):
+        if active.size == 0:
+            break
+        alive = np.ones(active.size, dtype=bool)
+        for attacker_index in (0, 1):
+            defender_index = 1 - attacker_index
+            attacker, defender = fighters[attacker_index], fighters[defender_index]
+            size = active.size
+
+            attack = _levels(roller.roll_many("1D100", size), attacker.attack_skill)
+            defense = _levels(roller.roll_many("1D100", size), defender.defense_skill)
+            damage = np.maximum(
+                0, roller.roll_many(attacker.damage_expression, size) - defender.armor_points
+            )
+            # Só golpeia quem ainda está de pé neste round
+            hits = (attack > defense) & alive
+            defender_hp = hp[defender_index]
+            defender_hp[active] -= np.where(hits, damage, 0)
+
+            killed = alive & (defender_hp[active] <= 0)
+            winner[active[killed]] = attacker_index
+            finished_at[active[killed]] = round_number
+            alive &= ~killed
+
+        active = active[alive]
+
+    histogram = Counter(finished_at[winner >= 0].tolist())
+    wins_a = int(np.count_nonzero(winner == 0))
+    wins_b = int(np.count_nonzero(winner == 1))
+    return wins_a, wins_b, duels - wins_a - wins_b, dict(histogram)
+
+
+def _simulate_chunk_python(
+    first: CombatantSnapshot, second: CombatantSnapshot, duels: int, seed: Optional[int], max_rounds: int
+) -> Tuple[int, int, int, Dict[int, int]]:
+    """Fallback sem NumPy: os mesmos duelos, um a um."""
+    roller = DiceRoller(seed)
+    rng = roller.rng
+    fighters = (first, second)
+    wins = [0, 0]
+    histogram: Counter = Counter()
+
+    for _ in range(duels):
+        hp = [first.hp, second.hp]
+        for round_number in range(1, max_rounds + 1):
+            decided = False
+            for attacker_index in (0, 1):
+                defender_index = 1 - attacker_index
+                attacker, defender = fighters[attacker_index], fighters[defender_index]
+                attack = resolve_success_level(rng.randint(1, 100), attacker.attack_skill)
+                defense = resolve_success_level(rng.randint(1, 100), defender.defense_skill)
+                if attack.value > defense.value:
+                    damage = roller.roll(attacker.damage_expression)
+                    hp[defender_index] -= max(0, damage - defender.armor_points)
+                    if hp[defender_index] <= 0:
+                        wins[attacker_index] += 1
+                        histogram[round_number] += 1
+                        decided = True
+                        break
+            if decided:
+                break
+
+    return wins[0], wins[1], duels - wins[0] - wins[1], dict(histogram)
+
+
+def _simulate_chunk(
+    first: CombatantSnapshot, second: CombatantSnapshot, duels: int, seed: Optional[int], max_rounds: int
+) -> Tuple[int, int, int, Dict[int, int]]:
+    """Ponto de entrada de cada processo do pool."""
+    if np is not None:
+        return _simulate_chunk_vectorized(first, second, duels, seed, max_rounds)
+    return _simulate_chunk_python(first, second, duels, seed, max_rounds)
+
+
+def simulate_duels(
+    combatant_a: CombatantSnapshot,
+    combatant_b: CombatantSnapshot,
+    duels: int,
+    workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    max_rounds: int = 100,
+    chunk_size: int = 100_000,
+) -> SimulationResult:
+    """
+    Simula `duels` duelos entre dois combatentes, distribuídos entre núcleos.
+
+    Args:
+        combatant_a (CombatantSnapshot): O primeiro combatente.
+        combatant_b (CombatantSnapshot): O segundo combatente.
+        duels (int): A quantidade total de duelos.
+        workers (Optional[int]): Processos do pool. `None` usa todos os núcleos;
+                                 1 executa tudo no processo atual.
+        seed (Optional[int]): Semente para resultados reprodutíveis.
+        max_rounds (int): Limite de rounds antes de declarar empate.
+        chunk_size (int): Quantidade máxima de duelos por lote vetorizado.
+
+    Returns:
+        SimulationResult: Taxas de vitória, histograma de rounds e vazão.
+    """
+    # Quem tem mais DEX age primeiro; o resultado é devolvido na ordem original
+    swapped = combatant_b.dex > combatant_a.dex
+    first, second = (combatant_b, combatant_a) if swapped else (combatant_a, combatant_b)
+
+    workers = workers or os.cpu_count() or 1
+    chunks: List[int] = [chunk_size] * (duels // chunk_size)
+    if duels % chunk_size:
+        chunks.append(duels % chunk_size)
+    seeds = [None if seed is None else seed * 1_000_003 + index for index in range(len(chunks))]
+    arguments = [(first, second, size, chunk_seed, max_rounds) for size, chunk_seed in zip(chunks, seeds)]
+
+    start = time.perf_counter()
+    if workers == 1 or len(chunks) <= 1:
+        outcomes = [_simulate_chunk(*args) for args in arguments]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            outcomes = list(pool.map(_simulate_chunk, *zip(*arguments)))
+
+    result = SimulationResult()
+    for wins_first, wins_second, draws, histogram in outcomes:
+        wins_a, wins_b = (wins_second, wins_first) if swapped else (wins_first, wins_second)
+        result.merge(SimulationResult(wins_a + wins_b + draws, wins_a, wins_b, draws, histogram))
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+# Exemplo de uso (balanceamento headless, sem TUI):
+# taras = snapshot_combatant("001")
+# npc = snapshot_combatant("NPC_ORC", attack_skill_id="SKL_BROADSWORD")
+# print(simulate_duels(taras, npc, duels=1_000_000, seed=42).summary())
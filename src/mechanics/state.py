@@ -0,0 +1,443 @@
+"""
+Módulo de Estado em Memória dos Personagens (Character State Store)
+===================================================================
+
+Este módulo compõe a camada de gerenciamento de estado do motor Abraxas.
+Ele mantém em memória, por personagem, tudo o que os motores consultam a cada
+rolagem ou golpe: características, loadout (arma e armadura), HP/MP atuais e
+pontos alocados em perícias.
+
+    - Leitura: a primeira consulta de um personagem carrega o registro do SQLite;
+      as seguintes são respondidas pela memória.
+    - Escrita (write-through): toda mutação grava primeiro no SQLite, dentro de
+      uma `transaction()`, e só então atualiza a memória.
+    - Limite (LRU): com populações grandes de NPCs, os registros menos usados são
+      descartados ao ultrapassar `maxsize`.
+    - Histórico (event sourcing): toda mudança de HP/MP também é gravada, na
+      mesma transação, como um evento em `state_events` (ver `state_log`).
+    - Invalidação: quando o `PRAGMA data_version` indica que outra conexão gravou
+      no banco, a revisão 'state' de `cache_revisions` é comparada e o cache só é
+      descartado se características, estado, loadout ou perícias mudaram.
+
+Dependências:
+    - sqlite3: Para a leitura inicial e a escrita write-through.
+    - collections.OrderedDict: Para a política LRU.
+    - src.mechanics.events: Para publicar as mudanças de HP/MP já confirmadas.
+    - src.mechanics.state_log: Para registrar cada mudança de HP/MP no log de eventos.
+
+Padrões aplicados:
+    - Write-Through Cache
+    - Identity Map (um único registro por personagem, compartilhado pelos motores)
+"""
+
+import sqlite3
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Tuple
+
+from src.database.connection import after_commit, on_rollback, transaction
+from src.mechanics.events import (
+    EventBus,
+    HPChanged,
+    MPChanged,
+    StateEvent,
+    StateInitialized,
+    default_bus,
+)
+from src.mechanics.state_log import delta_kind, record_event, record_initializations
+
+
+@dataclass
+class CharacterRecord:
+    """
+    Estado em memória de um personagem.
+
+    Attributes:
+        char_id (str): O identificador do personagem.
+        characteristics (Dict[str, int]): Siglas em maiúsculas e seus valores.
+        weapon_id (Optional[str]): A arma equipada (None se desarmado).
+        armor_id (Optional[str]): A armadura equipada (None se sem armadura).
+        hp (Optional[int]): HP atual (None se o estado ainda não foi inicializado).
+        mp (Optional[int]): MP atual (None se o estado ainda não foi inicializado).
+        skills (Dict[str, int]): Pontos alocados por perícia (skill_id -> pontos).
+    """
+
+    char_id: str
+    characteristics: Dict[str, int]
+    weapon_id: Optional[str] = None
+    armor_id: Optional[str] = None
+    hp: Optional[int] = None
+    mp: Optional[int] = None
+    skills: Dict[str, int] = field(default_factory=dict)
+
+
+class CharacterStateStore:
+    """
+    Cache write-through e limitado (LRU) do estado dos personagens.
+
+    Os valores devolvidos (ex: o dicionário de características) são os próprios
+    objetos em cache e não devem ser alterados pelos chamadores; use os métodos
+    de mutação, que também gravam no banco.
+
+    Attributes:
+        connection (sqlite3.Connection): Conexão usada nas leituras e escritas.
+        maxsize (int): Quantidade máxima de personagens mantidos em memória.
+        events (EventBus): Barramento onde as mudanças de HP/MP são publicadas
+                           (somente após o COMMIT da escrita).
+    """
+
+    def __init__(
+        self,
+        connection: sqlite3.Connection,
+        maxsize: int = 10_000,
+        events: Optional[EventBus] = None,
+    ) -> None:
+        self.connection = connection
+        self.maxsize = maxsize
+        self.events = events or default_bus
+        self._records: "OrderedDict[str, CharacterRecord]" = OrderedDict()
+        self._data_version: Optional[int] = None
+        self._revision: object = None
+        on_rollback(connection, self.clear)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, char_id: str) -> bool:
+        return char_id in self._records
+
+    # ------------------------------------------------------------------ #
+    # Invalidação
+    # ------------------------------------------------------------------ #
+    def _read_revision(self) -> object:
+        """Lê a revisão 'state'; sem a tabela, devolve um marcador sempre novo."""
+        try:
+            row = self.connection.execute(
+                "SELECT revision FROM cache_revisions WHERE scope = 'state'"
+            ).fetchone()
+        except sqlite3.OperationalError:
+            return object()
+        return row[0] if row else object()
+
+    def _sync(self) -> None:
+        """Descarta o cache se outra conexão alterou as tabelas de estado."""
+        version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._data_version:
+            return
+        self._data_version = version
+        revision = self._read_revision()
+        if revision != self._revision:
+            self._records.clear()
+            self._revision = revision
+
+    def _bump(self, rows: int) -> None:
+        """Acompanha a revisão incrementada pelos triggers nas escritas da própria conexão."""
+        if isinstance(self._revision, int):
+            self._revision += max(rows, 0)
+
+    def clear(self) -> None:
+        """Descarta todos os registros em memória."""
+        self._records.clear()
+        self._data_version = None
+        self._revision = None
+
+    def evict(self, char_id: str) -> None:
+        """Descarta o registro de um personagem (ex: NPC que saiu de cena)."""
+        self._records.pop(char_id, None)
+
+    # ------------------------------------------------------------------ #
+    # Leitura
+    # ------------------------------------------------------------------ #
+    def _load(self, char_id: str) -> CharacterRecord:
+        """Carrega do SQLite o registro completo de um personagem."""
+        connection = self.connection
+        row = connection.execute(
+            "SELECT * FROM characteristics WHERE char_id = ?", (char_id,)
+        ).fetchone()
+        if not row:
+            raise ValueError(f"Personagem '{char_id}' não encontrado.")
+
+        record = CharacterRecord(
+            char_id,
+            {key.upper(): value for key, value in dict(row).items() if key != "char_id"},
+        )
+
+        loadout = connection.execute(
+            "SELECT equipped_weapon_id, equipped_armor_id FROM character_loadout WHERE char_id = ?",
+            (char_id,),
+        ).fetchone()
+        if loadout:
+            record.weapon_id, record.armor_id = loadout[0], loadout[1]
+
+        state = connection.execute(
+            "SELECT current_hp, current_mp FROM character_state WHERE char_id = ?",
+            (char_id,),
+        ).fetchone()
+        if state:
+            record.hp, record.mp = state[0], state[1]
+
+        record.skills = dict(
+            connection.execute(
+                "SELECT skill_id, COALESCE(allocated_points, 0) FROM character_skills WHERE char_id = ?",
+                (char_id,),
+            ).fetchall()
+        )
+        return record
+
+    def get(self, char_id: str) -> CharacterRecord:
+        """
+        Retorna o registro em memória de um personagem, carregando-o se necessário.
+
+        Args:
+            char_id (str): O identificador do personagem.
+
+        Returns:
+            CharacterRecord: O estado atual do personagem.
+
+        Raises:
+            ValueError: Se o personagem não possuir características cadastradas.
+        """
+        self._sync()
+        record = self._records.get(char_id)
+        if record is not None:
+            self._records.move_to_end(char_id)
+            return record
+
+        record = self._load(char_id)
+        self._records[char_id] = record
+        if len(self._records) > self.maxsize:
+            self._records.popitem(last=False)
+        return record
+
+    def characteristics(self, char_id: str) -> Dict[str, int]:
+        """Características do personagem (ex: {'STR': 13, 'CON': 14, ...})."""
+        return self.get(char_id).characteristics
+
+    def loadout(self, char_id: str) -> Tuple[Optional[str], Optional[str]]:
+        """Tupla (arma equipada, armadura equipada) do personagem."""
+        record = self.get(char_id)
+        return record.weapon_id, record.armor_id
+
+    def vitals(self, char_id: str) -> Tuple[Optional[int], Optional[int]]:
+        """Tupla (HP atual, MP atual) do personagem."""
+        record = self.get(char_id)
+        return record.hp, record.mp
+
+    def allocated_points(self, char_id: str, skill_id: str) -> int:
+        """Pontos alocados pelo personagem em uma perícia (0 se nenhum)."""
+        return self.get(char_id).skills.get(skill_id, 0)
+
+    # ------------------------------------------------------------------ #
+    # Escrita (write-through)
+    # ------------------------------------------------------------------ #
+    def _publish(self, event: StateEvent) -> None:
+        """Publica o evento assim que a transação da escrita for confirmada."""
+        after_commit(self.connection, lambda: self.events.publish(event))
+
+    def _cached(self, char_id: str) -> Optional[CharacterRecord]:
+        """Registro em memória, se houver, sem carregar do banco."""
+        self._sync()
+        return self._records.get(char_id)
+
+    def apply_hp_delta(self, char_id: str, delta: int) -> None:
+        """
+        Soma `delta` ao HP atual do personagem (negativo para dano).
+
+        Args:
+            char_id (str): O identificador do personagem.
+            delta (int): A variação de HP.
+        """
+        record = self._cached(char_id)
+        with transaction(self.connection):
+            cursor = self.connection.execute(
+                "UPDATE character_state SET current_hp = current_hp + ? WHERE char_id = ?",
+                (delta, char_id),
+            )
+            if cursor.rowcount:
+                record_event(self.connection, char_id, delta_kind(delta, hp=True), delta, 0)
+        self._bump(cursor.rowcount)
+        if record is not None and record.hp is not None:
+            record.hp += delta
+        if cursor.rowcount:
+            self._publish(HPChanged(char_id, self.get(char_id).hp, delta))
+
+    def apply_mp_delta(self, char_id: str, delta: int) -> None:
+        """Soma `delta` ao MP atual do personagem (negativo para gasto)."""
+        record = self._cached(char_id)
+        with transaction(self.connection):
+            cursor = self.connection.execute(
+                "UPDATE character_state SET current_mp = current_mp + ? WHERE char_id = ?",
+                (delta, char_id),
+            )
+            if cursor.rowcount:
+                record_event(self.connection, char_id, delta_kind(delta, hp=False), 0, delta)
+        self._bump(cursor.rowcount)
+        if record is not None and record.mp is not None:
+            record.mp += delta
+        if cursor.rowcount:
+            self._publish(MPChanged(char_id, self.get(char_id).mp, delta))
+
+    def set_vitals_many(self, rows: Iterable[Tuple[str, int, int]]) -> int:
+        """
+        Grava (UPSERT) o HP/MP de vários personagens com um único `executemany`.
+
+        Cada personagem recebe um evento INIT no log de estado.
+
+        Args:
+            rows (Iterable[Tuple[str, int, int]]): Tuplas (char_id, hp, mp).
+
+        Returns:
+            int: A quantidade de personagens gravados.
+        """
+        rows = list(rows)
+        self._sync()
+        with transaction(self.connection):
+            self.connection.executemany(
+                """
+                INSERT INTO character_state (char_id, current_hp, current_mp)
+                VALUES (?, ?, ?)
+                ON CONFLICT(char_id) DO UPDATE SET
+                    current_hp = excluded.current_hp,
+                    current_mp = excluded.current_mp
+                """,
+                rows,
+            )
+            record_initializations(self.connection, rows)
+        self._bump(len(rows))
+        for char_id, hp, mp in rows:
+            record = self._records.get(char_id)
+            if record is not None:
+                record.hp, record.mp = hp, mp
+            self._publish(StateInitialized(char_id, hp, mp))
+        return len(rows)
+
+    def set_vitals(self, char_id: str, hp: int, mp: int) -> None:
+        """Grava (UPSERT) o HP/MP atuais de um personagem."""
+        self.set_vitals_many([(char_id, hp, mp)])
+
+    def set_characteristic(self, char_id: str, name: str, value: int) -> None:
+        """
+        Altera uma característica (ex: dreno de STR) do personagem.
+
+        Args:
+            char_id (str): O identificador do personagem.
+            name (str): A sigla da característica (ex: 'STR').
+            value (int): O novo valor.
+
+        Raises:
+            ValueError: Se a característica não existir no personagem.
+        """
+        record = self.get(char_id)
+        key = name.upper()
+        if key not in record.characteristics:
+            raise ValueError(f"Característica '{name}' inexistente.")
+        with transaction(self.connection):
+            # O nome da coluna vem do próprio registro lido do banco (não do usuário)
+            cursor = self.connection.execute(
+                f'UPDATE characteristics SET "{key.lower()}" = ? WHERE char_id = ?',
+                (value, char_id),
+            )
+        self._bump(cursor.rowcount)
+        record.characteristics[key] = value
+
+    def set_loadout(self, char_id: str, weapon_id: Optional[str], armor_id: Optional[str]) -> None:
+        """Equipa arma e armadura (None para desequipar)."""
+        record = self._cached(char_id)
+        with transaction(self.connection):
+            self.connection.execute(
+                """
+                INSERT INTO character_loadout (char_id, equipped_weapon_id, equipped_armor_id)
+                VALUES (?, ?, ?)
+                ON CONFLICT(char_id) DO UPDATE SET
+                    equipped_weapon_id = excluded.equipped_weapon_id,
+                    equipped_armor_id = excluded.equipped_armor_id
+                """,
+                (char_id, weapon_id, armor_id),
+            )
+        self._bump(1)
+        if record is not None:
+            record.weapon_id, record.armor_id = weapon_id, armor_id
+
+    def set_allocated_points(self, char_id: str, skill_id: str, points: int) -> None:
+        """Define os pontos alocados pelo personagem em uma perícia."""
+        record = self._cached(char_id)
+        with transaction(self.connection):
+            self.connection.execute(
+                """
+                INSERT INTO character_skills (char_id, skill_id, allocated_points)
+                VALUES (?, ?, ?)
+                ON CONFLICT(char_id, skill_id) DO UPDATE SET
+                    allocated_points = excluded.allocated_points
+                """,
+                (char_id, skill_id, points),
+            )
+        self._bump(1)
+        if record is not None:
+            record.skills[skill_id] = points
+
+    def apply_skill_improvements(
+        self, rows: Iterable[Tuple[str, str, int]], checked: Iterable[Tuple[str, str]]
+    ) -> int:
+        """
+        Soma os ganhos de experiência e zera as marcas `experience_check` verificadas.
+
+        Os ganhos e as marcas das perícias que não evoluíram são gravados com um
+        `executemany` cada, na mesma transação. Apenas os pares verificados são
+        zerados: marcas de perícias que o passe não rolou (ex: personagem sem
+        características) ou feitas por outra conexão depois da leitura permanecem.
+
+        Args:
+            rows (Iterable[Tuple[str, str, int]]): Tuplas (char_id, skill_id, ganho).
+            checked (Iterable[Tuple[str, str]]): Os pares (char_id, skill_id) rolados.
+
+        Returns:
+            int: A quantidade de marcas zeradas (perícias verificadas).
+        """
+        rows = list(rows)
+        self._sync()
+        with transaction(self.connection):
+            improved = self.connection.executemany(
+                """
+                UPDATE character_skills
+                SET allocated_points = COALESCE(allocated_points, 0) + ?, experience_check = 0
+                WHERE char_id = ? AND skill_id = ?
+                """,
+                ((gain, char_id, skill_id) for char_id, skill_id, gain in rows),
+            ).rowcount
+            reset = self.connection.executemany(
+                """
+                UPDATE character_skills SET experience_check = 0
+                WHERE char_id = ? AND skill_id = ? AND experience_check
+                """,
+                checked,
+            ).rowcount
+        self._bump(improved + reset)
+        for char_id, skill_id, gain in rows:
+            record = self._records.get(char_id)
+            if record is not None:
+                record.skills[skill_id] = record.skills.get(skill_id, 0) + gain
+        return improved + reset
+
+
+# Valores fracos: a entrada some junto com o último motor que usa o cache
+_stores: "weakref.WeakValueDictionary[int, CharacterStateStore]" = weakref.WeakValueDictionary()
+_stores_lock = threading.Lock()
+
+
+def get_state_store(connection: sqlite3.Connection) -> CharacterStateStore:
+    """
+    Retorna o cache de estado compartilhado pelos motores de uma conexão.
+
+    Args:
+        connection (sqlite3.Connection): A conexão usada pelos motores.
+
+    Returns:
+        CharacterStateStore: O cache associado à conexão.
+    """
+    with _stores_lock:
+        store = _stores.get(id(connection))
+        if store is None or store.connection is not connection:
+            store = _stores[id(connection)] = CharacterStateStore(connection)
+        return store
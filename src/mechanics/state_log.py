@@ -0,0 +1,264 @@
+"""
+Módulo do Log de Eventos de Estado (Event Sourcing)
+===================================================
+
+Este módulo compõe a camada de gerenciamento de estado do motor Abraxas.
+Toda mudança de HP/MP feita pelo `CharacterStateStore` (inicialização, dano,
+cura, gasto e recuperação de MP) é gravada como um evento em `state_events`,
+na mesma transação da escrita em `character_state`:
+
+    - Reconstrução: o estado de um personagem em qualquer evento (ou instante)
+      parte do snapshot mais próximo anterior e reaplica apenas os eventos
+      seguintes. Um trigger grava um snapshot a cada 32 eventos do personagem,
+      então o custo é limitado pelos eventos desde o último snapshot.
+    - Compactação: eventos já cobertos por um snapshot podem ser descartados,
+      limitando o armazenamento; o estado continua reconstruível a partir do
+      snapshot mantido (pontos anteriores a ele deixam de ser).
+
+Escritas diretas em `character_state` que não passam pelo `CharacterStateStore`
+(ex: cargas em massa de NPCs) não geram eventos; tais personagens passam a ser
+reconstruíveis a partir da próxima inicialização.
+
+Dependências:
+    - sqlite3: Para o log, os snapshots e as consultas de reconstrução.
+    - src.database.connection: Para a transação da compactação.
+
+Padrões aplicados:
+    - Event Sourcing (log apendável + snapshots periódicos)
+"""
+
+import sqlite3
+from dataclasses import dataclass
+from enum import Enum
+from typing import Iterable, List, Optional, Tuple
+
+from src.database.connection import transaction
+
+
+class StateEventKind(Enum):
+    """Tipos de eventos de estado; o nome é gravado na coluna `kind`."""
+
+    INIT = "Inicialização"
+    DAMAGE = "Dano"
+    HEAL = "Cura"
+    MP_SPEND = "Gasto de MP"
+    MP_GAIN = "Recuperação de MP"
+
+
+@dataclass(frozen=True)
+class VitalState:
+    """
+    HP/MP de um personagem logo após um evento do log.
+
+    Attributes:
+        char_id (str): O identificador do personagem.
+        hp (int): O HP naquele ponto.
+        mp (int): O MP naquele ponto.
+        event_id (int): O último evento aplicado (0 se vier da carga inicial).
+    """
+
+    char_id: str
+    hp: int
+    mp: int
+    event_id: int
+
+
+def record_event(
+    connection: sqlite3.Connection, char_id: str, kind: StateEventKind, hp: int, mp: int
+) -> None:
+    """
+    Grava um evento no log (chamada dentro da transação da escrita de estado).
+
+    Args:
+        connection (sqlite3.Connection): A conexão da escrita.
+        char_id (str): O identificador do personagem.
+        kind (StateEventKind): O tipo do evento.
+        hp (int): HP absoluto (INIT) ou variação de HP.
+        mp (int): MP absoluto (INIT) ou variação de MP.
+    """
+    connection.execute(
+        "INSERT INTO state_events (char_id, kind, hp, mp) VALUES (?, ?, ?, ?)",
+        (char_id, kind.name, hp, mp),
+    )
+
+
+def record_initializations(
+    connection: sqlite3.Connection, rows: Iterable[Tuple[str, int, int]]
+) -> None:
+    """Grava um evento INIT por tupla (char_id, hp, mp) com um único `executemany`."""
+    connection.executemany(
+        "INSERT INTO state_events (char_id, kind, hp, mp) VALUES (?, ?, ?, ?)",
+        ((char_id, StateEventKind.INIT.name, hp, mp) for char_id, hp, mp in rows),
+    )
+
+
+def delta_kind(delta: int, hp: bool) -> StateEventKind:
+    """Classifica uma variação de HP (dano/cura) ou de MP (gasto/recuperação)."""
+    if hp:
+        return StateEventKind.DAMAGE if delta < 0 else StateEventKind.HEAL
+    return StateEventKind.MP_SPEND if delta < 0 else StateEventKind.MP_GAIN
+
+
+def _event_at(connection: sqlite3.Connection, char_id: str, as_of: str) -> int:
+    """Último evento do personagem gravado até o instante `as_of` (0 se nenhum)."""
+    row = connection.execute(
+        """
+        SELECT MAX(event_id) FROM state_events
+        WHERE char_id = ? AND created_at <= ?
+        """,
+        (char_id, as_of),
+    ).fetchone()
+    return row[0] or 0
+
+
+def rebuild_state(
+    connection: sqlite3.Connection,
+    char_id: str,
+    event_id: Optional[int] = None,
+    as_of: Optional[str] = None,
+) -> Optional[VitalState]:
+    """
+    Reconstrói o HP/MP de um personagem a partir do log.
+
+    Parte do snapshot mais recente até o ponto pedido e reaplica somente os
+    eventos seguintes (custo O(eventos desde o snapshot)).
+
+    Args:
+        connection (sqlite3.Connection): A conexão com o banco.
+        char_id (str): O identificador do personagem.
+        event_id (Optional[int]): Reconstrói o estado logo após este evento.
+        as_of (Optional[str]): Reconstrói o estado neste instante (formato do
+                               SQLite, ex: '2026-10-17 21:30:00'). Ignorado se
+                               `event_id` for informado. Sem ambos, o estado atual.
+
+    Returns:
+        Optional[VitalState]: O estado naquele ponto (None se o personagem ainda
+                              não tinha sido inicializado).
+
+    Raises:
+        ValueError: Se o ponto pedido for anterior aos eventos já compactados.
+    """
+    if event_id is None:
+        event_id = _event_at(connection, char_id, as_of) if as_of is not None else -1
+    # -1: sem limite superior (estado atual)
+    upper = event_id if event_id >= 0 else None
+
+    snapshot = connection.execute(
+        """
+        SELECT event_id, hp, mp FROM state_snapshots
+        WHERE char_id = ? AND (? IS NULL OR event_id <= ?)
+        ORDER BY event_id DESC LIMIT 1
+        """,
+        (char_id, upper, upper),
+    ).fetchone()
+
+    if snapshot is None:
+        _ensure_not_compacted(connection, char_id)
+        base, hp, mp = 0, None, None
+    else:
+        base, hp, mp = snapshot[0], snapshot[1], snapshot[2]
+
+    last = base
+    cursor = connection.execute(
+        """
+        SELECT event_id, kind, hp, mp FROM state_events
+        WHERE char_id = ? AND event_id > ? AND (? IS NULL OR event_id <= ?)
+        ORDER BY event_id
+        """,
+        (char_id, base, upper, upper),
+    )
+    for last, kind, hp_value, mp_value in cursor:
+        if kind == StateEventKind.INIT.name:
+            hp, mp = hp_value, mp_value
+        elif hp is not None:
+            hp, mp = hp + hp_value, mp + mp_value
+
+    if hp is None:
+        return None
+    return VitalState(char_id, hp, mp, last)
+
+
+def _ensure_not_compacted(connection: sqlite3.Connection, char_id: str) -> None:
+    """Falha se os eventos anteriores ao snapshot mais antigo já foram descartados."""
+    oldest = connection.execute(
+        """
+        SELECT s.event_id, EXISTS (SELECT 1 FROM state_events e WHERE e.event_id = s.event_id)
+        FROM state_snapshots s
+        WHERE s.char_id = ?
+        ORDER BY s.event_id LIMIT 1
+        """,
+        (char_id,),
+    ).fetchone()
+    # O evento do snapshot mais antigo só some quando foi dobrado por uma compactação
+    if oldest is not None and not oldest[1]:
+        raise ValueError(
+            f"Histórico de '{char_id}' compactado até o evento {oldest[0]}; "
+            "pontos anteriores não podem ser reconstruídos."
+        )
+
+
+def state_events(
+    connection: sqlite3.Connection, char_id: str, after_event_id: int = 0, limit: int = 100
+) -> List[Tuple[int, str, int, int, str]]:
+    """
+    Lista os eventos de um personagem em ordem cronológica (paginação por keyset).
+
+    Args:
+        connection (sqlite3.Connection): A conexão com o banco.
+        char_id (str): O identificador do personagem.
+        after_event_id (int): Retorna apenas eventos posteriores a este.
+        limit (int): Quantidade máxima de eventos.
+
+    Returns:
+        List[Tuple[int, str, int, int, str]]: Tuplas (event_id, kind, hp, mp, created_at).
+    """
+    return [
+        tuple(row)
+        for row in connection.execute(
+            """
+            SELECT event_id, kind, hp, mp, created_at FROM state_events
+            WHERE char_id = ? AND event_id > ?
+            ORDER BY event_id LIMIT ?
+            """,
+            (char_id, after_event_id, limit),
+        )
+    ]
+
+
+def compact_state_log(
+    connection: sqlite3.Connection, before_event_id: Optional[int] = None
+) -> int:
+    """
+    Dobra os eventos antigos nos snapshots, limitando o tamanho do log.
+
+    Para cada personagem, mantém o snapshot mais recente anterior ao corte e
+    descarta os snapshots mais antigos e todos os eventos cobertos por ele.
+    Estados posteriores ao snapshot mantido continuam reconstruíveis.
+
+    Args:
+        connection (sqlite3.Connection): A conexão com o banco (sem transação aberta
+                                         ou dentro de um bloco `transaction()`).
+        before_event_id (Optional[int]): Corte da compactação. Se omitido, compacta
+                                         até o snapshot mais recente de cada personagem.
+
+    Returns:
+        int: A quantidade de eventos descartados.
+    """
+    # Horizonte de cada personagem: o snapshot mantido (os snapshots não mudam
+    # ao apagar eventos, então o mesmo cálculo vale para as duas limpezas)
+    horizon = """
+        SELECT MAX(s.event_id) FROM state_snapshots s
+        WHERE s.char_id = {table}.char_id AND (:cut IS NULL OR s.event_id <= :cut)
+    """
+    parameters = {"cut": before_event_id}
+    with transaction(connection):
+        removed = connection.execute(
+            f"DELETE FROM state_events WHERE event_id <= ({horizon.format(table='state_events')})",
+            parameters,
+        ).rowcount
+        connection.execute(
+            "DELETE FROM state_snapshots "
+            f"WHERE event_id < ({horizon.format(table='state_snapshots')})",
+            parameters,
+        )
+    return removed
@@ -0,0 +1,5 @@
+"""Permite `python -m src.server` (ver `src.server.server`)."""
+
+from src.server.server import main
+
+main()
@@ -0,0 +1,446 @@
+"""
+Módulo do Servidor Headless Multi-Mesa (Game Server)
+====================================================
+
+Este módulo expõe as operações do `BRPEngine`, do `SkillEngine` e do
+`CombatEngine` em um socket local (TCP em localhost ou socket Unix), para várias
+mesas (campanhas) ao mesmo tempo, sem a TUI.
+
+Protocolo (JSON lines): cada linha é um pedido e recebe uma linha de resposta.
+
+    → {"id": 7, "campaign": "mesa_1", "op": "roll_skill", "args": ["001", "SKL_DODGE"]}
+    ← {"id": 7, "ok": true, "result": ["SUCCESS", 42]}
+    ← {"id": 8, "ok": false, "error": "Perícia 'X' não configurada no banco."}
+
+`args` pode ser uma lista (posicionais) ou um objeto (nomeados). As respostas de
+uma conexão podem chegar fora de ordem; o `id` as associa aos pedidos. Além das
+operações dos motores (ver `src.server.worker.OPERATIONS`), o servidor responde
+a "ping" e a "metrics" (latências por operação e profundidade das filas).
+
+Arquitetura:
+    - Front end: um Event Loop do asyncio lê e escreve as conexões.
+    - Shards: um processo de trabalho por shard; cada campanha é fixada em um
+      shard no primeiro pedido, então as escritas em um arquivo SQLite são
+      serializadas.
+      Os pedidos acumulados na fila do shard seguem em lote para o processo.
+    - Backpressure: a fila de cada shard e os pedidos em voo de cada conexão
+      são limitados; no limite, o servidor para de ler a conexão e o próprio
+      TCP segura o cliente.
+    - Métricas: latência de ponta a ponta por operação ("request <op>"), tempo
+      dentro do motor ("worker <op>") e duração dos lotes, no `Profiler` da
+      instrumentação.
+
+Dependências:
+    - asyncio: Para o front end de rede.
+    - concurrent.futures / multiprocessing: Para os processos de trabalho.
+    - src.server.worker: As operações executadas nos processos.
+    - src.mechanics.instrumentation: Para os histogramas de latência.
+
+Padrões aplicados:
+    - Reactor (front end assíncrono) + Worker Pool com afinidade
+    - Backpressure por filas limitadas
+    - Batching (lotes por ida ao processo)
+
+Uso:
+    poetry run python -m src.server [--data-dir campaigns] [--port 7878 | --socket abraxas.sock]
+        [--workers 4] [--queue-limit 1024] [--batch-limit 128] [--connection-limit 64]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import re
+import signal
+import time
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Set
+
+from src.mechanics.instrumentation import Profiler
+from src.server import worker
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7878
+
+# Pedidos aguardando na fila de cada shard antes de o front end parar de ler
+DEFAULT_QUEUE_LIMIT = 1024
+# Pedidos enviados ao processo de trabalho em uma única ida
+DEFAULT_BATCH_LIMIT = 128
+# Pedidos em voo por conexão antes de o front end parar de ler a conexão
+DEFAULT_CONNECTION_LIMIT = 64
+
+# Nome da campanha = nome do arquivo do banco (sem caminhos)
+_CAMPAIGN_NAME = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+def _error(request_id: Any, message: str) -> Dict[str, Any]:
+    """Resposta de erro do protocolo."""
+    return {"id": request_id, "ok": False, "error": message}
+
+
+@dataclass
+class _Pending:
+    """Pedido na fila de um shard, com o futuro que recebe o resultado."""
+
+    db_path: str
+    operation: str
+    arguments: worker.Arguments
+    future: "asyncio.Future[worker.Outcome]"
+
+
+class Shard:
+    """
+    Um processo de trabalho e a sua fila de pedidos.
+
+    Attributes:
+        index (int): A posição do shard.
+        queue (asyncio.Queue): Os pedidos aguardando (limitada: backpressure).
+        campaigns (Set[str]): As campanhas fixadas neste shard.
+        batch_limit (int): Pedidos enviados ao processo por ida.
+    """
+
+    def __init__(
+        self,
+        index: int,
+        metrics: Profiler,
+        queue_limit: int = DEFAULT_QUEUE_LIMIT,
+        batch_limit: int = DEFAULT_BATCH_LIMIT,
+    ) -> None:
+        self.index = index
+        self.batch_limit = batch_limit
+        self.campaigns: Set[str] = set()
+        self.queue: "asyncio.Queue[Optional[_Pending]]" = asyncio.Queue(queue_limit)
+        self._metrics = metrics
+        # spawn: o processo não herda o Event Loop nem as threads do front end
+        self._executor = ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        )
+        self._task = asyncio.create_task(self._dispatch())
+
+    async def submit(
+        self, db_path: str, operation: str, arguments: worker.Arguments
+    ) -> worker.Outcome:
+        """
+        Enfileira um pedido e aguarda o seu resultado.
+
+        Com a fila cheia, aguarda uma vaga (a conexão deixa de ser lida).
+
+        Returns:
+            worker.Outcome: (sucesso, resultado ou mensagem de erro, duração em ns).
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put(_Pending(db_path, operation, arguments, future))
+        return await future
+
+    async def _dispatch(self) -> None:
+        """Envia ao processo, um lote por vez, tudo o que estiver na fila."""
+        loop = asyncio.get_running_loop()
+        running = True
+        while running:
+            batch: List[_Pending] = []
+            item = await self.queue.get()
+            while item is not None:
+                batch.append(item)
+                if len(batch) >= self.batch_limit or self.queue.empty():
+                    break
+                item = self.queue.get_nowait()
+            # None: sentinela de `close()`, enfileirada depois dos últimos pedidos
+            running = item is not None
+            if not batch:
+                continue
+
+            start = time.perf_counter_ns()
+            try:
+                outcomes = await loop.run_in_executor(
+                    self._executor,
+                    worker.run_batch,
+                    [(item.db_path, item.operation, item.arguments) for item in batch],
+                )
+            except Exception as error:  # processo encerrado, resultado não serializável...
+                message = f"Falha no worker {self.index}: {error}"
+                for item in batch:
+                    if not item.future.done():
+                        item.future.set_result((False, message, 0))
+                continue
+            self._metrics.record(f"batch shard {self.index}", time.perf_counter_ns() - start)
+
+            for item, outcome in zip(batch, outcomes):
+                self._metrics.record(f"worker {item.operation}", outcome[2])
+                if not item.future.done():
+                    item.future.set_result(outcome)
+
+    async def close(self) -> None:
+        """Atende os pedidos já enfileirados, grava a auditoria e encerra o processo."""
+        await self.queue.put(None)
+        await self._task
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self._executor, worker.close_campaigns)
+        except BrokenExecutor:
+            pass  # o processo já morreu; não há auditoria pendente a gravar
+        self._executor.shutdown(wait=True)
+
+
+class GameServer:
+    """
+    Front end assíncrono que roteia os pedidos das mesas para os shards.
+
+    Deve ser criado dentro do Event Loop que o servirá (os shards iniciam ali
+    as suas tarefas de envio).
+
+    Attributes:
+        data_dir (str): A pasta com um banco por campanha (`<campanha>.db`).
+        shards (List[Shard]): Os processos de trabalho.
+        connection_limit (int): Pedidos em voo por conexão.
+        metrics (Profiler): As latências medidas pelo servidor.
+    """
+
+    def __init__(
+        self,
+        data_dir: str,
+        workers: Optional[int] = None,
+        queue_limit: int = DEFAULT_QUEUE_LIMIT,
+        batch_limit: int = DEFAULT_BATCH_LIMIT,
+        connection_limit: int = DEFAULT_CONNECTION_LIMIT,
+    ) -> None:
+        """
+        Args:
+            data_dir (str): A pasta dos bancos das campanhas (criada se não existir).
+            workers (Optional[int]): Quantidade de processos. Padrão: um por núcleo.
+            queue_limit (int): Pedidos aguardando por shard.
+            batch_limit (int): Pedidos por ida ao processo.
+            connection_limit (int): Pedidos em voo por conexão.
+        """
+        os.makedirs(data_dir, exist_ok=True)
+        self.data_dir = data_dir
+        self.connection_limit = connection_limit
+        self.metrics = Profiler()
+        self.shards = [
+            Shard(index, self.metrics, queue_limit, batch_limit)
+            for index in range(max(workers or os.cpu_count() or 1, 1))
+        ]
+        self._placement: Dict[str, Shard] = {}
+        self._connections: Set[asyncio.StreamWriter] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    # ------------------------------------------------------------------ #
+    # Roteamento
+    # ------------------------------------------------------------------ #
+    def shard_for(self, campaign: str) -> Shard:
+        """
+        O shard fixo de uma campanha.
+
+        No primeiro pedido, a campanha vai para o shard com menos campanhas e ali
+        fica até o servidor encerrar (o processo é o único a escrever no banco).
+        """
+        shard = self._placement.get(campaign)
+        if shard is None:
+            shard = min(self.shards, key=lambda candidate: len(candidate.campaigns))
+            shard.campaigns.add(campaign)
+            self._placement[campaign] = shard
+        return shard
+
+    def campaign_path(self, campaign: Any) -> str:
+        """
+        Resolve o banco de uma campanha.
+
+        Raises:
+            ValueError: Se o nome da campanha não for válido.
+        """
+        if not isinstance(campaign, str) or not _CAMPAIGN_NAME.match(campaign):
+            raise ValueError(f"Campanha inválida: {campaign!r}.")
+        return os.path.join(self.data_dir, f"{campaign}.db")
+
+    def snapshot_metrics(self) -> Dict[str, Any]:
+        """Latências por operação, filas e conexões, prontas para JSON."""
+        return {
+            "operations": [asdict(stats) for stats in self.metrics.stats()],
+            "queues": [shard.queue.qsize() for shard in self.shards],
+            "connections": len(self._connections),
+        }
+
+    async def handle_request(self, message: Any) -> Dict[str, Any]:
+        """
+        Responde a um pedido já decodificado.
+
+        Args:
+            message (Any): O objeto JSON do pedido.
+
+        Returns:
+            Dict[str, Any]: O objeto JSON da resposta.
+        """
+        if not isinstance(message, dict):
+            return _error(None, "O pedido deve ser um objeto JSON.")
+        request_id = message.get("id")
+        operation = message.get("op")
+
+        if operation == "ping":
+            return {"id": request_id, "ok": True, "result": "pong"}
+        if operation == "metrics":
+            return {"id": request_id, "ok": True, "result": self.snapshot_metrics()}
+        if operation not in worker.OPERATIONS:
+            return _error(request_id, f"Operação '{operation}' desconhecida.")
+
+        arguments = message.get("args", [])
+        if not isinstance(arguments, (list, dict)):
+            return _error(request_id, "'args' deve ser uma lista ou um objeto.")
+        try:
+            db_path = self.campaign_path(message.get("campaign"))
+        except ValueError as error:
+            return _error(request_id, str(error))
+
+        shard = self.shard_for(message["campaign"])
+        ok, result, _ = await shard.submit(db_path, operation, arguments)
+        if ok:
+            return {"id": request_id, "ok": True, "result": result}
+        return _error(request_id, result)
+
+    # ------------------------------------------------------------------ #
+    # Conexões
+    # ------------------------------------------------------------------ #
+    async def _respond(
+        self,
+        line: bytes,
+        writer: asyncio.StreamWriter,
+        write_lock: asyncio.Lock,
+        slots: asyncio.Semaphore,
+    ) -> None:
+        """Processa uma linha e escreve a resposta, liberando a vaga da conexão."""
+        start = time.perf_counter_ns()
+        try:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                response = _error(None, "JSON inválido.")
+                message = None
+            else:
+                response = await self.handle_request(message)
+            writer.write(json.dumps(response, ensure_ascii=False).encode() + b"\n")
+            async with write_lock:
+                await writer.drain()
+            operation = message.get("op") if isinstance(message, dict) else None
+            if operation in worker.OPERATIONS:
+                self.metrics.record(f"request {operation}", time.perf_counter_ns() - start)
+        except ConnectionError:
+            pass
+        finally:
+            slots.release()
+
+    async def _serve_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Lê os pedidos de uma conexão, com no máximo `connection_limit` em voo."""
+        self._connections.add(writer)
+        slots = asyncio.Semaphore(self.connection_limit)
+        write_lock = asyncio.Lock()
+        tasks: Set[asyncio.Task] = set()
+        try:
+            while True:
+                # Backpressure: sem vaga, a conexão não é lida
+                await slots.acquire()
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Linha acima do limite do StreamReader: o protocolo se perdeu
+                    slots.release()
+                    break
+                if not line:
+                    slots.release()
+                    break
+                task = asyncio.create_task(self._respond(line, writer, write_lock, slots))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    async def start(
+        self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, path: Optional[str] = None
+    ) -> asyncio.AbstractServer:
+        """
+        Começa a aceitar conexões.
+
+        Args:
+            host (str): O endereço TCP (apenas local, por padrão).
+            port (int): A porta TCP.
+            path (Optional[str]): Se informado, usa um socket Unix neste caminho.
+
+        Returns:
+            asyncio.AbstractServer: O servidor em execução.
+        """
+        if path is not None:
+            if os.path.exists(path):
+                os.remove(path)
+            self._server = await asyncio.start_unix_server(self._serve_connection, path)
+        else:
+            self._server = await asyncio.start_server(self._serve_connection, host, port)
+        return self._server
+
+    async def close(self) -> None:
+        """Para de aceitar conexões, encerra as abertas e fecha os shards."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for writer in list(self._connections):
+            writer.close()
+        await asyncio.gather(*(shard.close() for shard in self.shards))
+
+
+async def serve(args: argparse.Namespace) -> None:
+    """Roda o servidor até receber SIGINT/SIGTERM."""
+    server = GameServer(
+        args.data_dir,
+        args.workers,
+        args.queue_limit,
+        args.batch_limit,
+        args.connection_limit,
+    )
+    listener = await server.start(args.host, args.port, args.socket)
+    addresses = ", ".join(str(sock.getsockname()) for sock in listener.sockets)
+    print(f"Abraxas servindo em {addresses} com {len(server.shards)} workers", flush=True)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    async def report() -> None:
+        while True:
+            await asyncio.sleep(args.report_interval)
+            print(server.metrics.report(limit=15, width=40), flush=True)
+
+    reporter = asyncio.create_task(report()) if args.report_interval > 0 else None
+    await stop.wait()
+    if reporter is not None:
+        reporter.cancel()
+    await server.close()
+    print(server.metrics.report(limit=30, width=40), flush=True)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Abraxas: servidor headless multi-mesa.")
+    parser.add_argument("--data-dir", default="campaigns", help="Pasta dos bancos das campanhas.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--socket", default=None, help="Socket Unix (substitui host/porta).")
+    parser.add_argument("--workers", type=int, default=None, help="Processos (padrão: núcleos).")
+    parser.add_argument("--queue-limit", type=int, default=DEFAULT_QUEUE_LIMIT)
+    parser.add_argument("--batch-limit", type=int, default=DEFAULT_BATCH_LIMIT)
+    parser.add_argument("--connection-limit", type=int, default=DEFAULT_CONNECTION_LIMIT)
+    parser.add_argument(
+        "--report-interval",
+        type=float,
+        default=0,
+        help="Segundos entre relatórios (0 = apenas ao encerrar).",
+    )
+    asyncio.run(serve(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
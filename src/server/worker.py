@@ -0,0 +1,171 @@
+"""
+Módulo dos Workers de Motores do Servidor (Engine Worker Process)
+=================================================================
+
+Este módulo roda dentro dos processos de trabalho do servidor headless
+(ver `src.server.server`). Cada processo é dono de um conjunto de campanhas —
+o servidor fixa cada campanha em um único processo — e mantém, por campanha,
+os motores síncronos ligados ao arquivo SQLite dela:
+
+    - Serialização: um processo executa um lote por vez, então as escritas de
+      uma campanha nunca concorrem entre si (nem com outro processo).
+    - Lotes: o servidor envia vários pedidos da mesma fila de uma só vez; o
+      custo da ida e volta entre processos é dividido pelo lote.
+    - Isolamento de erros: um pedido inválido responde com a mensagem do erro
+      sem derrubar os demais pedidos do lote.
+
+Dependências:
+    - src.database.migrations: Para criar ou atualizar o banco de cada campanha.
+    - src.mechanics.*: Os motores síncronos que são delegados.
+
+Padrões aplicados:
+    - Command (tabela de operações por nome)
+    - Worker Pool com afinidade (campanha fixada em um processo)
+"""
+
+import sqlite3
+import time
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Union
+
+from src.database.migrations import ensure_database
+from src.mechanics.async_engine import EngineSet
+from src.mechanics.combat_engine import CombatEngine
+from src.mechanics.dice_engine import SkillEngine
+from src.mechanics.dice_roller import DiceRoller
+from src.mechanics.engine import BRPEngine
+
+# Argumentos de um pedido: posicionais (lista) ou nomeados (objeto JSON)
+Arguments = Union[Sequence[Any], Dict[str, Any]]
+
+# Resultado de um pedido: (sucesso, resultado ou mensagem de erro, duração em ns)
+Outcome = Tuple[bool, Any, int]
+
+
+def _delegate(engine: str, method: str) -> Callable[..., Any]:
+    """
+    Operação que apenas repassa os argumentos a um método de um dos motores.
+
+    `engine` pode ser um caminho de atributos (ex: 'combat.inventory').
+    """
+    path = engine.split(".")
+
+    def operation(engines: EngineSet, *args, **kwargs) -> Any:
+        target = engines
+        for name in path:
+            target = getattr(target, name)
+        return getattr(target, method)(*args, **kwargs)
+
+    operation.__name__ = method
+    return operation
+
+
+def _get_vitals(engines: EngineSet, char_id: str) -> Tuple[Any, Any]:
+    return engines.brp.state.vitals(char_id)
+
+
+def _roll_skill(engines: EngineSet, char_id: str, skill_id: str) -> Tuple[str, int]:
+    # O nível de sucesso viaja pelo nome (ex: 'SPECIAL_SUCCESS'), como em roll_history
+    level, roll = engines.skills.roll_skill(char_id, skill_id)
+    return level.name, roll
+
+
+def _attack(engines: EngineSet, attacker_id: str, target_id: str) -> Tuple[str, int, int]:
+    expression = engines.combat.calculate_raw_damage(attacker_id)
+    rolled = engines.roller.roll(expression)
+    return expression, rolled, engines.combat.attack(attacker_id, target_id, rolled)
+
+
+def _get_encumbrance(engines: EngineSet, char_id: str) -> Tuple[float, int, bool]:
+    encumbrance = engines.combat.inventory.encumbrance(char_id)
+    return encumbrance.carried, encumbrance.limit, encumbrance.overloaded
+
+
+# Operações expostas pelo protocolo; todas recebem o EngineSet da campanha
+OPERATIONS: Dict[str, Callable[..., Any]] = {
+    **{
+        method: _delegate(engine, method)
+        for engine, method in (
+            ("brp", "calculate_derived_stats"),
+            ("brp", "initialize_character_state"),
+            ("brp", "set_characteristics"),
+            ("skills", "get_skill_total"),
+            ("combat", "get_damage_bonus"),
+            ("combat", "calculate_raw_damage"),
+            ("combat", "get_armor_points"),
+            ("combat", "apply_damage"),
+            ("combat.inventory", "add_item"),
+            ("combat.inventory", "remove_item"),
+            ("combat.inventory", "consume"),
+            ("combat.inventory", "items"),
+        )
+    },
+    "get_vitals": _get_vitals,
+    "roll_skill": _roll_skill,
+    "attack": _attack,
+    "get_encumbrance": _get_encumbrance,
+}
+
+# Motores de cada campanha aberta neste processo (caminho do banco -> motores)
+_campaigns: Dict[str, EngineSet] = {}
+
+
+def _engines(db_path: str) -> EngineSet:
+    """Abre a campanha na primeira chamada: migra o banco e cria os motores."""
+    engines = _campaigns.get(db_path)
+    if engines is None:
+        ensure_database(db_path)
+        engines = _campaigns[db_path] = EngineSet(
+            brp=BRPEngine(db_path),
+            skills=SkillEngine(db_path),
+            combat=CombatEngine(db_path),
+            roller=DiceRoller(),
+        )
+    return engines
+
+
+def run_batch(requests: Sequence[Tuple[str, str, Arguments]]) -> List[Outcome]:
+    """
+    Executa um lote de pedidos, em ordem (ponto de entrada no processo).
+
+    Os pedidos podem ser de campanhas diferentes, desde que todas estejam
+    fixadas neste processo.
+
+    Args:
+        requests (Sequence[Tuple[str, str, Arguments]]): Tuplas (banco da
+            campanha, operação, argumentos).
+
+    Returns:
+        List[Outcome]: Um resultado por pedido, na mesma ordem.
+    """
+    clock = time.perf_counter_ns
+    outcomes: List[Outcome] = []
+    for db_path, operation, arguments in requests:
+        start = clock()
+        try:
+            function = OPERATIONS[operation]
+            engines = _engines(db_path)
+            if isinstance(arguments, dict):
+                result = function(engines, **arguments)
+            else:
+                result = function(engines, *arguments)
+            outcomes.append((True, result, clock() - start))
+        except (ValueError, TypeError, sqlite3.Error) as error:
+            outcomes.append((False, str(error), clock() - start))
+        except Exception as error:  # fórmula homebrew quebrada, bug de um motor...
+            # Nunca escapa do lote: os demais pedidos (de outras mesas) seguem
+            outcomes.append((False, f"{type(error).__name__}: {error}", clock() - start))
+    return outcomes
+
+
+def close_campaigns() -> int:
+    """
+    Grava a auditoria pendente e fecha as campanhas abertas neste processo.
+
+    Returns:
+        int: A quantidade de campanhas fechadas.
+    """
+    closed = len(_campaigns)
+    for engines in _campaigns.values():
+        engines.skills.audit.close()
+    _campaigns.clear()
+    return closed
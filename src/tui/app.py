@@ -11,9 +11,19 @@ negócio: ela apenas delega comandos para os motores lógicos (Engine Layer),
 aguarda a resolução estocástica e o recálculo matemático, e então consome
 a "verdade absoluta" gravada no banco de dados SQLite para se redesenhar.
 
+Os motores nunca rodam na thread da UI: a `AsyncEngine` os executa em uma
+thread dedicada (com conexão própria) e os resultados voltam como mensagens
+Textual, de modo que commits e fsyncs não congelam a renderização nem o teclado.
+
 Dependências:
     - asyncio: Para controle do Event Loop e pausas não-bloqueantes.
     - textual: Framework de renderização da interface no terminal.
+    - src.mechanics.async_engine: Fachada assíncrona dos motores lógicos.
+    - src.tui.messages: Mensagens que trazem os resultados dos motores.
+    - src.tui.roll_log: Log rolável (virtualizado) do histórico de rolagens.
+    - src.tui.debug_panel: Painel alternável com as medições da instrumentação.
+    - src.mechanics.events: Eventos de estado publicados pelos motores.
+    - src.database.save_slots: Quick-save / quick-load em segundo plano.
 
 Padrões aplicados:
     - Programação Orientada a Eventos (Event-Driven)
@@ -22,15 +32,30 @@ Padrões aplicados:
 """
 
 import asyncio
+import sqlite3
+from typing import Awaitable, Callable, List, Optional
+
 from textual.app import App, ComposeResult
 from textual.containers import Vertical, Horizontal
 from textual.widgets import Header, Footer, Button, Static, Label
 from textual.reactive import reactive
 
-# Importações dos motores lógicos (Assumindo que estão acessíveis no escopo)
-# from src.mechanics.engine import BRPEngine
-# from src.mechanics.dice_engine import SkillEngine
-# from src.mechanics.combat_engine import CombatEngine
+from src.database.connection import DEFAULT_DB_PATH
+from src.database.save_slots import QUICK_SLOT, SaveSlotManager
+from src.mechanics.async_engine import AsyncEngine
+from src.mechanics.events import (
+    FRAME_INTERVAL,
+    EventBus,
+    EventCoalescer,
+    HPChanged,
+    MPChanged,
+    StateEvent,
+    StateInitialized,
+    latest_per_character,
+)
+from src.tui.debug_panel import DebugPanel
+from src.tui.messages import DamageApplied, EngineFailed, SkillRolled, VitalsLoaded
+from src.tui.roll_log import RollLogWidget
 
 
 class CharacterStatsWidget(Static):
@@ -41,14 +66,64 @@ class CharacterStatsWidget(Static):
     um evento de re-renderização nativo do Textual, garantindo que a tela
     sempre reflita o estado atual da memória.
 
+    O widget assina os eventos de HP/MP do seu personagem no barramento dos
+    motores. Rajadas de eventos (ex: um round de combate em massa) são agrupadas
+    e aplicadas uma única vez por quadro, mantendo apenas o valor mais recente.
+
     Attributes:
         hp (int): Pontos de vida atuais do personagem (Hit Points).
         mp (int): Pontos de magia atuais do personagem (Magic Points).
+        char_id (str): O personagem exibido.
+        events (EventBus): O barramento assinado.
     """
 
     hp = reactive(0)
     mp = reactive(0)
 
+    def __init__(self, char_id: str, events: EventBus, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.char_id = char_id
+        self.events = events
+        self._unsubscribers: List[Callable[[], None]] = []
+
+    def on_mount(self) -> None:
+        """Assina os eventos de estado; a entrega acontece no Event Loop da UI."""
+        loop = asyncio.get_running_loop()
+        coalescer = EventCoalescer(
+            self.apply_events,
+            # Os eventos chegam na thread dos motores: agenda o lote para o próximo quadro
+            schedule=lambda flush: loop.call_soon_threadsafe(loop.call_later, FRAME_INTERVAL, flush),
+            key=latest_per_character,
+        )
+
+        def _own(event: StateEvent) -> None:
+            if event.char_id == self.char_id:
+                coalescer(event)
+
+        for event_type in (HPChanged, MPChanged, StateInitialized):
+            self._unsubscribers.append(self.events.subscribe(event_type, _own))
+
+    def on_unmount(self) -> None:
+        """Cancela as assinaturas do barramento."""
+        for unsubscribe in self._unsubscribers:
+            unsubscribe()
+        self._unsubscribers.clear()
+
+    def apply_events(self, events: List[StateEvent]) -> None:
+        """
+        Aplica um lote de eventos agrupados aos reativos do widget.
+
+        Args:
+            events (List[StateEvent]): Os eventos do quadro, na ordem em que mudaram.
+        """
+        for event in events:
+            if isinstance(event, HPChanged) and event.hp is not None:
+                self.hp = event.hp
+            elif isinstance(event, MPChanged) and event.mp is not None:
+                self.mp = event.mp
+            elif isinstance(event, StateInitialized):
+                self.hp, self.mp = event.hp, event.mp
+
     def render(self) -> str:
         """
         Gera a string formatada que será desenhada no terminal.
@@ -68,6 +143,8 @@ class AbraxasTUI(App):
 
     Attributes:
         char_id (str): O identificador único do personagem ativo no banco de dados.
+        engine (AsyncEngine): Fachada que executa os motores fora do Event Loop.
+        saves (SaveSlotManager): Slots de save, gravados em uma thread própria.
         CSS (str): Regras de estilização (TCSS) embutidas para o layout.
         BINDINGS (list): Mapeamento de atalhos de teclado globais da aplicação.
     """
@@ -75,23 +152,43 @@ class AbraxasTUI(App):
     CSS = """
     Screen { align: center middle; }
     CharacterStatsWidget { padding: 1; background: $boost; text-align: center; }
-    #log_panel { height: 1fr; border: solid green; padding: 1; margin-top: 1; }
+    #log_panel { height: auto; border: solid green; padding: 1; margin-top: 1; }
+    RollLogWidget { height: 1fr; border: solid $accent; }
     """
 
-    BINDINGS = [("q", "quit", "Sair do Abraxas")]
-
-    def __init__(self, char_id: str):
+    BINDINGS = [
+        ("q", "quit", "Sair do Abraxas"),
+        ("d", "toggle_debug", "Depuração"),
+        ("e", "export_profile", "Exportar perfil"),
+        ("f5", "quick_save", "Quick-save"),
+        ("f9", "quick_load", "Quick-load"),
+    ]
+
+    # Arquivo gravado pela ação de exportar o perfil da instrumentação
+    PROFILE_EXPORT_PATH = "abraxas_profile.json"
+
+    def __init__(
+        self,
+        char_id: str,
+        db_path: str = DEFAULT_DB_PATH,
+        engine: Optional[AsyncEngine] = None,
+        saves: Optional[SaveSlotManager] = None,
+    ):
         """
-        Inicializa a TUI e as instâncias dos motores acoplados ao SQLite.
+        Inicializa a TUI e a fachada assíncrona dos motores acoplados ao SQLite.
 
         Args:
             char_id (str): O UUID ou identificador do personagem sendo jogado.
+            db_path (str): O caminho do arquivo do banco de dados SQLite.
+            engine (Optional[AsyncEngine]): Fachada já criada (ex: compartilhada ou
+                com semente fixa). Se omitida, uma nova é criada para `db_path`.
+            saves (Optional[SaveSlotManager]): Slots de save. Se omitido, usa a pasta
+                padrão ao lado do banco dos motores.
         """
         super().__init__()
         self.char_id = char_id
-        # self.brp_engine = BRPEngine("abraxas.db")
-        # self.skill_engine = SkillEngine("abraxas.db")
-        # self.combat_engine = CombatEngine("abraxas.db")
+        self.engine = engine or AsyncEngine(db_path)
+        self.saves = saves or SaveSlotManager(self.engine.db_path)
 
     def compose(self) -> ComposeResult:
         """
@@ -102,11 +199,13 @@ class AbraxasTUI(App):
         """
         yield Header(show_clock=True)
         with Vertical():
-            yield CharacterStatsWidget(id="stats")
+            yield CharacterStatsWidget(self.char_id, self.engine.events, id="stats")
             with Horizontal():
                 yield Button("Rolar Dodge", id="roll_dodge", variant="primary")
                 yield Button("Receber Dano", id="take_damage", variant="error")
             yield Label("Aguardando ação...", id="log_panel")
+            yield RollLogWidget(self.char_id, self.engine, id="roll_log")
+            yield DebugPanel(id="debug_panel")
         yield Footer()
 
     def on_mount(self) -> None:
@@ -116,29 +215,61 @@ class AbraxasTUI(App):
         """
         self.update_stats_from_db()
 
+    async def on_unmount(self) -> None:
+        """Grava a auditoria pendente e encerra as threads dos motores e dos saves."""
+        await self.engine.close()
+        await asyncio.to_thread(self.saves.close)
+
+    def _dispatch(self, action: str, call: Awaitable[None]) -> None:
+        """
+        Agenda uma chamada aos motores sem bloquear o handler que a disparou.
+
+        Os workers do grupo 'engine' apenas aguardam a `AsyncEngine`; o resultado
+        chega aos widgets por mensagem. Falhas viram `EngineFailed` em vez de
+        derrubar a aplicação.
+        """
+
+        async def _guarded() -> None:
+            try:
+                await call
+            except (sqlite3.Error, ValueError, OSError) as error:
+                self.post_message(EngineFailed(action, error))
+
+        self.run_worker(_guarded(), group="engine")
+
     def update_stats_from_db(self) -> None:
         """
-        Sincroniza a View com a camada de persistência.
-        Consulta o banco de dados via Motor Lógico e injeta os valores reais
-        nos widgets reativos, forçando a atualização visual.
+        Sincroniza a View com a camada de persistência (carga inicial).
+        Pede o estado vital aos motores (fora do Event Loop); os widgets reativos
+        são atualizados quando a mensagem `VitalsLoaded` chegar. Depois disso, as
+        mudanças chegam pelos eventos do barramento, sem reler o banco.
         """
-        # Exemplo da chamada arquitetural real:
-        # state = self.brp_engine.get_current_state(self.char_id)
+        self._dispatch("vitals", self._load_vitals())
 
-        # Mock simulando o retorno do SQLite:
-        mock_state = {"current_hp": 13, "current_mp": 14}
+    async def _load_vitals(self) -> None:
+        hp, mp = await self.engine.get_vitals(self.char_id)
+        self.post_message(VitalsLoaded(self.char_id, hp, mp))
 
-        stats_widget = self.query_one("#stats", CharacterStatsWidget)
-        stats_widget.hp = mock_state["current_hp"]
-        stats_widget.mp = mock_state["current_mp"]
+    async def _roll_dodge(self) -> None:
+        # Pausa dramática assíncrona (suspense)
+        await asyncio.sleep(0.8)
+        # Execução matemática na thread dos motores (a auditoria acontece lá dentro)
+        result_level, roll = await self.engine.roll_skill(self.char_id, "SKL_DODGE")
+        self.post_message(SkillRolled(self.char_id, "SKL_DODGE", result_level, roll))
+
+    async def _take_damage(self, rolled_damage: int) -> None:
+        await asyncio.sleep(1.0)
+        # Delegação do dano após a mitigação da armadura (Engine de Combate)
+        damage_taken = await self.engine.apply_damage(self.char_id, rolled_damage)
+        self.post_message(DamageApplied(self.char_id, rolled_damage, damage_taken))
 
     async def on_button_pressed(self, event: Button.Pressed) -> None:
         """
         Manipulador de eventos assíncrono para interações de clique.
 
-        Libera a Main Thread durante pausas estéticas (await asyncio.sleep)
-        para construir suspense mecânico antes de delegar as rolagens e
-        gravações ao Motor de Regras.
+        Dá o feedback visual imediato e delega a rolagem ou o dano para um worker;
+        o handler retorna na hora e a UI segue respondendo enquanto os motores
+        gravam no banco.
 
         Args:
             event (Button.Pressed): O evento de clique capturado pelo Textual.
@@ -146,33 +277,89 @@ class AbraxasTUI(App):
         log = self.query_one("#log_panel", Label)
 
         if event.button.id == "roll_dodge":
-            # 1. Feedback visual imediato
             log.update("> [Aguarde] Calculando chance e rolando D100...")
+            self._dispatch("roll_dodge", self._roll_dodge())
 
-            # 2. Pausa dramática assíncrona (suspense)
-            await asyncio.sleep(0.8)
+        elif event.button.id == "take_damage":
+            log.update("> [Alerta] O inimigo desferiu um golpe...")
+            self._dispatch("take_damage", self._take_damage(3))
+
+    def action_toggle_debug(self) -> None:
+        """
+        Alterna o painel de depuração.
 
-            # 3. Execução matemática (A gravação no banco acontece aqui dentro, escondida!)
-            # result_level, roll = self.skill_engine.roll_skill(self.char_id, "SKL_DODGE")
+        A instrumentação só fica ligada enquanto o painel está visível; oculto,
+        os motores voltam a rodar sem nenhum cronômetro.
+        """
+        panel = self.query_one("#debug_panel", DebugPanel)
+        if panel.display:
+            panel.hide()
+            self._dispatch("disable_profiling", self.engine.disable_profiling())
+        else:
+            self._dispatch("enable_profiling", self.engine.enable_profiling())
+            panel.show()
+
+    def action_export_profile(self) -> None:
+        """Grava as medições da instrumentação em `PROFILE_EXPORT_PATH`."""
+        self._dispatch("export_profile", self._export_profile())
+
+    async def _export_profile(self) -> None:
+        path = await self.engine.export_profile(self.PROFILE_EXPORT_PATH)
+        self.query_one("#log_panel", Label).update(f"> Perfil exportado para {path}")
+
+    def action_quick_save(self) -> None:
+        """Grava o slot rápido; a cópia do banco roda em segundo plano."""
+        self.query_one("#log_panel", Label).update("> Salvando...")
+        self._dispatch("quick_save", self._quick_save())
+
+    def action_quick_load(self) -> None:
+        """Restaura o slot rápido sobre o banco vivo."""
+        self.query_one("#log_panel", Label).update("> Carregando...")
+        self._dispatch("quick_load", self._quick_load())
+
+    async def _flush_audit(self) -> None:
+        # Rolagens já exibidas entram no save (e não vazam para o banco restaurado)
+        await self.engine.run(lambda engines: engines.skills.audit.flush())
+
+    async def _quick_save(self) -> None:
+        await self._flush_audit()
+        label = f"Quick-save ({self.char_id})"
+        slot = await asyncio.wrap_future(self.saves.save(QUICK_SLOT, label))
+        self.query_one("#log_panel", Label).update(
+            f"> Jogo salvo no slot '{slot.name}' "
+            f"({slot.written_pages} de {slot.page_count} páginas gravadas)."
+        )
+
+    async def _quick_load(self) -> None:
+        await self._flush_audit()
+        slot = await asyncio.wrap_future(self.saves.load(QUICK_SLOT))
+        # Os caches dos motores percebem a troca pelas revisões; a View relê o banco
+        self.query_one("#roll_log", RollLogWidget).reload()
+        self.update_stats_from_db()
+        self.query_one("#log_panel", Label).update(f"> Slot '{slot.name}' carregado.")
 
-            # Mock temporário enquanto não conectamos de verdade:
-            roll = 42
-            result_level = "SUCCESS"
-            log.update(f"> Rolagem de Dodge: {roll} [{result_level}]")
+    def on_vitals_loaded(self, message: VitalsLoaded) -> None:
+        """Injeta os valores reais do banco nos widgets reativos."""
+        stats_widget = self.query_one("#stats", CharacterStatsWidget)
+        stats_widget.hp = message.hp or 0
+        stats_widget.mp = message.mp or 0
 
-        elif event.button.id == "take_damage":
-            log.update("> [Alerta] O inimigo desferiu um golpe...")
-            await asyncio.sleep(1.0)
+    def on_skill_rolled(self, message: SkillRolled) -> None:
+        """Narra o resultado de uma rolagem de perícia."""
+        log = self.query_one("#log_panel", Label)
+        log.update(f"> Rolagem de Dodge: {message.roll} [{message.level.name}]")
 
-            # Delegação do dano após a mitigação da armadura (Engine de Combate)
-            damage_taken = 3
-            # self.combat_engine.apply_damage(self.char_id, damage_taken)
-            log.update(
-                f"> O personagem sofreu {damage_taken} de dano físico após mitigação."
-            )
+    def on_damage_applied(self, message: DamageApplied) -> None:
+        """Narra o dano sofrido (o HP já chega ao widget pelo evento `HPChanged`)."""
+        log = self.query_one("#log_panel", Label)
+        log.update(
+            f"> O personagem sofreu {message.damage_taken} de dano físico após mitigação."
+        )
 
-            # Sincroniza a UI com a nova verdade absoluta do banco
-            self.update_stats_from_db()
+    def on_engine_failed(self, message: EngineFailed) -> None:
+        """Exibe a falha de uma chamada aos motores sem derrubar a interface."""
+        log = self.query_one("#log_panel", Label)
+        log.update(f"> [Erro] {message.action}: {message.error}")
 
 
 # if __name__ == "__main__":
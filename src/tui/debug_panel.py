@@ -0,0 +1,75 @@
+"""
+Módulo do Painel de Depuração (Debug Panel)
+===========================================
+
+Este módulo compõe a camada de Apresentação (View) do sistema Abraxas.
+Ele exibe, sobre a interface, as operações mais custosas medidas pela
+instrumentação dos motores (métodos e comandos SQL), com contagem, tempo total
+e latências p50/p99.
+
+O painel nasce oculto; enquanto oculto, o seu temporizador fica pausado e a
+instrumentação permanece desligada (ver `AbraxasTUI.action_toggle_debug`).
+
+Dependências:
+    - textual: Para o widget e o temporizador de atualização.
+    - src.mechanics.instrumentation: Para as medições agregadas.
+
+Padrões aplicados:
+    - Observer por amostragem (polling do profiler em intervalo fixo)
+"""
+
+from typing import Optional
+
+from rich.text import Text
+from textual.timer import Timer
+from textual.widgets import Static
+
+from src.mechanics.instrumentation import Profiler, default_profiler
+
+
+class DebugPanel(Static):
+    """
+    Painel alternável com o relatório do profiler.
+
+    Attributes:
+        profiler (Profiler): A origem das medições.
+        interval (float): Segundos entre duas atualizações do relatório.
+    """
+
+    DEFAULT_CSS = """
+    DebugPanel {
+        display: none;
+        height: auto;
+        border: solid $warning;
+        padding: 0 1;
+    }
+    """
+
+    def __init__(
+        self, profiler: Profiler = default_profiler, interval: float = 0.5, **kwargs
+    ) -> None:
+        super().__init__("", **kwargs)
+        self.profiler = profiler
+        self.interval = interval
+        self._timer: Optional[Timer] = None
+
+    def on_mount(self) -> None:
+        self._timer = self.set_interval(self.interval, self.refresh_report, pause=True)
+
+    def show(self) -> None:
+        """Exibe o painel e retoma as atualizações."""
+        self.display = True
+        self.refresh_report()
+        if self._timer is not None:
+            self._timer.resume()
+
+    def hide(self) -> None:
+        """Oculta o painel e pausa as atualizações."""
+        self.display = False
+        if self._timer is not None:
+            self._timer.pause()
+
+    def refresh_report(self) -> None:
+        """Redesenha o relatório com as medições atuais."""
+        # Text: o SQL das operações não deve ser interpretado como markup
+        self.update(Text(self.profiler.report(limit=15, width=48)))
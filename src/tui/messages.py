@@ -0,0 +1,61 @@
+"""
+Mensagens da Interface (TUI Messages)
+=====================================
+
+Este módulo compõe a camada de Apresentação (View) do sistema Abraxas.
+Ele define as mensagens Textual que levam os resultados dos motores, calculados
+fora do Event Loop pela `AsyncEngine`, de volta para os widgets.
+
+Dependências:
+    - textual: Para a classe base `Message`.
+
+Padrões aplicados:
+    - Message Passing (a UI reage a mensagens, nunca espera pelo disco)
+"""
+
+from typing import TYPE_CHECKING, Optional
+
+from textual.message import Message
+
+if TYPE_CHECKING:
+    from src.mechanics.dice_engine import SuccessLevel
+
+
+class VitalsLoaded(Message):
+    """HP/MP atuais de um personagem lidos pelos motores."""
+
+    def __init__(self, char_id: str, hp: Optional[int], mp: Optional[int]) -> None:
+        super().__init__()
+        self.char_id = char_id
+        self.hp = hp
+        self.mp = mp
+
+
+class SkillRolled(Message):
+    """Resultado de uma rolagem de perícia (já auditada pelo motor)."""
+
+    def __init__(self, char_id: str, skill_id: str, level: "SuccessLevel", roll: int) -> None:
+        super().__init__()
+        self.char_id = char_id
+        self.skill_id = skill_id
+        self.level = level
+        self.roll = roll
+
+
+class DamageApplied(Message):
+    """Dano aplicado a um personagem após a mitigação da armadura."""
+
+    def __init__(self, char_id: str, rolled_damage: int, damage_taken: int) -> None:
+        super().__init__()
+        self.char_id = char_id
+        self.rolled_damage = rolled_damage
+        self.damage_taken = damage_taken
+
+
+class EngineFailed(Message):
+    """Falha de uma chamada aos motores (ex: personagem inexistente, banco ocupado)."""
+
+    def __init__(self, action: str, error: Exception) -> None:
+        super().__init__()
+        self.action = action
+        self.error = error
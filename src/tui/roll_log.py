@@ -0,0 +1,231 @@
+"""
+Módulo do Log de Rolagens Virtualizado (Roll Log Widget)
+========================================================
+
+Este módulo compõe a camada de Apresentação (View) do sistema Abraxas.
+Ele exibe o histórico completo de rolagens de um personagem, que em campanhas
+longas chega a centenas de milhares de linhas de `roll_history`, sem carregá-lo:
+
+    - Virtualização: a altura rolável é o total de rolagens (lido de
+      `roll_stats`), mas apenas as linhas visíveis são desenhadas (Line API).
+    - Janela: a memória guarda só o trecho visível mais uma margem de pré-busca
+      acima e abaixo; o resto é descartado à medida que a janela se move.
+    - Keyset: a janela é estendida a partir do `log_id` das suas bordas; só um
+      salto da barra de rolagem para longe da janela localiza uma posição.
+    - Cauda: novas rolagens chegam pelos eventos `RollLogged`; se a vista está
+      no fim, ela acompanha as linhas novas.
+
+Todas as leituras acontecem na thread dos motores (`AsyncEngine.query`).
+
+Dependências:
+    - textual: Para a `ScrollView` e a renderização linha a linha (`Strip`).
+    - src.database.queries: Para as janelas e a contagem do histórico.
+    - src.mechanics.events: Para acompanhar as novas rolagens.
+
+Padrões aplicados:
+    - Virtualização (UI Virtualization / Windowing)
+    - Keyset Pagination (Seek Method)
+"""
+
+import asyncio
+import sqlite3
+from typing import Callable, List, Optional
+
+from rich.segment import Segment
+from textual.geometry import Size
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+from src.database.queries import (
+    RollRecord,
+    count_rolls,
+    get_rolls_after,
+    get_rolls_at,
+    get_rolls_before,
+)
+from src.mechanics.async_engine import AsyncEngine
+from src.mechanics.events import FRAME_INTERVAL, EventCoalescer, RollLogged
+from src.tui.messages import EngineFailed
+
+
+class RollLogWidget(ScrollView):
+    """
+    Log rolável do histórico de rolagens de um personagem.
+
+    Attributes:
+        char_id (str): O personagem exibido.
+        engine (AsyncEngine): A fachada usada para as leituras do histórico.
+        margin (int): Linhas pré-buscadas acima e abaixo da área visível.
+    """
+
+    DEFAULT_CSS = """
+    RollLogWidget {
+        overflow-x: hidden;
+    }
+    """
+
+    def __init__(self, char_id: str, engine: AsyncEngine, margin: int = 50, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.char_id = char_id
+        self.engine = engine
+        self.margin = margin
+        self._rows: List[RollRecord] = []
+        self._first = 0  # Posição (0 = a mais antiga) de `_rows[0]`
+        self._total = 0
+        self._total_stale = True
+        self._follow = True
+        self._syncing = False
+        self._dirty = False
+        self._unsubscribe: Optional[Callable[[], None]] = None
+
+    @property
+    def loaded_rows(self) -> int:
+        """Quantidade de rolagens mantidas em memória (visíveis + margem)."""
+        return len(self._rows)
+
+    def on_mount(self) -> None:
+        """Assina as novas rolagens do personagem e carrega a primeira janela (a cauda)."""
+        super().on_mount()
+        loop = asyncio.get_running_loop()
+        coalescer = EventCoalescer(
+            lambda events: self._on_rolls_logged(),
+            schedule=lambda flush: loop.call_soon_threadsafe(loop.call_later, FRAME_INTERVAL, flush),
+            key=lambda event: event.char_id,
+        )
+
+        def _own(event: RollLogged) -> None:
+            if event.char_id == self.char_id:
+                coalescer(event)
+
+        self._unsubscribe = self.engine.events.subscribe(RollLogged, _own)
+        self._request_sync()
+
+    def on_unmount(self) -> None:
+        """Cancela a assinatura das rolagens."""
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+    def on_resize(self) -> None:
+        self._request_sync()
+
+    def watch_scroll_y(self, old_value: float, new_value: float) -> None:
+        super().watch_scroll_y(old_value, new_value)
+        # Rolar até o fim volta a acompanhar a cauda; rolar para cima a solta
+        self._follow = round(new_value) >= self.max_scroll_y
+        self._request_sync()
+
+    def _on_rolls_logged(self) -> None:
+        """Um lote de rolagens novas foi anunciado (no máximo um por quadro)."""
+        self._total_stale = True
+        self._request_sync()
+
+    def reload(self) -> None:
+        """Descarta a janela e relê o histórico (ex: após carregar um slot de save)."""
+        self._rows = []
+        self._first = 0
+        self._total_stale = True
+        self._follow = True
+        self._request_sync()
+
+    def _request_sync(self) -> None:
+        """Agenda o ajuste da janela; pedidos durante uma leitura são acumulados."""
+        if self._syncing:
+            self._dirty = True
+            return
+        self._syncing = True
+        self.run_worker(self._sync(), group="roll_log")
+
+    async def _sync(self) -> None:
+        try:
+            self._dirty = True
+            while self._dirty:
+                self._dirty = False
+                await self._sync_window()
+        except (sqlite3.Error, ValueError) as error:
+            self.post_message(EngineFailed("roll_log", error))
+        finally:
+            self._syncing = False
+
+    async def _sync_window(self) -> None:
+        """Estende, move ou recorta a janela para cobrir a área visível e a margem."""
+        if self._total_stale:
+            self._total_stale = False
+            total = await self.engine.query(count_rolls, self.char_id)
+            if total != self._total:
+                self._total = total
+                self.virtual_size = Size(self.size.width, total)
+        if self._follow and round(self.scroll_y) < self.max_scroll_y:
+            # Acompanha a cauda (também após o primeiro layout definir a altura)
+            self.scroll_to(y=self.max_scroll_y, animate=False, force=True)
+
+        total = self._total
+        height = max(self.size.height, 1)
+        top = min(round(self.scroll_y), max(total - height, 0))
+        bottom = min(top + height, total)
+
+        rows, first = self._rows, self._first
+        last = first + len(rows)
+        # Histerese: só busca quando a área visível se aproxima da borda da janela
+        if first <= max(top - self.margin // 2, 0) and last >= min(bottom + self.margin // 2, total):
+            return
+
+        want_first = max(top - self.margin, 0)
+        want_last = min(bottom + self.margin, total)
+        if not rows or want_last <= first or want_first >= last:
+            # Salto para longe da janela atual: localiza a posição uma única vez
+            rows = await self.engine.query(
+                get_rolls_at, self.char_id, want_first, want_last - want_first, total
+            )
+            first = want_first
+        else:
+            if want_first < first:
+                older = await self.engine.query(
+                    get_rolls_before, self.char_id, rows[0].log_id, first - want_first
+                )
+                rows, first = older + rows, first - len(older)
+            if want_last > first + len(rows):
+                newer = await self.engine.query(
+                    get_rolls_after, self.char_id, rows[-1].log_id, want_last - first - len(rows)
+                )
+                rows = rows + newer
+
+        # Descarta o que saiu da margem: a memória não cresce com o histórico
+        trim = max(want_first - first, 0)
+        self._rows = rows[trim : want_last - first]
+        self._first = first + trim
+        self.refresh()
+
+    def render_line(self, y: int) -> Strip:
+        """
+        Desenha uma linha da área visível.
+
+        Args:
+            y (int): A linha relativa ao topo do widget.
+
+        Returns:
+            Strip: A rolagem correspondente, ou uma linha vazia enquanto ela é buscada.
+        """
+        index = round(self.scroll_y) + y
+        offset = index - self._first
+        if 0 <= offset < len(self._rows):
+            text = self.format_record(self._rows[offset])
+        else:
+            text = "…" if index < self._total else ""
+        return Strip([Segment(text)]).crop(0, self.size.width)
+
+    @staticmethod
+    def format_record(record: RollRecord) -> str:
+        """
+        Formata uma rolagem como uma linha do log.
+
+        Args:
+            record (RollRecord): A rolagem lida de `roll_history`.
+
+        Returns:
+            str: O texto da linha.
+        """
+        return (
+            f"{record.created_at}  {record.action_name:<16} "
+            f"{record.die_result:>3}  {record.success_level}"
+        )